@@ -1,47 +1,82 @@
-from typing import Callable
+from typing import Awaitable, Callable
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.security import decode_access_token
 from app.db.models.user import User, UserRole
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    unauthorized_exc = HTTPException(
+def _build_unauthorized_exc() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def decode_user_id(token: str) -> int:
     try:
         payload = decode_access_token(token)
-        user_id = int(payload.get("sub", ""))
+        return int(payload.get("sub", ""))
     except (ValueError, TypeError):
-        raise unauthorized_exc
+        raise _build_unauthorized_exc()
+
 
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    user_id = decode_user_id(token)
     user = db.scalar(select(User).where(User.id == user_id))
     if not user or not user.is_active:
-        raise unauthorized_exc
+        raise _build_unauthorized_exc()
+    return user
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    user_id = decode_user_id(token)
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if not user or not user.is_active:
+        raise _build_unauthorized_exc()
     return user
 
 
+def _normalize_roles(roles: tuple[UserRole | str, ...]) -> set[str]:
+    return {role.value if isinstance(role, UserRole) else role for role in roles}
+
+
+def _ensure_role(current_user: User, allowed_roles: set[str]) -> User:
+    if current_user.role not in allowed_roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    return current_user
+
+
 def require_roles(*roles: UserRole | str) -> Callable[[User], User]:
-    allowed_roles = {role.value if isinstance(role, UserRole) else role for role in roles}
+    allowed_roles = _normalize_roles(roles)
 
     def checker(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions",
-            )
-        return current_user
+        return _ensure_role(current_user, allowed_roles)
+
+    return checker
+
+
+def require_roles_async(*roles: UserRole | str) -> Callable[[User], Awaitable[User]]:
+    allowed_roles = _normalize_roles(roles)
+
+    async def checker(current_user: User = Depends(get_current_user_async)) -> User:
+        return _ensure_role(current_user, allowed_roles)
 
     return checker
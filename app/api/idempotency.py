@@ -0,0 +1,127 @@
+import hashlib
+import json
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+
+from app.api.deps import decode_user_id
+from app.core.metrics import IDEMPOTENT_REPLAYS
+from app.services.idempotency_service import (
+    build_idempotency_cache_key,
+    claim_idempotency_key,
+    release_idempotency_key,
+    store_idempotent_response,
+)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_KEY_CONFLICT_DETAIL = "Idempotency key already used with another request"
+
+EndpointT = TypeVar("EndpointT", bound=Callable[..., Any])
+
+
+def normalize_idempotency_key(idempotency_key: str | None) -> str | None:
+    if idempotency_key is None:
+        return None
+
+    normalized_idempotency_key = idempotency_key.strip()
+    if not normalized_idempotency_key:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Idempotency-Key header must not be empty",
+        )
+    if len(normalized_idempotency_key) > 128:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Idempotency-Key header is too long (max 128 characters)",
+        )
+    return normalized_idempotency_key
+
+
+def idempotent(scope: str, reuse_detail: str = IDEMPOTENCY_KEY_CONFLICT_DETAIL) -> Callable[[EndpointT], EndpointT]:
+    def decorator(endpoint: EndpointT) -> EndpointT:
+        endpoint.idempotency_scope = scope
+        endpoint.idempotency_reuse_detail = reuse_detail
+        return endpoint
+
+    return decorator
+
+
+def build_request_fingerprint(method: str, path: str, body: bytes) -> str:
+    try:
+        canonical_body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        canonical_body = body
+    return f"{method} {path} {hashlib.sha256(canonical_body).hexdigest()}"
+
+
+def _get_bearer_token(request: Request) -> str | None:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token
+
+
+class IdempotentRoute(APIRoute):
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        route_handler = super().get_route_handler()
+        scope = getattr(self.endpoint, "idempotency_scope", None)
+        if scope is None:
+            return route_handler
+        reuse_detail = self.endpoint.idempotency_reuse_detail
+
+        async def idempotent_route_handler(request: Request) -> Response:
+            idempotency_key = normalize_idempotency_key(request.headers.get(IDEMPOTENCY_KEY_HEADER))
+            token = _get_bearer_token(request)
+            if idempotency_key is None or token is None:
+                return await route_handler(request)
+
+            cache_key = build_idempotency_cache_key(
+                scope=scope,
+                user_id=decode_user_id(token),
+                idempotency_key=idempotency_key,
+            )
+            fingerprint = build_request_fingerprint(
+                method=request.method,
+                path=request.url.path,
+                body=await request.body(),
+            )
+            cached_response = await run_in_threadpool(
+                claim_idempotency_key,
+                cache_key=cache_key,
+                fingerprint=fingerprint,
+                reuse_detail=reuse_detail,
+            )
+            if cached_response is not None:
+                IDEMPOTENT_REPLAYS.labels(scope=scope).inc()
+                return Response(
+                    content=cached_response["body"],
+                    status_code=cached_response["status_code"],
+                    media_type=cached_response["media_type"],
+                    headers={IDEMPOTENT_REPLAYED_HEADER: "true"},
+                )
+
+            try:
+                response = await route_handler(request)
+            except Exception:
+                await run_in_threadpool(release_idempotency_key, cache_key)
+                raise
+
+            body = getattr(response, "body", None)
+            if 200 <= response.status_code < 300 and isinstance(body, bytes):
+                await run_in_threadpool(
+                    store_idempotent_response,
+                    cache_key=cache_key,
+                    fingerprint=fingerprint,
+                    status_code=response.status_code,
+                    body=body.decode(),
+                    media_type=response.media_type,
+                )
+            else:
+                await run_in_threadpool(release_idempotency_key, cache_key)
+            return response
+
+        return idempotent_route_handler
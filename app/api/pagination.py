@@ -1,6 +1,42 @@
+import base64
+import binascii
+import json
 from typing import Annotated
 
-from fastapi import Query
+from fastapi import HTTPException, Query, Response, status
 
 LimitParam = Annotated[int, Query(ge=1, le=100)]
 OffsetParam = Annotated[int, Query(ge=0)]
+AfterParam = Annotated[str | None, Query(max_length=256)]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+CURSOR_WITH_OFFSET_DETAIL = "Use either after or offset, not both"
+
+
+def encode_cursor(last_id: int) -> str:
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id = payload["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        last_id = None
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+    return last_id
+
+
+def decode_after_cursor(after: str | None, offset: int) -> int | None:
+    if after is None:
+        return None
+    if offset:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=CURSOR_WITH_OFFSET_DETAIL)
+    return decode_cursor(after)
+
+
+def set_next_cursor(response: Response, page_ids: list[int], limit: int) -> None:
+    if len(page_ids) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page_ids[-1])
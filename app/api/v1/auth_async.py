@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.api.v1.auth import _rate_limit_or_raise
+from app.db.session import get_async_db
+from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
+from app.schemas.user import UserResponse
+from app.services.async_auth_service import login_user, register_user
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(
+    payload: RegisterRequest,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+) -> UserResponse:
+    await run_in_threadpool(_rate_limit_or_raise, endpoint="register", request=request, response=response)
+    user = await register_user(payload=payload, db=db)
+    return UserResponse.model_validate(user)
+
+
+@router.post("/login", response_model=TokenResponse, status_code=status.HTTP_200_OK)
+async def login(
+    payload: LoginRequest,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+) -> TokenResponse:
+    await run_in_threadpool(_rate_limit_or_raise, endpoint="login", request=request, response=response)
+    return await login_user(payload=payload, db=db)
@@ -1,191 +1,382 @@
+import logging
 from datetime import date, datetime, time, timedelta, timezone
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
-from fastapi.responses import Response
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
+from app.api.conditional import (
+    build_not_modified_response,
+    build_strong_etag,
+    build_validator_headers,
+    is_not_modified,
+)
 from app.api.deps import get_current_user, require_roles
-from app.api.pagination import LimitParam, OffsetParam
-from app.db.models import Booking, BookingStatus, SpecialistProfile, TimeSlot, User, UserRole, WaitListEntry
+from app.api.idempotency import IdempotentRoute, idempotent, normalize_idempotency_key
+from app.api.pagination import AfterParam, LimitParam, OffsetParam, decode_after_cursor, set_next_cursor
+from app.core.config import settings
+from app.db.models import (
+    Booking,
+    BookingStatus,
+    SpecialistProfile,
+    TimeSlot,
+    User,
+    UserRole,
+    WaitListEntry,
+    WaitListWindow,
+)
 from app.db.session import get_db
 from app.schemas.booking import (
     BookingCreateRequest,
     BookingRescheduleRequest,
     BookingResponse,
+    BookingRunCreateRequest,
+    BookingRunResponse,
+    BookingTicketResponse,
     SpecialistBookingSummaryResponse,
 )
-from app.schemas.wait_list import WaitListCreateRequest, WaitListEntryResponse
-from app.services.calendar_service import build_booking_calendar_ics
-from app.services.booking_service import create_booking_for_slot, reschedule_booking
-from app.services.wait_list_service import add_client_to_wait_list, promote_next_wait_list_entry
+from app.schemas.wait_list import (
+    WaitListCreateRequest,
+    WaitListEntryResponse,
+    WaitListPositionResponse,
+    WaitListWindowCreateRequest,
+    WaitListWindowResponse,
+)
+from app.services.calendar_service import booking_ics_cache, build_booking_calendar_ics, get_booking_ics_version
+from app.services.availability_rollup_service import record_slots_freed
+from app.services.booking_export_service import (
+    BOOKING_EXPORT_MEDIA_TYPES,
+    BookingExportFormat,
+    build_specialist_bookings_export_query,
+    iter_booking_export,
+)
+from app.services.booking_queue_service import (
+    enqueue_booking_request,
+    get_booking_ticket,
+    get_queued_specialist_id,
+)
+from app.services.booking_service import (
+    IDEMPOTENCY_KEY_REUSE_DETAIL,
+    build_booking_mutation_query,
+    cancel_booking_without_locks,
+    create_booking_for_slot,
+    create_booking_run,
+    load_booking_for_mutation,
+    reschedule_booking,
+    uses_slot_row_locks,
+)
+from app.services.slot_admission_service import (
+    claim_slot_admission,
+    clear_slot_admission,
+    complete_slot_admission,
+    release_slot_admission,
+)
+from app.services.wait_list_queue_service import dequeue_wait_list_entries, get_wait_list_position
+from app.services.wait_list_service import (
+    add_client_to_wait_list,
+    add_client_to_wait_list_window,
+    request_wait_list_promotion,
+)
+from app.tasks.booking_queue import apply_queued_bookings_task
+from app.tasks.wait_list_promotions import kick_wait_list_promotions
+
+router = APIRouter(prefix="/bookings", tags=["bookings"], route_class=IdempotentRoute)
+
+BOOKING_CREATE_IDEMPOTENCY_SCOPE = "bookings:create"
+BOOKING_RUN_CREATE_IDEMPOTENCY_SCOPE = "bookings:runs:create"
+BOOKING_CANCEL_IDEMPOTENCY_SCOPE = "bookings:cancel"
+BOOKING_RESCHEDULE_IDEMPOTENCY_SCOPE = "bookings:reschedule"
+WAIT_LIST_JOIN_IDEMPOTENCY_SCOPE = "bookings:wait-list:join"
+WAIT_LIST_WINDOW_JOIN_IDEMPOTENCY_SCOPE = "bookings:wait-list:windows:join"
 
-router = APIRouter(prefix="/bookings", tags=["bookings"])
+logger = logging.getLogger("app.booking_queue")
 
 
-@router.post("", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
+def enqueue_booking_or_none(specialist_id: int, slot_id: int, client_id: int) -> dict[str, Any] | None:
+    try:
+        ticket = enqueue_booking_request(specialist_id=specialist_id, slot_id=slot_id, client_id=client_id)
+    except Exception:
+        logger.exception("booking_enqueue_failed specialist_id=%s slot_id=%s", specialist_id, slot_id)
+        return None
+
+    try:
+        apply_queued_bookings_task.apply_async(args=[specialist_id], retry=False)
+    except Exception:
+        # The periodic drain picks the request up.
+        logger.exception("booking_queue_kick_failed specialist_id=%s", specialist_id)
+    return ticket
+
+
+def build_ticket_accepted_response(ticket: dict[str, Any]) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=BookingTicketResponse.model_validate(ticket).model_dump(mode="json"),
+    )
+
+
+def apply_booking_filters(
+    query: Select[Any],
+    status_filter: BookingStatus | None,
+    date_from: date | None,
+    date_to: date | None,
+) -> Select[Any]:
+    if status_filter:
+        query = query.where(Booking.status == status_filter.value)
+    if date_from:
+        start_dt = datetime.combine(date_from, time.min, tzinfo=timezone.utc)
+        query = query.where(TimeSlot.start_at >= start_dt)
+    if date_to:
+        end_dt = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        query = query.where(TimeSlot.start_at < end_dt)
+    return query
+
+
+def build_client_bookings_query(
+    client_id: int,
+    after_id: int | None,
+    status_filter: BookingStatus | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> Select[tuple[Booking]]:
+    query = (
+        select(Booking)
+        .join(TimeSlot, Booking.slot_id == TimeSlot.id)
+        .where(Booking.client_id == client_id)
+    )
+    query = apply_booking_filters(query, status_filter=status_filter, date_from=date_from, date_to=date_to)
+    if after_id is not None:
+        query = query.where(Booking.id > after_id)
+    return query.order_by(Booking.id)
+
+
+@router.post(
+    "",
+    response_model=BookingResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": BookingTicketResponse}},
+)
+@idempotent(BOOKING_CREATE_IDEMPOTENCY_SCOPE, reuse_detail=IDEMPOTENCY_KEY_REUSE_DETAIL)
 def create_booking(
     payload: BookingCreateRequest,
     idempotency_key: Annotated[str | None, Header(alias="Idempotency-Key")] = None,
     current_user: User = Depends(require_roles(UserRole.CLIENT, UserRole.ADMIN)),
     db: Session = Depends(get_db),
-) -> BookingResponse:
-    normalized_idempotency_key: str | None = None
-    if idempotency_key is not None:
-        normalized_idempotency_key = idempotency_key.strip()
-        if not normalized_idempotency_key:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Idempotency-Key header must not be empty",
-            )
-        if len(normalized_idempotency_key) > 128:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Idempotency-Key header is too long (max 128 characters)",
-            )
+) -> BookingResponse | JSONResponse:
+    normalized_idempotency_key = normalize_idempotency_key(idempotency_key)
+    queued_specialist_id = get_queued_specialist_id(db=db, slot_id=payload.slot_id)
+    if queued_specialist_id is not None:
+        ticket = enqueue_booking_or_none(
+            specialist_id=queued_specialist_id,
+            slot_id=payload.slot_id,
+            client_id=current_user.id,
+        )
+        if ticket is not None:
+            return build_ticket_accepted_response(ticket)
+
+    admitted = claim_slot_admission(slot_id=payload.slot_id, client_id=current_user.id)
+    try:
+        booking = create_booking_for_slot(
+            db=db,
+            slot_id=payload.slot_id,
+            client_id=current_user.id,
+            idempotency_key=normalized_idempotency_key,
+        )
+    except Exception:
+        if admitted:
+            release_slot_admission(slot_id=payload.slot_id, client_id=current_user.id)
+        raise
+
+    if admitted:
+        complete_slot_admission(slot_id=payload.slot_id, client_id=current_user.id)
+    return BookingResponse.model_validate(booking)
+
 
-    booking = create_booking_for_slot(
+@router.post("/runs", response_model=BookingRunResponse, status_code=status.HTTP_201_CREATED)
+@idempotent(BOOKING_RUN_CREATE_IDEMPOTENCY_SCOPE, reuse_detail=IDEMPOTENCY_KEY_REUSE_DETAIL)
+def create_booking_run_for_service(
+    payload: BookingRunCreateRequest,
+    idempotency_key: Annotated[str | None, Header(alias="Idempotency-Key")] = None,
+    current_user: User = Depends(require_roles(UserRole.CLIENT, UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+) -> BookingRunResponse:
+    bookings = create_booking_run(
         db=db,
-        slot_id=payload.slot_id,
+        service_id=payload.service_id,
+        start_slot_id=payload.start_slot_id,
         client_id=current_user.id,
-        idempotency_key=normalized_idempotency_key,
+        idempotency_key=normalize_idempotency_key(idempotency_key),
+    )
+    return BookingRunResponse(
+        run_id=bookings[0].run_id,
+        bookings=[BookingResponse.model_validate(booking) for booking in bookings],
     )
-    return BookingResponse.model_validate(booking)
 
 
 @router.patch("/{booking_id}/cancel", response_model=BookingResponse, status_code=status.HTTP_200_OK)
+@idempotent(BOOKING_CANCEL_IDEMPOTENCY_SCOPE)
 def cancel_booking(
     booking_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> BookingResponse:
-    booking = db.scalar(select(Booking).where(Booking.id == booking_id).with_for_update())
-    if not booking:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
-
-    slot = db.scalar(select(TimeSlot).where(TimeSlot.id == booking.slot_id).with_for_update())
-    if not slot:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slot not found")
-
-    allowed = current_user.role == UserRole.ADMIN.value or booking.client_id == current_user.id
-    if not allowed:
-        specialist = db.scalar(
-            select(SpecialistProfile).where(SpecialistProfile.id == slot.specialist_id)
-        )
-        if specialist and specialist.user_id == current_user.id:
-            allowed = True
-    if not allowed:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    lock_rows = uses_slot_row_locks()
+    booking_query = build_booking_mutation_query(booking_id)
+    if lock_rows:
+        booking_query = booking_query.with_for_update(of=[Booking, TimeSlot])
+    booking, slot = load_booking_for_mutation(db=db, query=booking_query, actor=current_user)
 
     was_cancelled_now = False
     if booking.status != BookingStatus.CANCELLED.value:
-        booking.cancel()
-        slot.is_booked = False
-        was_cancelled_now = True
+        if lock_rows:
+            if slot.is_booked:
+                record_slots_freed(db=db, slot_ids=[slot.id])
+            booking.cancel()
+            slot.is_booked = False
+            was_cancelled_now = True
+        else:
+            was_cancelled_now = cancel_booking_without_locks(db=db, booking=booking)
+        if was_cancelled_now:
+            request_wait_list_promotion(db=db, slot_id=slot.id)
 
     db.commit()
 
     if was_cancelled_now:
-        promote_next_wait_list_entry(db=db, slot_id=slot.id)
+        clear_slot_admission(slot_id=slot.id)
+        kick_wait_list_promotions()
 
     db.refresh(booking)
     return BookingResponse.model_validate(booking)
 
 
 @router.patch("/{booking_id}/reschedule", response_model=BookingResponse, status_code=status.HTTP_200_OK)
+@idempotent(BOOKING_RESCHEDULE_IDEMPOTENCY_SCOPE)
 def reschedule_existing_booking(
     booking_id: int,
     payload: BookingRescheduleRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> BookingResponse:
-    booking = db.scalar(select(Booking).where(Booking.id == booking_id))
-    if not booking:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
-
-    current_slot = db.scalar(select(TimeSlot).where(TimeSlot.id == booking.slot_id))
-    if not current_slot:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slot not found")
+    updated_booking, previous_slot_id = reschedule_booking(
+        db=db,
+        booking_id=booking_id,
+        new_slot_id=payload.slot_id,
+        actor=current_user,
+    )
+    if updated_booking.slot_id != previous_slot_id:
+        clear_slot_admission(slot_id=previous_slot_id)
+    return BookingResponse.model_validate(updated_booking)
 
-    allowed = current_user.role == UserRole.ADMIN.value or booking.client_id == current_user.id
-    if not allowed:
-        specialist = db.scalar(
-            select(SpecialistProfile).where(SpecialistProfile.id == current_slot.specialist_id)
-        )
-        if specialist and specialist.user_id == current_user.id:
-            allowed = True
-    if not allowed:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
 
-    updated_booking = reschedule_booking(db=db, booking_id=booking_id, new_slot_id=payload.slot_id)
-    return BookingResponse.model_validate(updated_booking)
+@router.get("/tickets/{ticket_id}", response_model=BookingTicketResponse, status_code=status.HTTP_200_OK)
+async def get_booking_ticket_status(
+    ticket_id: str,
+    wait: int = Query(default=0, ge=0, le=30),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> BookingTicketResponse:
+    client_id = current_user.id
+    # Give the connection back to the pool before long-polling Redis.
+    await run_in_threadpool(db.close)
+    ticket = await get_booking_ticket(ticket_id=ticket_id, client_id=client_id, wait_seconds=wait)
+    if ticket is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking ticket not found")
+    return BookingTicketResponse.model_validate(ticket)
+
+
+def build_booking_ics_headers(booking_id: int, booking_updated_at: datetime) -> dict[str, str]:
+    headers = build_validator_headers(
+        etag=build_strong_etag("booking", booking_id, get_booking_ics_version(booking_updated_at)),
+        last_modified=booking_updated_at,
+    )
+    headers["Cache-Control"] = "private, no-cache"
+    return headers
 
 
 @router.get("/{booking_id}/calendar.ics", status_code=status.HTTP_200_OK)
 def download_booking_calendar_file(
     booking_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> Response:
-    data = db.execute(
-        select(Booking, TimeSlot, SpecialistProfile, User)
+    state = db.execute(
+        select(Booking.client_id, Booking.updated_at, SpecialistProfile.user_id)
         .join(TimeSlot, Booking.slot_id == TimeSlot.id)
         .join(SpecialistProfile, TimeSlot.specialist_id == SpecialistProfile.id)
-        .join(User, Booking.client_id == User.id)
         .where(Booking.id == booking_id)
     ).first()
-    if not data:
+    if not state:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
 
-    booking, slot, specialist, client = data
+    client_id, booking_updated_at, specialist_user_id = state
     is_admin = current_user.role == UserRole.ADMIN.value
-    is_client_owner = booking.client_id == current_user.id
-    is_specialist_owner = specialist.user_id == current_user.id
+    is_client_owner = client_id == current_user.id
+    is_specialist_owner = specialist_user_id == current_user.id
     if not (is_admin or is_client_owner or is_specialist_owner):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
 
-    ics_content = build_booking_calendar_ics(
-        booking_id=booking.id,
-        slot_start_at=slot.start_at,
-        slot_end_at=slot.end_at,
-        specialist_display_name=specialist.display_name,
-        client_email=client.email,
-        booking_status=booking.status,
-    )
-    filename = f"booking-{booking.id}.ics"
-    return Response(
-        content=ics_content,
-        media_type="text/calendar; charset=utf-8",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+    headers = build_booking_ics_headers(booking_id=booking_id, booking_updated_at=booking_updated_at)
+    if is_not_modified(request, etag=headers["ETag"], last_modified=booking_updated_at):
+        return build_not_modified_response(headers)
+
+    cache_key = (booking_id, get_booking_ics_version(booking_updated_at))
+    ics_content = booking_ics_cache.get(cache_key)
+    if ics_content is None:
+        booking_status, booking_updated_at, slot_start_at, slot_end_at, display_name, client_email = db.execute(
+            select(
+                Booking.status,
+                Booking.updated_at,
+                TimeSlot.start_at,
+                TimeSlot.end_at,
+                SpecialistProfile.display_name,
+                User.email,
+            )
+            .join(TimeSlot, Booking.slot_id == TimeSlot.id)
+            .join(SpecialistProfile, TimeSlot.specialist_id == SpecialistProfile.id)
+            .join(User, Booking.client_id == User.id)
+            .where(Booking.id == booking_id)
+        ).one()
+        ics_content = build_booking_calendar_ics(
+            booking_id=booking_id,
+            slot_start_at=slot_start_at,
+            slot_end_at=slot_end_at,
+            specialist_display_name=display_name,
+            client_email=client_email,
+            booking_status=booking_status,
+            booking_updated_at=booking_updated_at,
+        )
+        # Key by the version that was actually rendered in case the booking changed in between.
+        booking_ics_cache.set((booking_id, get_booking_ics_version(booking_updated_at)), ics_content)
+        headers = build_booking_ics_headers(booking_id=booking_id, booking_updated_at=booking_updated_at)
+
+    headers["Content-Disposition"] = f'attachment; filename="booking-{booking_id}.ics"'
+    return Response(content=ics_content, media_type="text/calendar; charset=utf-8", headers=headers)
 
 
 @router.get("/me", response_model=list[BookingResponse], status_code=status.HTTP_200_OK)
 def list_my_bookings(
+    response: Response,
     status_filter: BookingStatus | None = Query(default=None, alias="status"),
     date_from: date | None = Query(default=None),
     date_to: date | None = Query(default=None),
     limit: LimitParam = 20,
     offset: OffsetParam = 0,
+    after: AfterParam = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> list[BookingResponse]:
-    query = (
-        select(Booking)
-        .join(TimeSlot, Booking.slot_id == TimeSlot.id)
-        .where(Booking.client_id == current_user.id)
+    query = build_client_bookings_query(
+        client_id=current_user.id,
+        after_id=decode_after_cursor(after=after, offset=offset),
+        status_filter=status_filter,
+        date_from=date_from,
+        date_to=date_to,
     )
-    if status_filter:
-        query = query.where(Booking.status == status_filter.value)
-    if date_from:
-        start_dt = datetime.combine(date_from, time.min, tzinfo=timezone.utc)
-        query = query.where(TimeSlot.start_at >= start_dt)
-    if date_to:
-        end_dt = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
-        query = query.where(TimeSlot.start_at < end_dt)
-
-    bookings = db.scalars(query.order_by(Booking.id).limit(limit).offset(offset)).all()
+    bookings = db.scalars(query.limit(limit).offset(offset)).all()
+    set_next_cursor(response=response, page_ids=[booking.id for booking in bookings], limit=limit)
     return [BookingResponse.model_validate(booking) for booking in bookings]
 
 
@@ -195,11 +386,13 @@ def list_my_bookings(
     status_code=status.HTTP_200_OK,
 )
 def list_specialist_bookings(
+    response: Response,
     status_filter: BookingStatus | None = Query(default=None, alias="status"),
     date_from: date | None = Query(default=None),
     date_to: date | None = Query(default=None),
     limit: LimitParam = 20,
     offset: OffsetParam = 0,
+    after: AfterParam = None,
     current_user: User = Depends(require_roles(UserRole.SPECIALIST, UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ) -> list[SpecialistBookingSummaryResponse]:
@@ -213,16 +406,13 @@ def list_specialist_bookings(
         .join(User, Booking.client_id == User.id)
         .where(TimeSlot.specialist_id == profile.id)
     )
-    if status_filter:
-        query = query.where(Booking.status == status_filter.value)
-    if date_from:
-        start_dt = datetime.combine(date_from, time.min, tzinfo=timezone.utc)
-        query = query.where(TimeSlot.start_at >= start_dt)
-    if date_to:
-        end_dt = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
-        query = query.where(TimeSlot.start_at < end_dt)
+    query = apply_booking_filters(query, status_filter=status_filter, date_from=date_from, date_to=date_to)
+    after_id = decode_after_cursor(after=after, offset=offset)
+    if after_id is not None:
+        query = query.where(Booking.id > after_id)
 
     rows = db.execute(query.order_by(Booking.id).limit(limit).offset(offset)).all()
+    set_next_cursor(response=response, page_ids=[booking.id for booking, *_ in rows], limit=limit)
     return [
         SpecialistBookingSummaryResponse(
             id=booking.id,
@@ -231,6 +421,7 @@ def list_specialist_bookings(
             status=booking.status,
             created_at=booking.created_at,
             cancelled_at=booking.cancelled_at,
+            run_id=booking.run_id,
             client_email=client_email,
             slot_start_at=slot_start_at,
             slot_end_at=slot_end_at,
@@ -239,7 +430,42 @@ def list_specialist_bookings(
     ]
 
 
+@router.get("/specialists/me/export", status_code=status.HTTP_200_OK)
+def export_specialist_bookings(
+    export_format: BookingExportFormat = Query(default=BookingExportFormat.CSV, alias="format"),
+    status_filter: BookingStatus | None = Query(default=None, alias="status"),
+    date_from: date | None = Query(default=None),
+    date_to: date | None = Query(default=None),
+    current_user: User = Depends(require_roles(UserRole.SPECIALIST, UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    profile = db.scalar(select(SpecialistProfile).where(SpecialistProfile.user_id == current_user.id))
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Specialist profile not found")
+
+    query = apply_booking_filters(
+        build_specialist_bookings_export_query(specialist_id=profile.id),
+        status_filter=status_filter,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    filename = f"bookings-{profile.id}.{export_format.value}"
+    bind = db.get_bind()
+    db.close()
+    return StreamingResponse(
+        iter_booking_export(
+            bind=bind,
+            query=query,
+            export_format=export_format,
+            batch_size=settings.booking_export_batch_size,
+        ),
+        media_type=BOOKING_EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.post("/wait-list", response_model=WaitListEntryResponse, status_code=status.HTTP_201_CREATED)
+@idempotent(WAIT_LIST_JOIN_IDEMPOTENCY_SCOPE)
 def join_wait_list(
     payload: WaitListCreateRequest,
     current_user: User = Depends(require_roles(UserRole.CLIENT, UserRole.ADMIN)),
@@ -266,12 +492,60 @@ def list_my_wait_list(
     return [WaitListEntryResponse.model_validate(entry) for entry in entries]
 
 
-@router.delete("/wait-list/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
-def leave_wait_list(
-    entry_id: int,
+@router.post("/wait-list/windows", response_model=WaitListWindowResponse, status_code=status.HTTP_201_CREATED)
+@idempotent(WAIT_LIST_WINDOW_JOIN_IDEMPOTENCY_SCOPE)
+def join_wait_list_window(
+    payload: WaitListWindowCreateRequest,
+    current_user: User = Depends(require_roles(UserRole.CLIENT, UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+) -> WaitListWindowResponse:
+    window = add_client_to_wait_list_window(
+        db=db,
+        specialist_id=payload.specialist_id,
+        client_id=current_user.id,
+        window_start=payload.window_start,
+        window_end=payload.window_end,
+    )
+    return WaitListWindowResponse.model_validate(window)
+
+
+@router.get("/wait-list/windows/me", response_model=list[WaitListWindowResponse], status_code=status.HTTP_200_OK)
+def list_my_wait_list_windows(
+    limit: LimitParam = 20,
+    offset: OffsetParam = 0,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> list[WaitListWindowResponse]:
+    windows = db.scalars(
+        select(WaitListWindow)
+        .where(WaitListWindow.client_id == current_user.id)
+        .order_by(WaitListWindow.created_at, WaitListWindow.id)
+        .limit(limit)
+        .offset(offset)
+    ).all()
+    return [WaitListWindowResponse.model_validate(window) for window in windows]
+
+
+@router.delete("/wait-list/windows/{window_id}", status_code=status.HTTP_204_NO_CONTENT)
+def leave_wait_list_window(
+    window_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> Response:
+    window = db.scalar(select(WaitListWindow).where(WaitListWindow.id == window_id))
+    if not window:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wait list window not found")
+
+    is_admin = current_user.role == UserRole.ADMIN.value
+    if not (is_admin or window.client_id == current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+
+    db.delete(window)
+    db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def _get_own_wait_list_entry(db: Session, entry_id: int, current_user: User) -> WaitListEntry:
     entry = db.scalar(select(WaitListEntry).where(WaitListEntry.id == entry_id))
     if not entry:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wait list entry not found")
@@ -279,9 +553,41 @@ def leave_wait_list(
     is_admin = current_user.role == UserRole.ADMIN.value
     if not (is_admin or entry.client_id == current_user.id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return entry
+
+
+@router.get(
+    "/wait-list/{entry_id}/position",
+    response_model=WaitListPositionResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_wait_list_entry_position(
+    entry_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> WaitListPositionResponse:
+    entry = _get_own_wait_list_entry(db=db, entry_id=entry_id, current_user=current_user)
+    ahead, queue_length = get_wait_list_position(db=db, entry=entry)
+    return WaitListPositionResponse(
+        entry_id=entry.id,
+        slot_id=entry.slot_id,
+        position=ahead + 1,
+        queue_length=queue_length,
+    )
+
+
+@router.delete("/wait-list/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
+def leave_wait_list(
+    entry_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Response:
+    entry = _get_own_wait_list_entry(db=db, entry_id=entry_id, current_user=current_user)
+    slot_id = entry.slot_id
 
     db.delete(entry)
     db.commit()
+    dequeue_wait_list_entries([(entry_id, slot_id)])
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -0,0 +1,113 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_async, require_roles_async
+from app.api.idempotency import IdempotentRoute, idempotent, normalize_idempotency_key
+from app.api.v1.bookings import (
+    BOOKING_CREATE_IDEMPOTENCY_SCOPE,
+    BOOKING_RESCHEDULE_IDEMPOTENCY_SCOPE,
+    WAIT_LIST_JOIN_IDEMPOTENCY_SCOPE,
+    build_ticket_accepted_response,
+    enqueue_booking_or_none,
+)
+from app.db.models import User, UserRole
+from app.db.session import get_async_db
+from app.schemas.booking import (
+    BookingCreateRequest,
+    BookingRescheduleRequest,
+    BookingResponse,
+    BookingTicketResponse,
+)
+from app.schemas.wait_list import WaitListCreateRequest, WaitListEntryResponse
+from app.services.async_booking_service import create_booking_for_slot, reschedule_booking
+from app.services.async_wait_list_service import add_client_to_wait_list
+from app.services.booking_queue_service import get_queued_specialist_id
+from app.services.booking_service import IDEMPOTENCY_KEY_REUSE_DETAIL
+from app.services.slot_admission_service import (
+    claim_slot_admission,
+    clear_slot_admission,
+    complete_slot_admission,
+    release_slot_admission,
+)
+
+router = APIRouter(prefix="/bookings", tags=["bookings"], route_class=IdempotentRoute)
+
+
+@router.post(
+    "",
+    response_model=BookingResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": BookingTicketResponse}},
+)
+@idempotent(BOOKING_CREATE_IDEMPOTENCY_SCOPE, reuse_detail=IDEMPOTENCY_KEY_REUSE_DETAIL)
+async def create_booking(
+    payload: BookingCreateRequest,
+    idempotency_key: Annotated[str | None, Header(alias="Idempotency-Key")] = None,
+    current_user: User = Depends(require_roles_async(UserRole.CLIENT, UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_async_db),
+) -> BookingResponse | JSONResponse:
+    normalized_idempotency_key = normalize_idempotency_key(idempotency_key)
+    # Read before the service runs: its rollback on a conflict expires current_user, and reloading it
+    # here would be lazy I/O outside the greenlet.
+    client_id = current_user.id
+    queued_specialist_id = await db.run_sync(get_queued_specialist_id, slot_id=payload.slot_id)
+    if queued_specialist_id is not None:
+        ticket = await run_in_threadpool(
+            enqueue_booking_or_none,
+            specialist_id=queued_specialist_id,
+            slot_id=payload.slot_id,
+            client_id=client_id,
+        )
+        if ticket is not None:
+            return build_ticket_accepted_response(ticket)
+
+    admitted = await run_in_threadpool(claim_slot_admission, slot_id=payload.slot_id, client_id=client_id)
+    try:
+        booking = await create_booking_for_slot(
+            db=db,
+            slot_id=payload.slot_id,
+            client_id=client_id,
+            idempotency_key=normalized_idempotency_key,
+        )
+    except Exception:
+        if admitted:
+            await run_in_threadpool(release_slot_admission, slot_id=payload.slot_id, client_id=client_id)
+        raise
+
+    if admitted:
+        await run_in_threadpool(complete_slot_admission, slot_id=payload.slot_id, client_id=client_id)
+    return BookingResponse.model_validate(booking)
+
+
+@router.patch("/{booking_id}/reschedule", response_model=BookingResponse, status_code=status.HTTP_200_OK)
+@idempotent(BOOKING_RESCHEDULE_IDEMPOTENCY_SCOPE)
+async def reschedule_existing_booking(
+    booking_id: int,
+    payload: BookingRescheduleRequest,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> BookingResponse:
+    updated_booking, previous_slot_id = await reschedule_booking(
+        db=db,
+        booking_id=booking_id,
+        new_slot_id=payload.slot_id,
+        actor=current_user,
+    )
+    if updated_booking.slot_id != previous_slot_id:
+        await run_in_threadpool(clear_slot_admission, slot_id=previous_slot_id)
+    return BookingResponse.model_validate(updated_booking)
+
+
+@router.post("/wait-list", response_model=WaitListEntryResponse, status_code=status.HTTP_201_CREATED)
+@idempotent(WAIT_LIST_JOIN_IDEMPOTENCY_SCOPE)
+async def join_wait_list(
+    payload: WaitListCreateRequest,
+    current_user: User = Depends(require_roles_async(UserRole.CLIENT, UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_async_db),
+) -> WaitListEntryResponse:
+    entry = await add_client_to_wait_list(db=db, slot_id=payload.slot_id, client_id=current_user.id)
+    return WaitListEntryResponse.model_validate(entry)
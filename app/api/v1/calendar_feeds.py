@@ -0,0 +1,144 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import Select, select, update
+from sqlalchemy.orm import Session
+
+from app.api.conditional import (
+    build_not_modified_response,
+    build_strong_etag,
+    build_validator_headers,
+    is_not_modified,
+)
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.security import (
+    create_calendar_feed_token,
+    get_calendar_feed_token_user_id,
+    verify_calendar_feed_token,
+)
+from app.db.models import SpecialistProfile, User
+from app.db.session import get_db
+from app.schemas.calendar_feed import CalendarFeedLinksResponse
+from app.services.calendar_feed_service import (
+    build_client_feed_query,
+    build_specialist_feed_query,
+    get_feed_state,
+    iter_calendar_feed,
+)
+
+CALENDAR_FEED_NOT_FOUND_DETAIL = "Calendar feed not found"
+
+router = APIRouter(prefix="/calendar-feeds", tags=["calendar-feeds"])
+
+
+def _get_feed_owner(db: Session, token: str) -> User:
+    try:
+        user_id = get_calendar_feed_token_user_id(token)
+        user = db.scalar(select(User).where(User.id == user_id))
+        if not user or not user.is_active:
+            raise ValueError("Unknown calendar feed owner")
+        verify_calendar_feed_token(token, user.calendar_feed_token_version)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=CALENDAR_FEED_NOT_FOUND_DETAIL) from None
+    return user
+
+
+def _get_specialist_profile_id(db: Session, user_id: int) -> int | None:
+    return db.scalar(select(SpecialistProfile.id).where(SpecialistProfile.user_id == user_id))
+
+
+def build_calendar_feed_response(
+    request: Request,
+    db: Session,
+    query: Select[Any],
+    feed_name: str,
+    owner_id: int,
+) -> Response:
+    count, last_id, last_updated_at = get_feed_state(db=db, query=query)
+    headers = build_validator_headers(
+        etag=build_strong_etag(feed_name, owner_id, count, last_id, last_updated_at),
+        last_modified=last_updated_at,
+    )
+    headers["Cache-Control"] = "private, no-cache"
+    if is_not_modified(request, etag=headers["ETag"], last_modified=last_updated_at):
+        return build_not_modified_response(headers)
+
+    headers["Content-Disposition"] = f'inline; filename="{feed_name}-{owner_id}.ics"'
+    bind = db.get_bind()
+    db.close()
+    return StreamingResponse(
+        iter_calendar_feed(bind=bind, query=query, batch_size=settings.calendar_feed_batch_size),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
+
+
+def _build_feed_links(request: Request, db: Session, user_id: int, token_version: int) -> CalendarFeedLinksResponse:
+    token = create_calendar_feed_token(user_id, token_version)
+    specialist_feed_url = None
+    if _get_specialist_profile_id(db=db, user_id=user_id) is not None:
+        specialist_feed_url = str(request.url_for("get_specialist_calendar_feed", token=token))
+    return CalendarFeedLinksResponse(
+        client_feed_url=str(request.url_for("get_client_calendar_feed", token=token)),
+        specialist_feed_url=specialist_feed_url,
+    )
+
+
+@router.get("/me", response_model=CalendarFeedLinksResponse, status_code=status.HTTP_200_OK)
+def get_my_calendar_feeds(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> CalendarFeedLinksResponse:
+    return _build_feed_links(
+        request=request,
+        db=db,
+        user_id=current_user.id,
+        token_version=current_user.calendar_feed_token_version,
+    )
+
+
+@router.post("/me/rotate", response_model=CalendarFeedLinksResponse, status_code=status.HTTP_200_OK)
+def rotate_my_calendar_feeds(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> CalendarFeedLinksResponse:
+    user_id = current_user.id
+    token_version = db.scalar(
+        update(User)
+        .where(User.id == user_id)
+        .values(calendar_feed_token_version=User.calendar_feed_token_version + 1)
+        .returning(User.calendar_feed_token_version)
+    )
+    db.commit()
+    return _build_feed_links(request=request, db=db, user_id=user_id, token_version=token_version)
+
+
+@router.get("/{token}/client.ics", status_code=status.HTTP_200_OK)
+def get_client_calendar_feed(token: str, request: Request, db: Session = Depends(get_db)) -> Response:
+    user = _get_feed_owner(db=db, token=token)
+    return build_calendar_feed_response(
+        request=request,
+        db=db,
+        query=build_client_feed_query(client_id=user.id),
+        feed_name="client",
+        owner_id=user.id,
+    )
+
+
+@router.get("/{token}/specialist.ics", status_code=status.HTTP_200_OK)
+def get_specialist_calendar_feed(token: str, request: Request, db: Session = Depends(get_db)) -> Response:
+    user = _get_feed_owner(db=db, token=token)
+    specialist_id = _get_specialist_profile_id(db=db, user_id=user.id)
+    if specialist_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=CALENDAR_FEED_NOT_FOUND_DETAIL)
+    return build_calendar_feed_response(
+        request=request,
+        db=db,
+        query=build_specialist_feed_query(specialist_id=specialist_id),
+        feed_name="specialist",
+        owner_id=specialist_id,
+    )
@@ -1,23 +1,43 @@
+from collections.abc import Sequence
 from datetime import date, datetime, time, timedelta, timezone
+from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import Response
-from sqlalchemy import and_, select
+from pydantic import TypeAdapter
+from sqlalchemy import Select, and_, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, require_roles
+from app.api.idempotency import IdempotentRoute, idempotent
 from app.api.pagination import LimitParam, OffsetParam
-from app.db.models import Service, SpecialistProfile, TimeSlot, User, UserRole
+from app.core.read_cache import read_cache
+from app.db.models import Service, SpecialistDayAvailability, SpecialistProfile, TimeSlot, User, UserRole
 from app.db.session import get_db
 from app.schemas.slot import (
     SlotCreateRequest,
     SlotResponse,
     SpecialistAvailabilityDayResponse,
     SpecialistProfileResponse,
+    SpecialistsAvailabilityResponse,
 )
 from app.schemas.service import ServiceCreateRequest, ServiceResponse
+from app.services.availability_rollup_service import apply_slot_availability_changes
+from app.services.specialist_cache_service import mark_specialists_changed, specialist_cache_namespace
+from app.services.wait_list_service import request_wait_list_promotions
+from app.tasks.wait_list_promotions import kick_wait_list_promotions
 
-router = APIRouter(prefix="/specialists", tags=["specialists"])
+router = APIRouter(prefix="/specialists", tags=["specialists"], route_class=IdempotentRoute)
+
+SERVICE_CREATE_IDEMPOTENCY_SCOPE = "specialists:services:create"
+SLOT_CREATE_IDEMPOTENCY_SCOPE = "specialists:slots:create"
+
+AvailabilityDaysParam = Annotated[int, Query(ge=1, le=31)]
+SpecialistIdsParam = Annotated[list[int], Query(min_length=1, max_length=50)]
+
+SERVICES_JSON_ADAPTER = TypeAdapter(list[ServiceResponse])
+SLOTS_JSON_ADAPTER = TypeAdapter(list[SlotResponse])
+AVAILABILITY_DAYS_JSON_ADAPTER = TypeAdapter(list[SpecialistAvailabilityDayResponse])
 
 
 def _get_or_create_specialist_profile(db: Session, user: User) -> SpecialistProfile:
@@ -32,10 +52,123 @@ def _get_or_create_specialist_profile(db: Session, user: User) -> SpecialistProf
     )
     db.add(profile)
     db.flush()
+    mark_specialists_changed(db, [profile.id])
     return profile
 
 
+def build_slots_query(specialist_id: int, date_filter: date | None) -> Select[tuple[TimeSlot]]:
+    query = select(TimeSlot).where(TimeSlot.specialist_id == specialist_id)
+    if date_filter:
+        start_of_day = datetime.combine(date_filter, time.min, tzinfo=timezone.utc)
+        end_of_day = start_of_day + timedelta(days=1)
+        query = query.where(TimeSlot.start_at >= start_of_day, TimeSlot.start_at < end_of_day)
+    return query.order_by(TimeSlot.start_at)
+
+
+def resolve_availability_window(date_from: date | None, days: int) -> tuple[date, date]:
+    start_date = date_from or datetime.now(timezone.utc).date()
+    return start_date, start_date + timedelta(days=days)
+
+
+def build_availability_counts_query(
+    specialist_ids: Sequence[int],
+    start_date: date,
+    end_date: date,
+) -> Select[tuple[int, date | None, int | None, int | None]]:
+    # The outer join keeps specialists without slots in the window, so existence comes from the same query.
+    return (
+        select(
+            SpecialistProfile.id.label("specialist_id"),
+            SpecialistDayAvailability.day,
+            SpecialistDayAvailability.total_slots,
+            SpecialistDayAvailability.booked_slots,
+        )
+        .select_from(SpecialistProfile)
+        .outerjoin(
+            SpecialistDayAvailability,
+            and_(
+                SpecialistDayAvailability.specialist_id == SpecialistProfile.id,
+                SpecialistDayAvailability.day >= start_date,
+                SpecialistDayAvailability.day < end_date,
+            ),
+        )
+        .where(SpecialistProfile.id.in_(specialist_ids))
+    )
+
+
+def build_services_cache_key(limit: int, offset: int) -> str:
+    return f"services:{limit}:{offset}"
+
+
+def build_slots_cache_key(date_filter: date | None, limit: int, offset: int) -> str:
+    return f"slots:{date_filter}:{limit}:{offset}"
+
+
+def build_availability_cache_key(start_date: date, days: int) -> str:
+    return f"availability:{start_date}:{days}"
+
+
+def build_directory_availability_cache_key(specialist_ids: Sequence[int], start_date: date, days: int) -> str:
+    return f"directory-availability:{','.join(map(str, specialist_ids))}:{start_date}:{days}"
+
+
+def build_cached_json_response(body: str | None) -> Response:
+    # Loaders return None for unknown specialists; misses are not cached, so a new profile shows up at once.
+    if body is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Specialist not found")
+    return Response(content=body, media_type="application/json")
+
+
+def group_availability_counts(
+    rows: Sequence[tuple[int, date | None, int | None, int | None]],
+) -> dict[int, list[tuple[date, int, int]]]:
+    day_counts_by_specialist: dict[int, list[tuple[date, int, int]]] = {}
+    for specialist_id, day, total_slots, booked_slots in rows:
+        day_counts = day_counts_by_specialist.setdefault(specialist_id, [])
+        if day is not None:
+            day_counts.append((day, total_slots, booked_slots))
+    return day_counts_by_specialist
+
+
+def build_availability_days(
+    start_date: date,
+    days: int,
+    day_counts: Sequence[tuple[date, int, int]],
+) -> list[SpecialistAvailabilityDayResponse]:
+    counts_by_day = {day: (total_slots, booked_slots) for day, total_slots, booked_slots in day_counts}
+
+    availability = []
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        total_slots, booked_slots = counts_by_day.get(day, (0, 0))
+        availability.append(
+            SpecialistAvailabilityDayResponse(
+                date=day,
+                total_slots=total_slots,
+                free_slots=total_slots - booked_slots,
+                booked_slots=booked_slots,
+            )
+        )
+    return availability
+
+
+def build_specialists_availability_response(
+    specialist_ids: Sequence[int],
+    start_date: date,
+    days: int,
+    day_counts_by_specialist: dict[int, list[tuple[date, int, int]]],
+) -> SpecialistsAvailabilityResponse:
+    return SpecialistsAvailabilityResponse(
+        availability={
+            specialist_id: build_availability_days(start_date=start_date, days=days, day_counts=day_counts)
+            for specialist_id, day_counts in day_counts_by_specialist.items()
+        },
+        missing_ids=sorted(set(specialist_ids) - day_counts_by_specialist.keys()),
+    )
+
+
 @router.post("/me/services", response_model=ServiceResponse, status_code=status.HTTP_201_CREATED)
+@idempotent(SERVICE_CREATE_IDEMPOTENCY_SCOPE)
 def create_service_for_me(
     payload: ServiceCreateRequest,
     current_user: User = Depends(require_roles(UserRole.SPECIALIST, UserRole.ADMIN)),
@@ -50,6 +183,7 @@ def create_service_for_me(
         price=payload.price,
     )
     db.add(service)
+    mark_specialists_changed(db, [profile.id])
     db.commit()
     db.refresh(service)
     return ServiceResponse.model_validate(service)
@@ -61,15 +195,29 @@ def list_specialist_services(
     limit: LimitParam = 20,
     offset: OffsetParam = 0,
     db: Session = Depends(get_db),
-) -> list[ServiceResponse]:
-    specialist = db.scalar(select(SpecialistProfile).where(SpecialistProfile.id == specialist_id))
-    if not specialist:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Specialist not found")
-
-    services = db.scalars(
-        select(Service).where(Service.specialist_id == specialist_id).order_by(Service.id).limit(limit).offset(offset)
-    ).all()
-    return [ServiceResponse.model_validate(service) for service in services]
+) -> Response:
+    def load_services() -> str | None:
+        specialist_exists = db.scalar(select(SpecialistProfile.id).where(SpecialistProfile.id == specialist_id))
+        if not specialist_exists:
+            return None
+        services = db.scalars(
+            select(Service)
+            .where(Service.specialist_id == specialist_id)
+            .order_by(Service.id)
+            .limit(limit)
+            .offset(offset)
+        ).all()
+        return SERVICES_JSON_ADAPTER.dump_json(
+            [ServiceResponse.model_validate(service) for service in services]
+        ).decode()
+
+    return build_cached_json_response(
+        read_cache.get_or_load(
+            [specialist_cache_namespace(specialist_id)],
+            build_services_cache_key(limit=limit, offset=offset),
+            load_services,
+        )
+    )
 
 
 @router.get("/me", status_code=status.HTTP_200_OK)
@@ -84,6 +232,7 @@ def get_my_specialist_profile(
 
 
 @router.post("/me/slots", response_model=SlotResponse, status_code=status.HTTP_201_CREATED)
+@idempotent(SLOT_CREATE_IDEMPOTENCY_SCOPE)
 def create_slot_for_me(
     payload: SlotCreateRequest,
     current_user: User = Depends(require_roles(UserRole.SPECIALIST, UserRole.ADMIN)),
@@ -110,7 +259,12 @@ def create_slot_for_me(
         is_booked=False,
     )
     db.add(slot)
+    db.flush()
+    apply_slot_availability_changes(db=db, slot_ids=[slot.id], total_delta=1)
+    promotion_requested = request_wait_list_promotions(db=db, slot_ids=[slot.id]) > 0
     db.commit()
+    if promotion_requested:
+        kick_wait_list_promotions()
     db.refresh(slot)
     return SlotResponse.model_validate(slot)
 
@@ -137,6 +291,7 @@ def delete_slot_for_me(
     if slot.is_booked:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Booked slot cannot be deleted")
 
+    apply_slot_availability_changes(db=db, slot_ids=[slot.id], total_delta=-1)
     db.delete(slot)
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -149,19 +304,55 @@ def list_specialist_slots(
     limit: LimitParam = 20,
     offset: OffsetParam = 0,
     db: Session = Depends(get_db),
-) -> list[SlotResponse]:
-    specialist = db.scalar(select(SpecialistProfile).where(SpecialistProfile.id == specialist_id))
-    if not specialist:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Specialist not found")
+) -> Response:
+    def load_slots() -> str | None:
+        specialist_exists = db.scalar(select(SpecialistProfile.id).where(SpecialistProfile.id == specialist_id))
+        if not specialist_exists:
+            return None
+        query = build_slots_query(specialist_id=specialist_id, date_filter=date_filter)
+        slots = db.scalars(query.limit(limit).offset(offset)).all()
+        return SLOTS_JSON_ADAPTER.dump_json([SlotResponse.model_validate(slot) for slot in slots]).decode()
+
+    return build_cached_json_response(
+        read_cache.get_or_load(
+            [specialist_cache_namespace(specialist_id)],
+            build_slots_cache_key(date_filter=date_filter, limit=limit, offset=offset),
+            load_slots,
+        )
+    )
 
-    query = select(TimeSlot).where(TimeSlot.specialist_id == specialist_id)
-    if date_filter:
-        start_of_day = datetime.combine(date_filter, time.min, tzinfo=timezone.utc)
-        end_of_day = start_of_day + timedelta(days=1)
-        query = query.where(TimeSlot.start_at >= start_of_day, TimeSlot.start_at < end_of_day)
 
-    slots = db.scalars(query.order_by(TimeSlot.start_at).limit(limit).offset(offset)).all()
-    return [SlotResponse.model_validate(slot) for slot in slots]
+@router.get(
+    "/availability",
+    response_model=SpecialistsAvailabilityResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_specialists_availability(
+    ids: SpecialistIdsParam,
+    date_from: date | None = Query(default=None),
+    days: AvailabilityDaysParam = 7,
+    db: Session = Depends(get_db),
+) -> Response:
+    start_date, end_date = resolve_availability_window(date_from=date_from, days=days)
+
+    def load_availability() -> str:
+        rows = db.execute(
+            build_availability_counts_query(specialist_ids=ids, start_date=start_date, end_date=end_date)
+        ).all()
+        return build_specialists_availability_response(
+            specialist_ids=ids,
+            start_date=start_date,
+            days=days,
+            day_counts_by_specialist=group_availability_counts(rows),
+        ).model_dump_json()
+
+    return build_cached_json_response(
+        read_cache.get_or_load(
+            [specialist_cache_namespace(specialist_id) for specialist_id in ids],
+            build_directory_availability_cache_key(specialist_ids=ids, start_date=start_date, days=days),
+            load_availability,
+        )
+    )
 
 
 @router.get(
@@ -172,50 +363,25 @@ def list_specialist_slots(
 def get_specialist_availability(
     specialist_id: int,
     date_from: date | None = Query(default=None),
-    days: int = Query(default=7, ge=1, le=31),
+    days: AvailabilityDaysParam = 7,
     db: Session = Depends(get_db),
-) -> list[SpecialistAvailabilityDayResponse]:
-    specialist = db.scalar(select(SpecialistProfile).where(SpecialistProfile.id == specialist_id))
-    if not specialist:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Specialist not found")
-
-    start_date = date_from or datetime.now(timezone.utc).date()
-    start_of_window = datetime.combine(start_date, time.min, tzinfo=timezone.utc)
-    end_of_window = start_of_window + timedelta(days=days)
-
-    slots = db.scalars(
-        select(TimeSlot)
-        .where(
-            TimeSlot.specialist_id == specialist_id,
-            TimeSlot.start_at >= start_of_window,
-            TimeSlot.start_at < end_of_window,
-        )
-        .order_by(TimeSlot.start_at)
-    ).all()
-
-    stats: dict[date, dict[str, int]] = {
-        start_date + timedelta(days=offset): {"total": 0, "free": 0, "booked": 0}
-        for offset in range(days)
-    }
-
-    for slot in slots:
-        slot_date = slot.start_at.astimezone(timezone.utc).date()
-        day_stats = stats.get(slot_date)
-        if day_stats is None:
-            continue
-
-        day_stats["total"] += 1
-        if slot.is_booked:
-            day_stats["booked"] += 1
-        else:
-            day_stats["free"] += 1
-
-    return [
-        SpecialistAvailabilityDayResponse(
-            date=day,
-            total_slots=day_stats["total"],
-            free_slots=day_stats["free"],
-            booked_slots=day_stats["booked"],
+) -> Response:
+    start_date, end_date = resolve_availability_window(date_from=date_from, days=days)
+
+    def load_availability() -> str | None:
+        rows = db.execute(
+            build_availability_counts_query(specialist_ids=[specialist_id], start_date=start_date, end_date=end_date)
+        ).all()
+        day_counts = group_availability_counts(rows).get(specialist_id)
+        if day_counts is None:
+            return None
+        availability = build_availability_days(start_date=start_date, days=days, day_counts=day_counts)
+        return AVAILABILITY_DAYS_JSON_ADAPTER.dump_json(availability).decode()
+
+    return build_cached_json_response(
+        read_cache.get_or_load(
+            [specialist_cache_namespace(specialist_id)],
+            build_availability_cache_key(start_date=start_date, days=days),
+            load_availability,
         )
-        for day, day_stats in stats.items()
-    ]
+    )
@@ -0,0 +1,157 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import LimitParam, OffsetParam
+from app.api.v1.specialists import (
+    AVAILABILITY_DAYS_JSON_ADAPTER,
+    SERVICES_JSON_ADAPTER,
+    SLOTS_JSON_ADAPTER,
+    AvailabilityDaysParam,
+    SpecialistIdsParam,
+    build_availability_cache_key,
+    build_availability_counts_query,
+    build_availability_days,
+    build_cached_json_response,
+    build_directory_availability_cache_key,
+    build_services_cache_key,
+    build_slots_cache_key,
+    build_slots_query,
+    build_specialists_availability_response,
+    group_availability_counts,
+    resolve_availability_window,
+)
+from app.core.read_cache import read_cache
+from app.db.models import Service, SpecialistProfile
+from app.db.session import get_async_db
+from app.schemas.service import ServiceResponse
+from app.schemas.slot import SlotResponse, SpecialistAvailabilityDayResponse, SpecialistsAvailabilityResponse
+from app.services.specialist_cache_service import specialist_cache_namespace
+
+router = APIRouter(prefix="/specialists", tags=["specialists"])
+
+
+async def _specialist_exists(db: AsyncSession, specialist_id: int) -> bool:
+    specialist_exists = await db.scalar(select(SpecialistProfile.id).where(SpecialistProfile.id == specialist_id))
+    return bool(specialist_exists)
+
+
+@router.get("/{specialist_id}/services", response_model=list[ServiceResponse], status_code=status.HTTP_200_OK)
+async def list_specialist_services(
+    specialist_id: int,
+    limit: LimitParam = 20,
+    offset: OffsetParam = 0,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    async def load_services() -> str | None:
+        if not await _specialist_exists(db=db, specialist_id=specialist_id):
+            return None
+        services = await db.scalars(
+            select(Service)
+            .where(Service.specialist_id == specialist_id)
+            .order_by(Service.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return SERVICES_JSON_ADAPTER.dump_json(
+            [ServiceResponse.model_validate(service) for service in services.all()]
+        ).decode()
+
+    return build_cached_json_response(
+        await read_cache.aget_or_load(
+            [specialist_cache_namespace(specialist_id)],
+            build_services_cache_key(limit=limit, offset=offset),
+            load_services,
+        )
+    )
+
+
+@router.get("/{specialist_id}/slots", response_model=list[SlotResponse], status_code=status.HTTP_200_OK)
+async def list_specialist_slots(
+    specialist_id: int,
+    date_filter: date | None = Query(default=None, alias="date"),
+    limit: LimitParam = 20,
+    offset: OffsetParam = 0,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    async def load_slots() -> str | None:
+        if not await _specialist_exists(db=db, specialist_id=specialist_id):
+            return None
+        query = build_slots_query(specialist_id=specialist_id, date_filter=date_filter)
+        slots = await db.scalars(query.limit(limit).offset(offset))
+        return SLOTS_JSON_ADAPTER.dump_json([SlotResponse.model_validate(slot) for slot in slots.all()]).decode()
+
+    return build_cached_json_response(
+        await read_cache.aget_or_load(
+            [specialist_cache_namespace(specialist_id)],
+            build_slots_cache_key(date_filter=date_filter, limit=limit, offset=offset),
+            load_slots,
+        )
+    )
+
+
+@router.get(
+    "/availability",
+    response_model=SpecialistsAvailabilityResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_specialists_availability(
+    ids: SpecialistIdsParam,
+    date_from: date | None = Query(default=None),
+    days: AvailabilityDaysParam = 7,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    start_date, end_date = resolve_availability_window(date_from=date_from, days=days)
+
+    async def load_availability() -> str:
+        rows = await db.execute(
+            build_availability_counts_query(specialist_ids=ids, start_date=start_date, end_date=end_date)
+        )
+        return build_specialists_availability_response(
+            specialist_ids=ids,
+            start_date=start_date,
+            days=days,
+            day_counts_by_specialist=group_availability_counts(rows.all()),
+        ).model_dump_json()
+
+    return build_cached_json_response(
+        await read_cache.aget_or_load(
+            [specialist_cache_namespace(specialist_id) for specialist_id in ids],
+            build_directory_availability_cache_key(specialist_ids=ids, start_date=start_date, days=days),
+            load_availability,
+        )
+    )
+
+
+@router.get(
+    "/{specialist_id}/availability",
+    response_model=list[SpecialistAvailabilityDayResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_specialist_availability(
+    specialist_id: int,
+    date_from: date | None = Query(default=None),
+    days: AvailabilityDaysParam = 7,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    start_date, end_date = resolve_availability_window(date_from=date_from, days=days)
+
+    async def load_availability() -> str | None:
+        rows = await db.execute(
+            build_availability_counts_query(specialist_ids=[specialist_id], start_date=start_date, end_date=end_date)
+        )
+        day_counts = group_availability_counts(rows.all()).get(specialist_id)
+        if day_counts is None:
+            return None
+        availability = build_availability_days(start_date=start_date, days=days, day_counts=day_counts)
+        return AVAILABILITY_DAYS_JSON_ADAPTER.dump_json(availability).decode()
+
+    return build_cached_json_response(
+        await read_cache.aget_or_load(
+            [specialist_cache_namespace(specialist_id)],
+            build_availability_cache_key(start_date=start_date, days=days),
+            load_availability,
+        )
+    )
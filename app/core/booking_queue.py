@@ -0,0 +1,220 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import count
+from typing import Any
+
+import redis
+
+from app.core.config import settings
+
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_RENEW_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class BookingQueue(ABC):
+    @abstractmethod
+    def enqueue(self, partition: int, message: dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def read(self, partition: int, count: int) -> list[tuple[str, dict[str, Any]]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def ack(self, partition: int, message_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def size(self, partition: int) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def acquire_lease(self, partition: int, owner: str, ttl_ms: int) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew_lease(self, partition: int, owner: str, ttl_ms: int) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def release_lease(self, partition: int, owner: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_ticket(self, ticket_id: str, ticket: dict[str, Any], ttl_seconds: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_ticket(self, ticket_id: str) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryBookingQueue(BookingQueue):
+    def __init__(self) -> None:
+        self._streams: dict[int, OrderedDict[str, dict[str, Any]]] = {}
+        self._leases: dict[int, tuple[float, str]] = {}
+        self._tickets: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._message_ids = count(1)
+        self._lock = threading.Lock()
+
+    def enqueue(self, partition: int, message: dict[str, Any]) -> str:
+        with self._lock:
+            message_id = f"{next(self._message_ids)}-0"
+            self._streams.setdefault(partition, OrderedDict())[message_id] = message
+            return message_id
+
+    def read(self, partition: int, count: int) -> list[tuple[str, dict[str, Any]]]:
+        with self._lock:
+            stream = self._streams.get(partition, OrderedDict())
+            return list(stream.items())[:count]
+
+    def ack(self, partition: int, message_id: str) -> None:
+        with self._lock:
+            self._streams.get(partition, OrderedDict()).pop(message_id, None)
+
+    def size(self, partition: int) -> int:
+        with self._lock:
+            return len(self._streams.get(partition, ()))
+
+    def acquire_lease(self, partition: int, owner: str, ttl_ms: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            lease = self._leases.get(partition)
+            if lease is not None and lease[0] > now:
+                return False
+            self._leases[partition] = (now + ttl_ms / 1000, owner)
+            return True
+
+    def renew_lease(self, partition: int, owner: str, ttl_ms: int) -> bool:
+        with self._lock:
+            lease = self._leases.get(partition)
+            if lease is None or lease[1] != owner:
+                return False
+            self._leases[partition] = (time.monotonic() + ttl_ms / 1000, owner)
+            return True
+
+    def release_lease(self, partition: int, owner: str) -> None:
+        with self._lock:
+            lease = self._leases.get(partition)
+            if lease is not None and lease[1] == owner:
+                del self._leases[partition]
+
+    def save_ticket(self, ticket_id: str, ticket: dict[str, Any], ttl_seconds: int) -> None:
+        with self._lock:
+            self._tickets[ticket_id] = (time.monotonic() + ttl_seconds, ticket)
+
+    def get_ticket(self, ticket_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._tickets.get(ticket_id)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._streams.clear()
+            self._leases.clear()
+            self._tickets.clear()
+
+
+class RedisBookingQueue(BookingQueue):
+    def __init__(self, redis_url: str, prefix: str = "booking-queue", group: str = "booking-applier") -> None:
+        self._client = redis.Redis.from_url(
+            redis_url,
+            socket_connect_timeout=0.2,
+            socket_timeout=0.2,
+            decode_responses=True,
+        )
+        self._prefix = prefix
+        self._group = group
+        # A partition has at most one consumer at a time (guarded by the lease), so the name can be fixed:
+        # a new lease holder then re-reads whatever its crashed predecessor left unacknowledged.
+        self._consumer = "applier"
+        self._release_lease_script = self._client.register_script(_RELEASE_LEASE_SCRIPT)
+        self._renew_lease_script = self._client.register_script(_RENEW_LEASE_SCRIPT)
+
+    def _stream_key(self, partition: int) -> str:
+        return f"{self._prefix}:stream:{partition}"
+
+    def _lease_key(self, partition: int) -> str:
+        return f"{self._prefix}:lease:{partition}"
+
+    def _ensure_group(self, partition: int) -> None:
+        try:
+            self._client.xgroup_create(self._stream_key(partition), self._group, id="0", mkstream=True)
+        except redis.ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    def enqueue(self, partition: int, message: dict[str, Any]) -> str:
+        return self._client.xadd(self._stream_key(partition), {"payload": json.dumps(message)})
+
+    def read(self, partition: int, count: int) -> list[tuple[str, dict[str, Any]]]:
+        self._ensure_group(partition)
+        stream_key = self._stream_key(partition)
+        for start_id in ("0", ">"):
+            response = self._client.xreadgroup(self._group, self._consumer, {stream_key: start_id}, count=count)
+            entries = response[0][1] if response else []
+            if entries:
+                return [(message_id, json.loads(fields["payload"])) for message_id, fields in entries]
+        return []
+
+    def ack(self, partition: int, message_id: str) -> None:
+        pipe = self._client.pipeline()
+        pipe.xack(self._stream_key(partition), self._group, message_id)
+        pipe.xdel(self._stream_key(partition), message_id)
+        pipe.execute()
+
+    def size(self, partition: int) -> int:
+        return self._client.xlen(self._stream_key(partition))
+
+    def acquire_lease(self, partition: int, owner: str, ttl_ms: int) -> bool:
+        return bool(self._client.set(self._lease_key(partition), owner, px=ttl_ms, nx=True))
+
+    def renew_lease(self, partition: int, owner: str, ttl_ms: int) -> bool:
+        return bool(self._renew_lease_script(keys=[self._lease_key(partition)], args=[owner, ttl_ms]))
+
+    def release_lease(self, partition: int, owner: str) -> None:
+        self._release_lease_script(keys=[self._lease_key(partition)], args=[owner])
+
+    def save_ticket(self, ticket_id: str, ticket: dict[str, Any], ttl_seconds: int) -> None:
+        self._client.set(f"{self._prefix}:ticket:{ticket_id}", json.dumps(ticket), ex=ttl_seconds)
+
+    def get_ticket(self, ticket_id: str) -> dict[str, Any] | None:
+        raw_ticket = self._client.get(f"{self._prefix}:ticket:{ticket_id}")
+        if raw_ticket is None:
+            return None
+        return json.loads(raw_ticket)
+
+    def reset(self) -> None:
+        keys = self._client.keys(f"{self._prefix}:*")
+        if keys:
+            self._client.delete(*keys)
+
+
+def _build_booking_queue() -> BookingQueue:
+    backend = settings.booking_queue_backend.strip().lower()
+    if backend == "redis":
+        return RedisBookingQueue(redis_url=settings.booking_queue_redis_url)
+    return InMemoryBookingQueue()
+
+
+booking_queue: BookingQueue = _build_booking_queue()
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.idempotency")
+
+
+class IdempotencyCache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, key: str, value: dict[str, Any], ttl_seconds: int) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryIdempotencyCache(IdempotencyCache):
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _get_live_entry(self, key: str, now: float) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._entries[key]
+            return None
+        return value
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            return self._get_live_entry(key, time.monotonic())
+
+    def add(self, key: str, value: dict[str, Any], ttl_seconds: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._get_live_entry(key, now) is not None:
+                return False
+            self._entries[key] = (now + ttl_seconds, value)
+            return True
+
+    def set(self, key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def purge_expired(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired_keys = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired_keys:
+                del self._entries[key]
+        return len(expired_keys)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisIdempotencyCache(IdempotencyCache):
+    def __init__(self, redis_url: str, prefix: str = "idem") -> None:
+        self._client = redis.Redis.from_url(
+            redis_url,
+            socket_connect_timeout=0.2,
+            socket_timeout=0.2,
+            decode_responses=False,
+        )
+        self._prefix = prefix
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        raw_value = self._client.get(f"{self._prefix}:{key}")
+        if raw_value is None:
+            return None
+        return json.loads(raw_value)
+
+    def add(self, key: str, value: dict[str, Any], ttl_seconds: int) -> bool:
+        return bool(self._client.set(f"{self._prefix}:{key}", json.dumps(value), ex=ttl_seconds, nx=True))
+
+    def set(self, key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+        self._client.set(f"{self._prefix}:{key}", json.dumps(value), ex=ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(f"{self._prefix}:{key}")
+
+    def purge_expired(self) -> int:
+        # Redis evicts expired keys on its own.
+        return 0
+
+    def reset(self) -> None:
+        keys = self._client.keys(f"{self._prefix}:*")
+        if keys:
+            self._client.delete(*keys)
+
+
+class FallbackIdempotencyCache(IdempotencyCache):
+    def __init__(self, primary: IdempotencyCache, fallback: IdempotencyCache) -> None:
+        self._primary = primary
+        self._fallback = fallback
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        try:
+            return self._primary.get(key)
+        except Exception:
+            return self._fallback.get(key)
+
+    def add(self, key: str, value: dict[str, Any], ttl_seconds: int) -> bool:
+        try:
+            return self._primary.add(key, value, ttl_seconds)
+        except Exception:
+            return self._fallback.add(key, value, ttl_seconds)
+
+    def set(self, key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+        try:
+            self._primary.set(key, value, ttl_seconds)
+        except Exception:
+            self._fallback.set(key, value, ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        try:
+            self._primary.delete(key)
+        except Exception:
+            pass
+        self._fallback.delete(key)
+
+    def purge_expired(self) -> int:
+        return self._fallback.purge_expired()
+
+    def reset(self) -> None:
+        try:
+            self._primary.reset()
+        except Exception:
+            pass
+        self._fallback.reset()
+
+
+def _build_idempotency_cache() -> IdempotencyCache:
+    backend = settings.idempotency_cache_backend.strip().lower()
+    memory = InMemoryIdempotencyCache()
+    if backend == "memory":
+        return memory
+    if backend == "redis":
+        redis_cache = RedisIdempotencyCache(redis_url=settings.idempotency_cache_redis_url)
+        return FallbackIdempotencyCache(primary=redis_cache, fallback=memory)
+    return memory
+
+
+idempotency_cache: IdempotencyCache = _build_idempotency_cache()
+
+
+async def sweep_expired_idempotency_keys(interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            purged = idempotency_cache.purge_expired()
+        except Exception:
+            logger.exception("idempotency_sweep_failed")
+            continue
+        if purged:
+            logger.info("idempotency_sweep_completed purged=%s", purged)
@@ -12,6 +12,38 @@ REQUEST_LATENCY = Histogram(
     ["method", "path"],
 )
 
+BOOKING_CONCURRENCY_RETRIES = Counter(
+    "booking_concurrency_retries_total",
+    "Server-side booking retries by concurrency strategy and outcome",
+    ["strategy", "outcome"],
+)
+
+IDEMPOTENT_REPLAYS = Counter(
+    "idempotent_replays_total",
+    "Mutating requests answered from the idempotency cache",
+    ["scope"],
+)
+
+SLOT_GATE_REJECTIONS = Counter(
+    "slot_gate_rejections_total",
+    "Booking attempts rejected by the per-slot admission gate before reaching the database",
+    ["state"],
+)
+
+
+READ_CACHE_LOOKUPS = Counter(
+    "read_cache_lookups_total",
+    "Specialist read cache lookups by the tier that answered them",
+    ["tier"],
+)
+
+
+WAIT_LIST_GC_DELETED_ROWS = Counter(
+    "wait_list_gc_deleted_rows_total",
+    "Wait-list rows removed by the garbage collection task because their slot or window is in the past",
+    ["kind"],
+)
+
 
 def render_metrics() -> tuple[bytes, str]:
     return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,326 @@
+import asyncio
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Sequence
+
+import redis
+
+from app.core.config import settings
+from app.core.lru_cache import LRUCache
+from app.core.metrics import READ_CACHE_LOOKUPS
+
+
+class ReadCacheStore(ABC):
+    @abstractmethod
+    def get(self, key: str) -> str | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_versions(self, namespaces: Sequence[str]) -> list[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def bump_version(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryReadCacheStore(ReadCacheStore):
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[float, str]] = {}
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+
+    def get_versions(self, namespaces: Sequence[str]) -> list[int]:
+        with self._lock:
+            return [self._versions.get(namespace, 0) for namespace in namespaces]
+
+    def bump_version(self, namespace: str) -> int:
+        with self._lock:
+            version = self._versions.get(namespace, 0) + 1
+            self._versions[namespace] = version
+            # Entries of older versions are unreachable now; drop them instead of waiting for the TTL.
+            stale_prefix = f"{namespace}@"
+            for key in [key for key in self._entries if stale_prefix in key]:
+                del self._entries[key]
+            return version
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class RedisReadCacheStore(ReadCacheStore):
+    def __init__(self, redis_url: str, prefix: str = "read-cache") -> None:
+        self._client = redis.Redis.from_url(
+            redis_url,
+            socket_connect_timeout=0.2,
+            socket_timeout=0.2,
+            decode_responses=True,
+        )
+        self._prefix = prefix
+
+    def get(self, key: str) -> str | None:
+        return self._client.get(f"{self._prefix}:entry:{key}")
+
+    def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._client.set(f"{self._prefix}:entry:{key}", value, ex=ttl_seconds)
+
+    def get_versions(self, namespaces: Sequence[str]) -> list[int]:
+        raw_versions = self._client.mget([f"{self._prefix}:version:{namespace}" for namespace in namespaces])
+        return [int(raw_version or 0) for raw_version in raw_versions]
+
+    def bump_version(self, namespace: str) -> int:
+        return int(self._client.incr(f"{self._prefix}:version:{namespace}"))
+
+    def reset(self) -> None:
+        keys = self._client.keys(f"{self._prefix}:*")
+        if keys:
+            self._client.delete(*keys)
+
+
+class FallbackReadCacheStore(ReadCacheStore):
+    def __init__(self, primary: ReadCacheStore, fallback: ReadCacheStore) -> None:
+        self._primary = primary
+        self._fallback = fallback
+        self._missed_bumps: set[str] = set()
+        self._missed_bumps_lock = threading.Lock()
+
+    def _replay_missed_bumps(self) -> None:
+        # A bump that only reached the fallback would let the primary serve entries of the old version again
+        # once it is back, so the primary is not used until every missed bump has been replayed on it.
+        if not self._missed_bumps:
+            return
+        with self._missed_bumps_lock:
+            namespaces = sorted(self._missed_bumps)
+        for namespace in namespaces:
+            self._primary.bump_version(namespace)
+            with self._missed_bumps_lock:
+                self._missed_bumps.discard(namespace)
+
+    def get(self, key: str) -> str | None:
+        try:
+            self._replay_missed_bumps()
+            return self._primary.get(key)
+        except Exception:
+            return self._fallback.get(key)
+
+    def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        try:
+            self._replay_missed_bumps()
+            self._primary.set(key, value, ttl_seconds)
+        except Exception:
+            self._fallback.set(key, value, ttl_seconds)
+
+    def get_versions(self, namespaces: Sequence[str]) -> list[int]:
+        try:
+            self._replay_missed_bumps()
+            return self._primary.get_versions(namespaces)
+        except Exception:
+            return self._fallback.get_versions(namespaces)
+
+    def bump_version(self, namespace: str) -> int:
+        fallback_version = self._fallback.bump_version(namespace)
+        try:
+            self._replay_missed_bumps()
+            return self._primary.bump_version(namespace)
+        except Exception:
+            with self._missed_bumps_lock:
+                self._missed_bumps.add(namespace)
+            return fallback_version
+
+    def reset(self) -> None:
+        try:
+            self._primary.reset()
+        except Exception:
+            pass
+        self._fallback.reset()
+        with self._missed_bumps_lock:
+            self._missed_bumps.clear()
+
+
+class _Flight:
+    def __init__(self, event: threading.Event | asyncio.Event) -> None:
+        self.event = event
+        self.value: str | None = None
+        self.error: BaseException | None = None
+
+
+class TwoTierReadCache:
+    def __init__(
+        self,
+        store: ReadCacheStore,
+        local_maxsize: int,
+        local_ttl_seconds: float,
+        shared_ttl_seconds: int,
+    ) -> None:
+        self._store = store
+        self._shared_ttl_seconds = shared_ttl_seconds
+        # Versions are cached as briefly as entries, so another process's bump is seen within one local TTL.
+        self._local: LRUCache[str, str] = LRUCache(maxsize=local_maxsize, ttl_seconds=local_ttl_seconds)
+        self._versions: LRUCache[str, int] = LRUCache(maxsize=local_maxsize, ttl_seconds=local_ttl_seconds)
+        self._flights: dict[str, _Flight] = {}
+        self._async_flights: dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+
+    def _resolve_versions(self, namespaces: Sequence[str]) -> list[int]:
+        versions = [self._versions.get(namespace) for namespace in namespaces]
+        missing = [namespace for namespace, version in zip(namespaces, versions) if version is None]
+        if missing:
+            fetched = dict(zip(missing, self._store.get_versions(missing)))
+            for namespace, version in fetched.items():
+                self._versions.set(namespace, version)
+            versions = [
+                fetched[namespace] if version is None else version for namespace, version in zip(namespaces, versions)
+            ]
+        return versions
+
+    def _build_cache_key(self, namespaces: Sequence[str], key: str) -> str:
+        versions = self._resolve_versions(namespaces)
+        versioned = ",".join(f"{namespace}@{version}" for namespace, version in zip(namespaces, versions))
+        if len(namespaces) == 1:
+            return f"{versioned}:{key}"
+        return f"multi:{hashlib.sha1(versioned.encode()).hexdigest()}:{key}"
+
+    def _lookup(self, cache_key: str) -> str | None:
+        value = self._local.get(cache_key)
+        if value is not None:
+            READ_CACHE_LOOKUPS.labels(tier="local").inc()
+        return value
+
+    def _lookup_shared(self, cache_key: str) -> str | None:
+        value = self._store.get(cache_key)
+        if value is not None:
+            READ_CACHE_LOOKUPS.labels(tier="shared").inc()
+            self._local.set(cache_key, value)
+        return value
+
+    def _store_loaded(self, cache_key: str, value: str | None) -> None:
+        READ_CACHE_LOOKUPS.labels(tier="miss").inc()
+        if value is None:
+            return
+        self._store.set(cache_key, value, self._shared_ttl_seconds)
+        self._local.set(cache_key, value)
+
+    def get_or_load(self, namespaces: Sequence[str], key: str, loader: Callable[[], str | None]) -> str | None:
+        if not settings.read_cache_enabled:
+            return loader()
+
+        cache_key = self._build_cache_key(namespaces, key)
+        value = self._lookup(cache_key)
+        if value is not None:
+            return value
+
+        with self._flights_lock:
+            flight = self._flights.get(cache_key)
+            is_leader = flight is None
+            if flight is None:
+                flight = self._flights[cache_key] = _Flight(threading.Event())
+        if not is_leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._lookup_shared(cache_key)
+            if flight.value is None:
+                flight.value = loader()
+                self._store_loaded(cache_key, flight.value)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[cache_key]
+            flight.event.set()
+
+    async def aget_or_load(
+        self,
+        namespaces: Sequence[str],
+        key: str,
+        loader: Callable[[], Awaitable[str | None]],
+    ) -> str | None:
+        if not settings.read_cache_enabled:
+            return await loader()
+
+        # The store is blocking, so it is only touched off the event loop.
+        cache_key = await asyncio.to_thread(self._build_cache_key, namespaces, key)
+        value = self._lookup(cache_key)
+        if value is not None:
+            return value
+
+        flight = self._async_flights.get(cache_key)
+        if flight is not None:
+            await flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        flight = self._async_flights[cache_key] = _Flight(asyncio.Event())
+        try:
+            flight.value = await asyncio.to_thread(self._lookup_shared, cache_key)
+            if flight.value is None:
+                flight.value = await loader()
+                await asyncio.to_thread(self._store_loaded, cache_key, flight.value)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            del self._async_flights[cache_key]
+            flight.event.set()
+
+    def invalidate(self, namespaces: Sequence[str]) -> None:
+        for namespace in namespaces:
+            self._versions.set(namespace, self._store.bump_version(namespace))
+
+    def reset(self) -> None:
+        self._store.reset()
+        self._local.clear()
+        self._versions.clear()
+
+
+def _build_read_cache_store() -> ReadCacheStore:
+    backend = settings.read_cache_backend.strip().lower()
+    memory = InMemoryReadCacheStore()
+    if backend == "memory":
+        return memory
+    if backend == "redis":
+        redis_store = RedisReadCacheStore(redis_url=settings.read_cache_redis_url)
+        return FallbackReadCacheStore(primary=redis_store, fallback=memory)
+    return memory
+
+
+read_cache = TwoTierReadCache(
+    store=_build_read_cache_store(),
+    local_maxsize=settings.read_cache_local_size,
+    local_ttl_seconds=settings.read_cache_local_ttl_seconds,
+    shared_ttl_seconds=settings.read_cache_ttl_seconds,
+)
@@ -1,3 +1,5 @@
+import hashlib
+import hmac
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -31,3 +33,28 @@ def decode_access_token(token: str) -> dict[str, Any]:
         return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
     except JWTError as exc:
         raise ValueError("Invalid token") from exc
+
+
+def _sign_calendar_feed(user_id: int, token_version: int) -> str:
+    # Version 0 keeps the original message so links issued before rotation existed stay valid until rotated.
+    message = f"calendar-feed:{user_id}" if token_version == 0 else f"calendar-feed:{user_id}:{token_version}"
+    return hmac.new(settings.jwt_secret_key.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+
+def create_calendar_feed_token(user_id: int, token_version: int) -> str:
+    return f"{user_id}.{_sign_calendar_feed(user_id, token_version)}"
+
+
+def get_calendar_feed_token_user_id(token: str) -> int:
+    user_id, _, _ = token.partition(".")
+    if not user_id.isdigit():
+        raise ValueError("Invalid calendar feed token")
+    return int(user_id)
+
+
+def verify_calendar_feed_token(token: str, token_version: int) -> int:
+    user_id = get_calendar_feed_token_user_id(token)
+    _, _, signature = token.partition(".")
+    if not hmac.compare_digest(signature, _sign_calendar_feed(user_id, token_version)):
+        raise ValueError("Invalid calendar feed token")
+    return user_id
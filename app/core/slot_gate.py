@@ -0,0 +1,159 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import redis
+
+from app.core.config import settings
+
+_CLAIM_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return false
+end
+return redis.call('GET', KEYS[1])
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SlotGate(ABC):
+    @abstractmethod
+    def claim(self, slot_id: int, holder: str, ttl_ms: int) -> str | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def mark(self, slot_id: int, holder: str, ttl_ms: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self, slot_id: int, holder: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self, slot_id: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class InMemorySlotGate(SlotGate):
+    def __init__(self) -> None:
+        self._holders: dict[int, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, slot_id: int, holder: str, ttl_ms: int) -> str | None:
+        now = time.monotonic()
+        with self._lock:
+            current = self._holders.get(slot_id)
+            if current is not None and current[0] > now:
+                return current[1]
+            self._holders[slot_id] = (now + ttl_ms / 1000, holder)
+            return None
+
+    def mark(self, slot_id: int, holder: str, ttl_ms: int) -> None:
+        with self._lock:
+            self._holders[slot_id] = (time.monotonic() + ttl_ms / 1000, holder)
+
+    def release(self, slot_id: int, holder: str) -> None:
+        with self._lock:
+            current = self._holders.get(slot_id)
+            if current is not None and current[1] == holder:
+                del self._holders[slot_id]
+
+    def clear(self, slot_id: int) -> None:
+        with self._lock:
+            self._holders.pop(slot_id, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._holders.clear()
+
+
+class RedisSlotGate(SlotGate):
+    def __init__(self, redis_url: str, prefix: str = "slot-gate") -> None:
+        self._client = redis.Redis.from_url(
+            redis_url,
+            socket_connect_timeout=0.2,
+            socket_timeout=0.2,
+            decode_responses=True,
+        )
+        self._prefix = prefix
+        self._claim_script = self._client.register_script(_CLAIM_SCRIPT)
+        self._release_script = self._client.register_script(_RELEASE_SCRIPT)
+
+    def claim(self, slot_id: int, holder: str, ttl_ms: int) -> str | None:
+        return self._claim_script(keys=[f"{self._prefix}:{slot_id}"], args=[holder, ttl_ms])
+
+    def mark(self, slot_id: int, holder: str, ttl_ms: int) -> None:
+        self._client.set(f"{self._prefix}:{slot_id}", holder, px=ttl_ms)
+
+    def release(self, slot_id: int, holder: str) -> None:
+        self._release_script(keys=[f"{self._prefix}:{slot_id}"], args=[holder])
+
+    def clear(self, slot_id: int) -> None:
+        self._client.delete(f"{self._prefix}:{slot_id}")
+
+    def reset(self) -> None:
+        keys = self._client.keys(f"{self._prefix}:*")
+        if keys:
+            self._client.delete(*keys)
+
+
+class FallbackSlotGate(SlotGate):
+    def __init__(self, primary: SlotGate, fallback: SlotGate) -> None:
+        self._primary = primary
+        self._fallback = fallback
+
+    def claim(self, slot_id: int, holder: str, ttl_ms: int) -> str | None:
+        try:
+            return self._primary.claim(slot_id, holder, ttl_ms)
+        except Exception:
+            return self._fallback.claim(slot_id, holder, ttl_ms)
+
+    def mark(self, slot_id: int, holder: str, ttl_ms: int) -> None:
+        try:
+            self._primary.mark(slot_id, holder, ttl_ms)
+        except Exception:
+            self._fallback.mark(slot_id, holder, ttl_ms)
+
+    def release(self, slot_id: int, holder: str) -> None:
+        try:
+            self._primary.release(slot_id, holder)
+        except Exception:
+            pass
+        self._fallback.release(slot_id, holder)
+
+    def clear(self, slot_id: int) -> None:
+        try:
+            self._primary.clear(slot_id)
+        except Exception:
+            pass
+        self._fallback.clear(slot_id)
+
+    def reset(self) -> None:
+        try:
+            self._primary.reset()
+        except Exception:
+            pass
+        self._fallback.reset()
+
+
+def _build_slot_gate() -> SlotGate:
+    backend = settings.slot_gate_backend.strip().lower()
+    memory = InMemorySlotGate()
+    if backend == "memory":
+        return memory
+    if backend == "redis":
+        redis_gate = RedisSlotGate(redis_url=settings.slot_gate_redis_url)
+        return FallbackSlotGate(primary=redis_gate, fallback=memory)
+    return memory
+
+
+slot_gate: SlotGate = _build_slot_gate()
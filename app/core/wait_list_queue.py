@@ -0,0 +1,156 @@
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+import redis
+
+from app.core.config import settings
+
+
+class WaitListQueue(ABC):
+    @abstractmethod
+    def add(self, slot_id: int, entries: Sequence[tuple[int, int]]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove(self, slot_id: int, entry_ids: Sequence[int]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def rank(self, slot_id: int, entry_id: int) -> tuple[int, int] | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def replace(self, slot_id: int, entries: Sequence[tuple[int, int]]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def slot_ids(self) -> list[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryWaitListQueue(WaitListQueue):
+    def __init__(self) -> None:
+        self._queues: dict[int, list[tuple[int, int]]] = {}
+        self._scores: dict[int, dict[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, slot_id: int, entries: Sequence[tuple[int, int]]) -> None:
+        with self._lock:
+            queue = self._queues.setdefault(slot_id, [])
+            scores = self._scores.setdefault(slot_id, {})
+            for entry_id, score in entries:
+                if entry_id not in scores:
+                    scores[entry_id] = score
+                    bisect.insort(queue, (score, entry_id))
+
+    def remove(self, slot_id: int, entry_ids: Sequence[int]) -> None:
+        with self._lock:
+            queue = self._queues.get(slot_id, [])
+            scores = self._scores.get(slot_id, {})
+            for entry_id in entry_ids:
+                score = scores.pop(entry_id, None)
+                if score is not None:
+                    del queue[bisect.bisect_left(queue, (score, entry_id))]
+            if not queue:
+                self._queues.pop(slot_id, None)
+                self._scores.pop(slot_id, None)
+
+    def rank(self, slot_id: int, entry_id: int) -> tuple[int, int] | None:
+        with self._lock:
+            score = self._scores.get(slot_id, {}).get(entry_id)
+            if score is None:
+                return None
+            queue = self._queues[slot_id]
+            return bisect.bisect_left(queue, (score, entry_id)), len(queue)
+
+    def replace(self, slot_id: int, entries: Sequence[tuple[int, int]]) -> None:
+        with self._lock:
+            if not entries:
+                self._queues.pop(slot_id, None)
+                self._scores.pop(slot_id, None)
+                return
+            self._queues[slot_id] = sorted((score, entry_id) for entry_id, score in entries)
+            self._scores[slot_id] = dict(entries)
+
+    def slot_ids(self) -> list[int]:
+        with self._lock:
+            return list(self._queues)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._queues.clear()
+            self._scores.clear()
+
+
+class RedisWaitListQueue(WaitListQueue):
+    def __init__(self, redis_url: str, prefix: str = "wait-list") -> None:
+        self._client = redis.Redis.from_url(
+            redis_url,
+            socket_connect_timeout=0.2,
+            socket_timeout=0.2,
+            decode_responses=True,
+        )
+        self._prefix = prefix
+
+    def _key(self, slot_id: int) -> str:
+        return f"{self._prefix}:{slot_id}"
+
+    @staticmethod
+    def _member(entry_id: int) -> str:
+        # Equal scores are ordered by member bytes; zero padding makes that the numeric id order.
+        return f"{entry_id:020d}"
+
+    def add(self, slot_id: int, entries: Sequence[tuple[int, int]]) -> None:
+        if entries:
+            self._client.zadd(
+                self._key(slot_id),
+                {self._member(entry_id): score for entry_id, score in entries},
+                nx=True,
+            )
+
+    def remove(self, slot_id: int, entry_ids: Sequence[int]) -> None:
+        if entry_ids:
+            self._client.zrem(self._key(slot_id), *map(self._member, entry_ids))
+
+    def rank(self, slot_id: int, entry_id: int) -> tuple[int, int] | None:
+        pipeline = self._client.pipeline(transaction=False)
+        pipeline.zrank(self._key(slot_id), self._member(entry_id))
+        pipeline.zcard(self._key(slot_id))
+        position, size = pipeline.execute()
+        if position is None:
+            return None
+        return int(position), int(size)
+
+    def replace(self, slot_id: int, entries: Sequence[tuple[int, int]]) -> None:
+        pipeline = self._client.pipeline(transaction=True)
+        pipeline.delete(self._key(slot_id))
+        if entries:
+            pipeline.zadd(self._key(slot_id), {self._member(entry_id): score for entry_id, score in entries})
+        pipeline.execute()
+
+    def slot_ids(self) -> list[int]:
+        prefix = f"{self._prefix}:"
+        return [int(key.removeprefix(prefix)) for key in self._client.scan_iter(match=f"{prefix}*", count=1000)]
+
+    def reset(self) -> None:
+        keys = self._client.keys(f"{self._prefix}:*")
+        if keys:
+            self._client.delete(*keys)
+
+
+def _build_wait_list_queue() -> WaitListQueue:
+    # No in-memory fallback for the redis backend: a per-process copy would drift from the other workers,
+    # so callers fall back to the wait_list_entries table instead.
+    backend = settings.wait_list_queue_backend.strip().lower()
+    if backend == "redis":
+        return RedisWaitListQueue(redis_url=settings.wait_list_queue_redis_url)
+    return InMemoryWaitListQueue()
+
+
+wait_list_queue: WaitListQueue = _build_wait_list_queue()
@@ -1,17 +1,23 @@
 from app.db.models.booking import Booking, BookingStatus
 from app.db.models.service import Service
+from app.db.models.specialist_day_availability import SpecialistDayAvailability
 from app.db.models.specialist_profile import SpecialistProfile
 from app.db.models.time_slot import TimeSlot
 from app.db.models.user import User, UserRole
 from app.db.models.wait_list_entry import WaitListEntry
+from app.db.models.wait_list_promotion import WaitListPromotion
+from app.db.models.wait_list_window import WaitListWindow
 
 __all__ = [
     "User",
     "UserRole",
     "SpecialistProfile",
+    "SpecialistDayAvailability",
     "Service",
     "TimeSlot",
     "Booking",
     "BookingStatus",
     "WaitListEntry",
+    "WaitListPromotion",
+    "WaitListWindow",
 ]
@@ -0,0 +1,19 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SpecialistDayAvailability(Base):
+    __tablename__ = "specialist_day_availability"
+
+    specialist_id: Mapped[int] = mapped_column(
+        ForeignKey("specialist_profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    total_slots: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    free_slots: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    booked_slots: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -8,6 +8,14 @@ from app.db.base import Base
 
 class TimeSlot(Base):
     __tablename__ = "time_slots"
+    __table_args__ = (
+        Index(
+            "ix_time_slots_specialist_id_start_at",
+            "specialist_id",
+            "start_at",
+            postgresql_include=["is_booked"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     specialist_id: Mapped[int] = mapped_column(
@@ -16,9 +24,12 @@ class TimeSlot(Base):
     start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     is_booked: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
 
     specialist = relationship("SpecialistProfile", back_populates="time_slots")
     booking = relationship("Booking", back_populates="slot", uselist=False)
+
+    __mapper_args__ = {"version_id_col": version}
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, UniqueConstraint, func
+from sqlalchemy import DateTime, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -10,6 +10,7 @@ class WaitListEntry(Base):
     __tablename__ = "wait_list_entries"
     __table_args__ = (
         UniqueConstraint("slot_id", "client_id", name="uq_wait_list_slot_client"),
+        Index("ix_wait_list_entries_slot_id_created_at_id", "slot_id", "created_at", "id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
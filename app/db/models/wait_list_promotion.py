@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class WaitListPromotion(Base):
+    __tablename__ = "wait_list_promotions"
+    __table_args__ = (Index("ix_wait_list_promotions_available_at", "available_at"),)
+
+    # One pending row per slot: repeated requests for the same slot collapse into it.
+    slot_id: Mapped[int] = mapped_column(ForeignKey("time_slots.id", ondelete="CASCADE"), primary_key=True)
+    requested_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
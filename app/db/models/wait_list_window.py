@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, UniqueConstraint, func, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+
+
+class WaitListWindow(Base):
+    __tablename__ = "wait_list_windows"
+    __table_args__ = (
+        UniqueConstraint(
+            "specialist_id",
+            "client_id",
+            "window_start",
+            "window_end",
+            name="uq_wait_list_window_specialist_client_window",
+        ),
+        # Interval index for "which windows of this specialist contain this slot". The specialist is stored as
+        # a one-point range so both columns use the built-in range GiST opclass, without btree_gist.
+        Index(
+            "ix_wait_list_windows_specialist_window",
+            text("int4range(specialist_id, specialist_id, '[]')"),
+            text("tstzrange(window_start, window_end, '[]')"),
+            postgresql_using="gist",
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_wait_list_windows_window_end", "window_end"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    specialist_id: Mapped[int] = mapped_column(
+        ForeignKey("specialist_profiles.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    client_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    window_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    window_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    specialist = relationship("SpecialistProfile")
+    client = relationship("User")
@@ -1,7 +1,11 @@
-from collections.abc import Generator
+import asyncio
+from collections.abc import AsyncGenerator, Callable, Generator
+from typing import ParamSpec, TypeVar
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.util.concurrency import await_only, in_greenlet
 
 from app.core.config import settings
 
@@ -9,9 +13,41 @@ engine = create_engine(settings.database_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def is_async_database_mode() -> bool:
+    return settings.database_mode.strip().lower() == "async"
+
+
+def _build_async_session_factory() -> async_sessionmaker[AsyncSession] | None:
+    if not is_async_database_mode():
+        return None
+    async_engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+    return async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+AsyncSessionLocal = _build_async_session_factory()
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def run_blocking_io(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    # Session hooks and services also run under AsyncSession (run_sync, commit) in SQLAlchemy's greenlet on the
+    # event loop thread; there, blocking I/O such as Redis goes to a worker thread and is awaited.
+    if in_greenlet():
+        return await_only(asyncio.to_thread(func, *args, **kwargs))
+    return func(*args, **kwargs)
+
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database mode is disabled. Set DATABASE_MODE=async")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,5 +1,8 @@
+import asyncio
 import logging
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from uuid import uuid4
 
 from fastapi import FastAPI
@@ -8,24 +11,50 @@ from fastapi import Request, Response
 from fastapi.exceptions import RequestValidationError
 
 from app.api.v1.auth import router as auth_router
+from app.api.v1.auth_async import router as auth_async_router
 from app.api.v1.bookings import router as bookings_router
+from app.api.v1.bookings_async import router as bookings_async_router
+from app.api.v1.calendar_feeds import router as calendar_feeds_router
 from app.api.v1.specialists import router as specialists_router
+from app.api.v1.specialists_async import router as specialists_async_router
 from app.api.v1.users import router as users_router
+from app.core.config import settings
 from app.core.exceptions import http_exception_handler, validation_exception_handler
+from app.core.idempotency_cache import sweep_expired_idempotency_keys
 from app.core.logging import setup_logging
 from app.core.metrics import REQUEST_COUNT, REQUEST_LATENCY, render_metrics
 from app.core.request_context import request_id_ctx_var
+from app.db.session import is_async_database_mode
 
-app = FastAPI(title="Booking API", version="0.3.2")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    idempotency_sweeper = asyncio.create_task(
+        sweep_expired_idempotency_keys(interval_seconds=settings.idempotency_sweep_interval_seconds)
+    )
+    try:
+        yield
+    finally:
+        idempotency_sweeper.cancel()
+
+
+app = FastAPI(title="Booking API", version="0.3.2", lifespan=lifespan)
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 setup_logging()
 logger = logging.getLogger("app.request")
 
+if is_async_database_mode():
+    # Registered first so they shadow the sync handlers; everything else falls through to the sync routers.
+    app.include_router(auth_async_router)
+    app.include_router(specialists_async_router)
+    app.include_router(bookings_async_router)
+
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(specialists_router)
 app.include_router(bookings_router)
+app.include_router(calendar_feeds_router)
 
 
 @app.middleware("http")
@@ -11,6 +11,11 @@ class BookingRescheduleRequest(BaseModel):
     slot_id: int
 
 
+class BookingRunCreateRequest(BaseModel):
+    service_id: int
+    start_slot_id: int
+
+
 class BookingResponse(BaseModel):
     id: int
     slot_id: int
@@ -18,11 +23,25 @@ class BookingResponse(BaseModel):
     status: str
     created_at: datetime
     cancelled_at: datetime | None
+    run_id: str | None = None
 
     model_config = {"from_attributes": True}
 
 
+class BookingRunResponse(BaseModel):
+    run_id: str
+    bookings: list[BookingResponse]
+
+
 class SpecialistBookingSummaryResponse(BookingResponse):
     client_email: str
     slot_start_at: datetime
     slot_end_at: datetime
+
+
+class BookingTicketResponse(BaseModel):
+    ticket_id: str
+    status: str
+    slot_id: int
+    booking: BookingResponse | None
+    detail: str | None
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class CalendarFeedLinksResponse(BaseModel):
+    client_feed_url: str
+    specialist_feed_url: str | None
@@ -38,3 +38,8 @@ class SpecialistAvailabilityDayResponse(BaseModel):
     total_slots: int
     free_slots: int
     booked_slots: int
+
+
+class SpecialistsAvailabilityResponse(BaseModel):
+    availability: dict[int, list[SpecialistAvailabilityDayResponse]]
+    missing_ids: list[int]
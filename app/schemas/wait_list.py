@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 
 class WaitListCreateRequest(BaseModel):
@@ -14,3 +14,33 @@ class WaitListEntryResponse(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class WaitListPositionResponse(BaseModel):
+    entry_id: int
+    slot_id: int
+    position: int
+    queue_length: int
+
+
+class WaitListWindowCreateRequest(BaseModel):
+    specialist_id: int
+    window_start: datetime
+    window_end: datetime
+
+    @model_validator(mode="after")
+    def validate_window(self) -> "WaitListWindowCreateRequest":
+        if self.window_end <= self.window_start:
+            raise ValueError("window_end must be greater than window_start")
+        return self
+
+
+class WaitListWindowResponse(BaseModel):
+    id: int
+    specialist_id: int
+    client_id: int
+    window_start: datetime
+    window_end: datetime
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
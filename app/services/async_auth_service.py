@@ -0,0 +1,51 @@
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.security import create_access_token, get_password_hash, verify_password
+from app.db.models.user import User, UserRole
+from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
+
+
+async def register_user(payload: RegisterRequest, db: AsyncSession) -> User:
+    email = payload.email.lower()
+    existing_user = await db.scalar(select(User).where(User.email == email))
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists",
+        )
+
+    # bcrypt is CPU-bound; keep it off the event loop.
+    hashed_password = await run_in_threadpool(get_password_hash, payload.password)
+    user = User(
+        email=email,
+        hashed_password=hashed_password,
+        role=payload.role.value if isinstance(payload.role, UserRole) else payload.role,
+    )
+    db.add(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists",
+        ) from None
+    await db.refresh(user)
+    return user
+
+
+async def login_user(payload: LoginRequest, db: AsyncSession) -> TokenResponse:
+    email = payload.email.lower()
+    user = await db.scalar(select(User).where(User.email == email))
+    if not user or not await run_in_threadpool(verify_password, payload.password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password",
+        )
+
+    token = create_access_token(subject=str(user.id), extra_claims={"role": user.role, "email": user.email})
+    return TokenResponse(access_token=token)
@@ -0,0 +1,32 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Booking, User
+from app.services import booking_service
+
+
+async def create_booking_for_slot(
+    db: AsyncSession,
+    slot_id: int,
+    client_id: int,
+    idempotency_key: str | None = None,
+) -> Booking:
+    return await db.run_sync(
+        booking_service.create_booking_for_slot,
+        slot_id=slot_id,
+        client_id=client_id,
+        idempotency_key=idempotency_key,
+    )
+
+
+async def reschedule_booking(
+    db: AsyncSession,
+    booking_id: int,
+    new_slot_id: int,
+    actor: User,
+) -> tuple[Booking, int]:
+    return await db.run_sync(
+        booking_service.reschedule_booking,
+        booking_id=booking_id,
+        new_slot_id=new_slot_id,
+        actor=actor,
+    )
@@ -0,0 +1,8 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import WaitListEntry
+from app.services import wait_list_service
+
+
+async def add_client_to_wait_list(db: AsyncSession, slot_id: int, client_id: int) -> WaitListEntry:
+    return await db.run_sync(wait_list_service.add_client_to_wait_list, slot_id=slot_id, client_id=client_id)
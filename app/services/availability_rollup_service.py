@@ -0,0 +1,173 @@
+from collections.abc import Sequence
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Date, Select, cast, delete, func, literal, select, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import SpecialistDayAvailability, SpecialistProfile, TimeSlot
+from app.services.specialist_cache_service import mark_specialists_changed
+
+
+def _is_postgresql_session(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def build_slot_day_expression(dialect_name: str) -> Any:
+    if dialect_name == "postgresql":
+        return cast(func.date_trunc("day", func.timezone("UTC", TimeSlot.start_at)), Date)
+    # SQLite keeps naive UTC timestamps as text; date() yields "YYYY-MM-DD", which Date parses.
+    return type_coerce(func.date(TimeSlot.start_at), Date)
+
+
+def build_slot_day_counts_query(
+    specialist_ids: Sequence[int],
+    dialect_name: str,
+) -> Select[tuple[int, date, int, int]]:
+    slot_day = build_slot_day_expression(dialect_name).label("day")
+    return (
+        select(
+            TimeSlot.specialist_id,
+            slot_day,
+            func.count().label("total_slots"),
+            func.count().filter(TimeSlot.is_booked).label("booked_slots"),
+        )
+        .where(TimeSlot.specialist_id.in_(specialist_ids))
+        .group_by(TimeSlot.specialist_id, slot_day)
+    )
+
+
+def _insert(db: Session) -> Any:
+    return pg_insert if _is_postgresql_session(db) else sqlite_insert
+
+
+def apply_slot_availability_changes(
+    db: Session,
+    slot_ids: Sequence[int],
+    total_delta: int = 0,
+    booked_delta: int = 0,
+) -> None:
+    # Runs in the caller's transaction; the upsert takes the day row lock, so concurrent deltas add up.
+    if not slot_ids:
+        return
+
+    slot_day = build_slot_day_expression(db.get_bind().dialect.name).label("day")
+    slot_count = func.count()
+    changes = (
+        select(
+            TimeSlot.specialist_id,
+            slot_day,
+            slot_count * literal(total_delta),
+            slot_count * literal(total_delta - booked_delta),
+            slot_count * literal(booked_delta),
+        )
+        .where(TimeSlot.id.in_(slot_ids))
+        .group_by(TimeSlot.specialist_id, slot_day)
+    )
+    statement = _insert(db)(SpecialistDayAvailability).from_select(
+        ["specialist_id", "day", "total_slots", "free_slots", "booked_slots"],
+        changes,
+    )
+    changed_specialist_ids = db.scalars(
+        statement.on_conflict_do_update(
+            index_elements=[SpecialistDayAvailability.specialist_id, SpecialistDayAvailability.day],
+            set_={
+                "total_slots": SpecialistDayAvailability.total_slots + statement.excluded.total_slots,
+                "free_slots": SpecialistDayAvailability.free_slots + statement.excluded.free_slots,
+                "booked_slots": SpecialistDayAvailability.booked_slots + statement.excluded.booked_slots,
+            },
+        ).returning(SpecialistDayAvailability.specialist_id)
+    ).all()
+    # Every slot and booking write funnels through here, so it doubles as the read cache invalidation hook.
+    mark_specialists_changed(db, changed_specialist_ids)
+
+
+def record_slots_booked(db: Session, slot_ids: Sequence[int]) -> None:
+    apply_slot_availability_changes(db=db, slot_ids=slot_ids, booked_delta=1)
+
+
+def record_slots_freed(db: Session, slot_ids: Sequence[int]) -> None:
+    apply_slot_availability_changes(db=db, slot_ids=slot_ids, booked_delta=-1)
+
+
+def reconcile_availability_rollup_chunk(db: Session, specialist_ids: Sequence[int]) -> int:
+    if _is_postgresql_session(db):
+        # Writers that commit after this lock apply their deltas on top of the repaired rows.
+        db.execute(
+            select(SpecialistDayAvailability.specialist_id)
+            .where(SpecialistDayAvailability.specialist_id.in_(specialist_ids))
+            .with_for_update()
+        )
+
+    expected: dict[tuple[int, date], tuple[int, int]] = {
+        (specialist_id, day): (total_slots, booked_slots)
+        for specialist_id, day, total_slots, booked_slots in db.execute(
+            build_slot_day_counts_query(specialist_ids=specialist_ids, dialect_name=db.get_bind().dialect.name)
+        )
+    }
+    stored: dict[tuple[int, date], tuple[int, int]] = {
+        (specialist_id, day): (total_slots, booked_slots)
+        for specialist_id, day, total_slots, booked_slots in db.execute(
+            select(
+                SpecialistDayAvailability.specialist_id,
+                SpecialistDayAvailability.day,
+                SpecialistDayAvailability.total_slots,
+                SpecialistDayAvailability.booked_slots,
+            ).where(SpecialistDayAvailability.specialist_id.in_(specialist_ids))
+        )
+    }
+
+    drifted = {key: counts for key, counts in expected.items() if stored.get(key) != counts}
+    orphaned = [key for key in stored if key not in expected]
+    if drifted:
+        statement = _insert(db)(SpecialistDayAvailability).values(
+            [
+                {
+                    "specialist_id": specialist_id,
+                    "day": day,
+                    "total_slots": total_slots,
+                    "free_slots": total_slots - booked_slots,
+                    "booked_slots": booked_slots,
+                }
+                for (specialist_id, day), (total_slots, booked_slots) in drifted.items()
+            ]
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[SpecialistDayAvailability.specialist_id, SpecialistDayAvailability.day],
+                set_={
+                    "total_slots": statement.excluded.total_slots,
+                    "free_slots": statement.excluded.free_slots,
+                    "booked_slots": statement.excluded.booked_slots,
+                },
+            )
+        )
+    if orphaned:
+        db.execute(
+            delete(SpecialistDayAvailability).where(
+                tuple_(SpecialistDayAvailability.specialist_id, SpecialistDayAvailability.day).in_(orphaned)
+            )
+        )
+    mark_specialists_changed(db, [specialist_id for specialist_id, _ in [*drifted, *orphaned]])
+    db.commit()
+    return len(drifted) + len(orphaned)
+
+
+def reconcile_availability_rollup(db: Session, chunk_size: int) -> int:
+    repaired = 0
+    last_specialist_id = 0
+    while True:
+        specialist_ids = db.scalars(
+            select(SpecialistProfile.id)
+            .where(SpecialistProfile.id > last_specialist_id)
+            .order_by(SpecialistProfile.id)
+            .limit(chunk_size)
+        ).all()
+        if not specialist_ids:
+            return repaired
+
+        repaired += reconcile_availability_rollup_chunk(db=db, specialist_ids=specialist_ids)
+        last_specialist_id = specialist_ids[-1]
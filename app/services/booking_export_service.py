@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import Connection, Engine, Select, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Booking, TimeSlot, User
+
+
+class BookingExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+BOOKING_EXPORT_MEDIA_TYPES = {
+    BookingExportFormat.CSV: "text/csv; charset=utf-8",
+    BookingExportFormat.NDJSON: "application/x-ndjson",
+}
+
+BOOKING_EXPORT_COLUMNS = (
+    "id",
+    "slot_id",
+    "client_id",
+    "status",
+    "created_at",
+    "cancelled_at",
+    "run_id",
+    "client_email",
+    "slot_start_at",
+    "slot_end_at",
+)
+
+
+def build_specialist_bookings_export_query(specialist_id: int) -> Select[Any]:
+    return (
+        select(
+            Booking.id,
+            Booking.slot_id,
+            Booking.client_id,
+            Booking.status,
+            Booking.created_at,
+            Booking.cancelled_at,
+            Booking.run_id,
+            User.email.label("client_email"),
+            TimeSlot.start_at.label("slot_start_at"),
+            TimeSlot.end_at.label("slot_end_at"),
+        )
+        .join(TimeSlot, Booking.slot_id == TimeSlot.id)
+        .join(User, Booking.client_id == User.id)
+        .where(TimeSlot.specialist_id == specialist_id)
+        .order_by(Booking.id)
+    )
+
+
+def _serialize_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _render_csv(rows: list[Any], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(BOOKING_EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow(["" if value is None else _serialize_value(value) for value in row])
+    return buffer.getvalue()
+
+
+def _render_ndjson(rows: list[Any]) -> str:
+    return "".join(
+        json.dumps(dict(zip(BOOKING_EXPORT_COLUMNS, map(_serialize_value, row)))) + "\n" for row in rows
+    )
+
+
+def iter_booking_export(
+    bind: Engine | Connection,
+    query: Select[Any],
+    export_format: BookingExportFormat,
+    batch_size: int,
+) -> Iterator[str]:
+    # The route closes its session before the first chunk is sent; rows are read through one owned by this generator.
+    with Session(bind=bind) as db:
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        if export_format == BookingExportFormat.CSV:
+            yield _render_csv([], header=True)
+        for rows in result.partitions():
+            if export_format == BookingExportFormat.CSV:
+                yield _render_csv(rows, header=False)
+            else:
+                yield _render_ndjson(rows)
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from typing import Any
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.booking_queue import booking_queue
+from app.core.config import settings
+from app.db.models import TimeSlot
+from app.schemas.booking import BookingResponse
+from app.services.booking_service import create_booking_for_slot
+
+BOOKING_TICKET_QUEUED = "queued"
+BOOKING_TICKET_CONFIRMED = "confirmed"
+BOOKING_TICKET_REJECTED = "rejected"
+BOOKING_REQUEST_FAILED_DETAIL = "Booking request could not be processed. Please retry"
+BOOKING_TICKET_WRITE_ATTEMPTS = 3
+
+logger = logging.getLogger("app.booking_queue")
+
+
+def get_queued_specialist_id(db: Session, slot_id: int) -> int | None:
+    if not settings.booking_queue_specialist_ids:
+        return None
+
+    specialist_id = db.scalar(select(TimeSlot.specialist_id).where(TimeSlot.id == slot_id))
+    if specialist_id not in settings.booking_queue_specialist_ids:
+        return None
+    return specialist_id
+
+
+def enqueue_booking_request(specialist_id: int, slot_id: int, client_id: int) -> dict[str, Any]:
+    ticket = {
+        "ticket_id": uuid4().hex,
+        "status": BOOKING_TICKET_QUEUED,
+        "slot_id": slot_id,
+        "client_id": client_id,
+        "booking": None,
+        "detail": None,
+    }
+    booking_queue.save_ticket(ticket["ticket_id"], ticket, settings.booking_queue_ticket_ttl_seconds)
+    booking_queue.enqueue(
+        specialist_id,
+        {"ticket_id": ticket["ticket_id"], "slot_id": slot_id, "client_id": client_id},
+    )
+    return ticket
+
+
+async def get_booking_ticket(ticket_id: str, client_id: int, wait_seconds: int = 0) -> dict[str, Any] | None:
+    # Long-polls on the event loop: a sleeping waiter must not hold one of the threadpool workers that every
+    # sync route shares. Only the blocking Redis read goes to a thread.
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        ticket = await asyncio.to_thread(booking_queue.get_ticket, ticket_id)
+        if ticket is None or ticket["client_id"] != client_id:
+            return None
+        if ticket["status"] != BOOKING_TICKET_QUEUED or time.monotonic() >= deadline:
+            return ticket
+        await asyncio.sleep(settings.booking_queue_poll_interval_ms / 1000)
+
+
+def _apply_queued_booking(db: Session, message: dict[str, Any]) -> dict[str, Any]:
+    try:
+        # The ticket doubles as the idempotency key, so re-applying a message after a crash is a replay.
+        booking = create_booking_for_slot(
+            db=db,
+            slot_id=message["slot_id"],
+            client_id=message["client_id"],
+            idempotency_key=f"queue:{message['ticket_id']}",
+        )
+    except HTTPException as exc:
+        return {"status": BOOKING_TICKET_REJECTED, "booking": None, "detail": exc.detail}
+    except Exception:
+        # A message that fails for any other reason (bad payload, lost connection) would otherwise be re-read on
+        # every drain and stall the partition behind it, so it is rejected and acknowledged like a lost race.
+        db.rollback()
+        logger.exception("booking_queue_apply_failed message=%s", message)
+        return {"status": BOOKING_TICKET_REJECTED, "booking": None, "detail": BOOKING_REQUEST_FAILED_DETAIL}
+
+    return {
+        "status": BOOKING_TICKET_CONFIRMED,
+        "booking": BookingResponse.model_validate(booking).model_dump(mode="json"),
+        "detail": None,
+    }
+
+
+def _save_ticket_outcome(message: dict[str, Any], outcome: dict[str, Any]) -> None:
+    # The booking is already committed here, so a failed write is retried rather than turned into a rejection.
+    ticket_id = message.get("ticket_id")
+    if ticket_id is None:
+        return
+    for attempt in range(1, BOOKING_TICKET_WRITE_ATTEMPTS + 1):
+        try:
+            ticket = booking_queue.get_ticket(ticket_id) or {
+                "ticket_id": ticket_id,
+                "slot_id": message.get("slot_id"),
+                "client_id": message.get("client_id"),
+            }
+            ticket.update(outcome)
+            booking_queue.save_ticket(ticket_id, ticket, settings.booking_queue_ticket_ttl_seconds)
+            return
+        except Exception:
+            if attempt == BOOKING_TICKET_WRITE_ATTEMPTS:
+                logger.exception(
+                    "booking_queue_ticket_write_failed ticket_id=%s status=%s",
+                    ticket_id,
+                    outcome["status"],
+                )
+                return
+            time.sleep(settings.booking_queue_poll_interval_ms / 1000)
+
+
+def apply_queued_bookings(db: Session, specialist_id: int) -> int:
+    owner = uuid4().hex
+    lease_ttl_ms = settings.booking_queue_lease_ttl_ms
+    applied = 0
+
+    while booking_queue.acquire_lease(specialist_id, owner, lease_ttl_ms):
+        try:
+            while messages := booking_queue.read(specialist_id, settings.booking_queue_batch_size):
+                for message_id, message in messages:
+                    outcome = _apply_queued_booking(db=db, message=message)
+                    _save_ticket_outcome(message=message, outcome=outcome)
+                    booking_queue.ack(specialist_id, message_id)
+                    applied += 1
+                    # Renewed per message: a slow batch must not outlive the lease and let a second drainer in.
+                    if not booking_queue.renew_lease(specialist_id, owner, lease_ttl_ms):
+                        return applied
+        finally:
+            booking_queue.release_lease(specialist_id, owner)
+
+        # A request enqueued while we were releasing the lease may have been turned away by it.
+        if booking_queue.size(specialist_id) == 0:
+            break
+    return applied
@@ -1,17 +1,43 @@
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import TypeVar
+from uuid import uuid4
+
 from fastapi import HTTPException, status
-from sqlalchemy import select, update
+from sqlalchemy import Select, String, exists, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import Session
 
-from app.db.models import Booking, BookingStatus, TimeSlot
-
+from app.db.models import Booking, BookingStatus, Service, SpecialistProfile, TimeSlot, User, UserRole
+from app.services.availability_rollup_service import record_slots_booked, record_slots_freed
+from app.services.slot_concurrency import (
+    BOOKING_STRATEGY_LOCK_TIMEOUT,
+    BOOKING_STRATEGY_NOWAIT,
+    BOOKING_STRATEGY_OPTIMISTIC,
+    BOOKING_STRATEGY_UNIQUE_INDEX,
+    LOCK_CONFLICT_DETAIL,
+    PG_LOCK_NOT_AVAILABLE_SQLSTATE,
+    SlotVersionConflict,
+    get_booking_concurrency_strategy,
+    get_sqlstate,
+    run_with_retry,
+)
 
-LOCK_CONFLICT_DETAIL = "Slot booking is in progress. Retry the request."
 SLOT_ALREADY_BOOKED_DETAIL = "Slot already booked"
 IDEMPOTENCY_KEY_REUSE_DETAIL = "Idempotency key already used with another slot"
 BOOKING_NOT_RESCHEDULABLE_DETAIL = "Only confirmed bookings can be rescheduled"
 SLOT_SPECIALIST_MISMATCH_DETAIL = "New slot must belong to the same specialist"
-PG_LOCK_NOT_AVAILABLE_SQLSTATE = "55P03"
+BOOKING_CHANGED_CONCURRENTLY_DETAIL = "Booking was changed concurrently. Retry the request."
+BOOKING_RUN_SPECIALIST_MISMATCH_DETAIL = "Slot must belong to the service specialist"
+BOOKING_RUN_NOT_CONTIGUOUS_DETAIL = "No contiguous run of slots covers the service duration"
+NOT_ENOUGH_PERMISSIONS_DETAIL = "Not enough permissions"
+
+T = TypeVar("T")
+
+
+def uses_slot_row_locks() -> bool:
+    return get_booking_concurrency_strategy() != BOOKING_STRATEGY_UNIQUE_INDEX
 
 
 def _is_postgresql_session(db: Session) -> bool:
@@ -20,15 +46,50 @@ def _is_postgresql_session(db: Session) -> bool:
 
 
 def _is_pg_lock_not_available(exc: OperationalError) -> bool:
-    original_error = getattr(exc, "orig", None)
-    if original_error is None:
-        return False
+    return get_sqlstate(exc) == PG_LOCK_NOT_AVAILABLE_SQLSTATE
+
+
+def _with_slot_row_lock(query: Select, db: Session, strategy: str, of: Sequence[type] | None = None) -> Select:
+    if not _is_postgresql_session(db):
+        return query
+    if strategy == BOOKING_STRATEGY_NOWAIT:
+        return query.with_for_update(nowait=True, of=of)
+    if strategy == BOOKING_STRATEGY_LOCK_TIMEOUT:
+        return query.with_for_update(of=of)
+    return query
 
-    sqlstate = getattr(original_error, "sqlstate", None)
-    if sqlstate is None:
-        sqlstate = getattr(original_error, "pgcode", None)
 
-    return sqlstate == PG_LOCK_NOT_AVAILABLE_SQLSTATE
+def build_booking_mutation_query(booking_id: int) -> Select[tuple[Booking, TimeSlot, int]]:
+    return (
+        select(Booking, TimeSlot, SpecialistProfile.user_id)
+        .join(TimeSlot, Booking.slot_id == TimeSlot.id)
+        .join(SpecialistProfile, TimeSlot.specialist_id == SpecialistProfile.id)
+        .where(Booking.id == booking_id)
+    )
+
+
+def load_booking_for_mutation(db: Session, query: Select, actor: User) -> tuple[Booking, TimeSlot]:
+    row = db.execute(query).first()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+
+    booking, slot, specialist_user_id = row
+    if actor.role != UserRole.ADMIN.value and actor.id not in {booking.client_id, specialist_user_id}:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=NOT_ENOUGH_PERMISSIONS_DETAIL)
+    return booking, slot
+
+
+def _run_booking_attempt(db: Session, strategy: str, attempt: Callable[[], T]) -> T:
+    if strategy != BOOKING_STRATEGY_NOWAIT:
+        return run_with_retry(db=db, strategy=strategy, attempt=attempt)
+
+    try:
+        return attempt()
+    except OperationalError as exc:
+        db.rollback()
+        if _is_pg_lock_not_available(exc):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=LOCK_CONFLICT_DETAIL) from None
+        raise
 
 
 def _get_booking_by_idempotency_key(db: Session, client_id: int, idempotency_key: str) -> Booking | None:
@@ -40,56 +101,182 @@ def _get_booking_by_idempotency_key(db: Session, client_id: int, idempotency_key
     )
 
 
-def create_booking_for_slot(
+def _build_claim_and_insert_statement(
+    slot_id: int,
+    client_id: int,
+    idempotency_key: str | None,
+    nowait: bool = True,
+):
+    locked_slot = (
+        select(TimeSlot.id)
+        .where(TimeSlot.id == slot_id)
+        .with_for_update(nowait=nowait)
+        .cte("locked_slot")
+    )
+    claimed_slot = (
+        update(TimeSlot)
+        .where(TimeSlot.id == locked_slot.c.id, TimeSlot.is_booked.is_(False))
+        .values(is_booked=True, version=TimeSlot.version + 1)
+        .returning(TimeSlot.id)
+        .cte("claimed_slot")
+    )
+    insert_booking = (
+        insert(Booking)
+        .from_select(
+            ["slot_id", "client_id", "idempotency_key", "status"],
+            select(
+                claimed_slot.c.id,
+                literal(client_id),
+                literal(idempotency_key, String(128)),
+                literal(BookingStatus.CONFIRMED.value),
+            ),
+        )
+        .returning(Booking)
+    )
+    return select(Booking).from_statement(insert_booking)
+
+
+def _find_replayed_booking(
     db: Session,
     slot_id: int,
     client_id: int,
-    idempotency_key: str | None = None,
+    idempotency_key: str | None,
+) -> Booking | None:
+    if not idempotency_key:
+        return None
+    existing_booking = _get_booking_by_idempotency_key(
+        db=db,
+        client_id=client_id,
+        idempotency_key=idempotency_key,
+    )
+    if existing_booking and existing_booking.slot_id != slot_id:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=IDEMPOTENCY_KEY_REUSE_DETAIL)
+    return existing_booking
+
+
+def _replay_or_conflict(
+    db: Session,
+    slot_id: int,
+    client_id: int,
+    idempotency_key: str | None,
 ) -> Booking:
-    try:
-        if idempotency_key:
-            existing_booking = _get_booking_by_idempotency_key(
-                db=db,
-                client_id=client_id,
-                idempotency_key=idempotency_key,
-            )
-            if existing_booking:
-                if existing_booking.slot_id != slot_id:
-                    raise HTTPException(
-                        status_code=status.HTTP_409_CONFLICT,
-                        detail=IDEMPOTENCY_KEY_REUSE_DETAIL,
-                    )
-                return existing_booking
-
-        slot_query = select(TimeSlot.id).where(TimeSlot.id == slot_id)
-        if _is_postgresql_session(db):
-            slot_query = slot_query.with_for_update(nowait=True)
+    existing_booking = _find_replayed_booking(
+        db=db,
+        slot_id=slot_id,
+        client_id=client_id,
+        idempotency_key=idempotency_key,
+    )
+    if existing_booking:
+        return existing_booking
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL)
 
-        slot_exists = db.scalar(slot_query)
-        if not slot_exists:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slot not found")
 
-        updated = db.execute(
-            update(TimeSlot)
-            .where(TimeSlot.id == slot_id, TimeSlot.is_booked.is_(False))
-            .values(is_booked=True)
+def _resolve_unclaimed_slot(
+    db: Session,
+    slot_id: int,
+    client_id: int,
+    idempotency_key: str | None,
+) -> Booking:
+    existing_booking = _find_replayed_booking(
+        db=db,
+        slot_id=slot_id,
+        client_id=client_id,
+        idempotency_key=idempotency_key,
+    )
+    if existing_booking:
+        return existing_booking
+
+    slot_exists = db.scalar(select(TimeSlot.id).where(TimeSlot.id == slot_id))
+    if not slot_exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slot not found")
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL)
+
+
+def _sync_slot_booked_flags(db: Session, slot_ids: Sequence[int]) -> None:
+    has_confirmed_booking = exists().where(
+        Booking.slot_id == TimeSlot.id,
+        Booking.status == BookingStatus.CONFIRMED.value,
+    )
+    changed_slots = db.execute(
+        update(TimeSlot)
+        .where(TimeSlot.id.in_(slot_ids), TimeSlot.is_booked != has_confirmed_booking)
+        .values(is_booked=has_confirmed_booking, version=TimeSlot.version + 1)
+        .returning(TimeSlot.id, TimeSlot.is_booked),
+        execution_options={"synchronize_session": False},
+    ).all()
+    record_slots_booked(db=db, slot_ids=[slot_id for slot_id, is_booked in changed_slots if is_booked])
+    record_slots_freed(db=db, slot_ids=[slot_id for slot_id, is_booked in changed_slots if not is_booked])
+
+
+def _build_insert_confirmed_booking_statement(slot_id: int, client_id: int, idempotency_key: str | None):
+    inserted_booking = (
+        pg_insert(Booking)
+        .from_select(
+            ["slot_id", "client_id", "idempotency_key", "status"],
+            select(
+                TimeSlot.id,
+                literal(client_id),
+                literal(idempotency_key, String(128)),
+                literal(BookingStatus.CONFIRMED.value),
+            ).where(TimeSlot.id == slot_id),
         )
-        if updated.rowcount != 1:
-            db.rollback()
-            if idempotency_key:
-                existing_booking = _get_booking_by_idempotency_key(
+        .on_conflict_do_nothing(
+            index_elements=[Booking.slot_id],
+            index_where=Booking.status == BookingStatus.CONFIRMED.value,
+        )
+        .returning(*Booking.__table__.c)
+        .cte("inserted_booking")
+    )
+    booked_slot = (
+        update(TimeSlot)
+        .where(TimeSlot.id == inserted_booking.c.slot_id)
+        .values(is_booked=True, version=TimeSlot.version + 1)
+        .cte("booked_slot")
+    )
+    return select(Booking).from_statement(select(inserted_booking).add_cte(booked_slot))
+
+
+def _create_booking_unique_index(
+    db: Session,
+    slot_id: int,
+    client_id: int,
+    idempotency_key: str | None,
+) -> Booking:
+    # uq_bookings_slot_confirmed arbitrates the race, so no slot row is locked before the insert.
+    try:
+        if _is_postgresql_session(db):
+            booking = db.scalar(
+                _build_insert_confirmed_booking_statement(
+                    slot_id=slot_id,
+                    client_id=client_id,
+                    idempotency_key=idempotency_key,
+                )
+            )
+            if booking is None:
+                db.rollback()
+                return _resolve_unclaimed_slot(
                     db=db,
+                    slot_id=slot_id,
                     client_id=client_id,
                     idempotency_key=idempotency_key,
                 )
-                if existing_booking:
-                    if existing_booking.slot_id != slot_id:
-                        raise HTTPException(
-                            status_code=status.HTTP_409_CONFLICT,
-                            detail=IDEMPOTENCY_KEY_REUSE_DETAIL,
-                        )
-                    return existing_booking
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL)
+            record_slots_booked(db=db, slot_ids=[slot_id])
+            db.expunge(booking)
+            db.commit()
+            return booking
+
+        existing_booking = _find_replayed_booking(
+            db=db,
+            slot_id=slot_id,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+        )
+        if existing_booking:
+            return existing_booking
+
+        slot_exists = db.scalar(select(TimeSlot.id).where(TimeSlot.id == slot_id))
+        if not slot_exists:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slot not found")
 
         booking = Booking(
             slot_id=slot_id,
@@ -98,80 +285,475 @@ def create_booking_for_slot(
             status=BookingStatus.CONFIRMED.value,
         )
         db.add(booking)
+        db.flush()
+        db.execute(
+            update(TimeSlot).where(TimeSlot.id == slot_id).values(is_booked=True, version=TimeSlot.version + 1)
+        )
+        record_slots_booked(db=db, slot_ids=[slot_id])
         db.commit()
         db.refresh(booking)
         return booking
-    except OperationalError as exc:
-        db.rollback()
-        if _is_pg_lock_not_available(exc):
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=LOCK_CONFLICT_DETAIL) from None
-        raise
     except IntegrityError:
         db.rollback()
-        if idempotency_key:
-            existing_booking = _get_booking_by_idempotency_key(
+    return _replay_or_conflict(
+        db=db,
+        slot_id=slot_id,
+        client_id=client_id,
+        idempotency_key=idempotency_key,
+    )
+
+
+def _claim_slot_single_statement(
+    db: Session,
+    slot_id: int,
+    client_id: int,
+    idempotency_key: str | None,
+    nowait: bool,
+) -> Booking:
+    # Lock, claim and insert in one round trip.
+    booking = db.scalar(
+        _build_claim_and_insert_statement(
+            slot_id=slot_id,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+            nowait=nowait,
+        )
+    )
+    if booking is None:
+        db.rollback()
+        return _resolve_unclaimed_slot(
+            db=db,
+            slot_id=slot_id,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+        )
+
+    record_slots_booked(db=db, slot_ids=[slot_id])
+    # RETURNING already loaded every column; detach so commit does not expire them into a refresh.
+    db.expunge(booking)
+    db.commit()
+    return booking
+
+
+def _claim_slot_step_by_step(
+    db: Session,
+    slot_id: int,
+    client_id: int,
+    idempotency_key: str | None,
+    optimistic: bool,
+) -> Booking:
+    slot_state = db.execute(
+        select(TimeSlot.is_booked, TimeSlot.version).where(TimeSlot.id == slot_id)
+    ).first()
+    if not slot_state:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slot not found")
+
+    claim_query = update(TimeSlot).where(TimeSlot.id == slot_id, TimeSlot.is_booked.is_(False))
+    if optimistic:
+        if slot_state.is_booked:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL)
+        claim_query = claim_query.where(TimeSlot.version == slot_state.version)
+
+    updated = db.execute(claim_query.values(is_booked=True, version=TimeSlot.version + 1))
+    if updated.rowcount != 1:
+        if optimistic:
+            raise SlotVersionConflict()
+        db.rollback()
+        return _replay_or_conflict(
+            db=db,
+            slot_id=slot_id,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+        )
+
+    record_slots_booked(db=db, slot_ids=[slot_id])
+    booking = Booking(
+        slot_id=slot_id,
+        client_id=client_id,
+        idempotency_key=idempotency_key,
+        status=BookingStatus.CONFIRMED.value,
+    )
+    db.add(booking)
+    db.commit()
+    db.refresh(booking)
+    return booking
+
+
+def _create_booking_attempt(
+    db: Session,
+    strategy: str,
+    slot_id: int,
+    client_id: int,
+    idempotency_key: str | None,
+) -> Booking:
+    try:
+        # Replays are answered before any claim, so a retry never waits on or trips over the slot lock.
+        existing_booking = _find_replayed_booking(
+            db=db,
+            slot_id=slot_id,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+        )
+        if existing_booking:
+            return existing_booking
+
+        if _is_postgresql_session(db) and strategy in {BOOKING_STRATEGY_NOWAIT, BOOKING_STRATEGY_LOCK_TIMEOUT}:
+            return _claim_slot_single_statement(
                 db=db,
+                slot_id=slot_id,
                 client_id=client_id,
                 idempotency_key=idempotency_key,
+                nowait=strategy == BOOKING_STRATEGY_NOWAIT,
             )
-            if existing_booking:
-                if existing_booking.slot_id != slot_id:
-                    raise HTTPException(
-                        status_code=status.HTTP_409_CONFLICT,
-                        detail=IDEMPOTENCY_KEY_REUSE_DETAIL,
-                    ) from None
-                return existing_booking
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL) from None
+        return _claim_slot_step_by_step(
+            db=db,
+            slot_id=slot_id,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+            optimistic=strategy == BOOKING_STRATEGY_OPTIMISTIC,
+        )
+    except IntegrityError:
+        db.rollback()
+    return _replay_or_conflict(
+        db=db,
+        slot_id=slot_id,
+        client_id=client_id,
+        idempotency_key=idempotency_key,
+    )
 
 
-def reschedule_booking(db: Session, booking_id: int, new_slot_id: int) -> Booking:
-    try:
-        booking_query = select(Booking).where(Booking.id == booking_id)
-        if _is_postgresql_session(db):
-            booking_query = booking_query.with_for_update(nowait=True)
+def create_booking_for_slot(
+    db: Session,
+    slot_id: int,
+    client_id: int,
+    idempotency_key: str | None = None,
+) -> Booking:
+    strategy = get_booking_concurrency_strategy()
+    if strategy == BOOKING_STRATEGY_UNIQUE_INDEX:
+        return _create_booking_unique_index(
+            db=db,
+            slot_id=slot_id,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+        )
+
+    def attempt() -> Booking:
+        return _create_booking_attempt(
+            db=db,
+            strategy=strategy,
+            slot_id=slot_id,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+        )
 
-        booking = db.scalar(booking_query)
-        if not booking:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+    return _run_booking_attempt(db=db, strategy=strategy, attempt=attempt)
 
-        if booking.status != BookingStatus.CONFIRMED.value:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=BOOKING_NOT_RESCHEDULABLE_DETAIL)
 
-        current_slot_id = booking.slot_id
-        if current_slot_id == new_slot_id:
-            return booking
+def _load_reschedulable_booking(
+    db: Session,
+    strategy: str,
+    booking_id: int,
+    actor: User,
+) -> tuple[Booking, TimeSlot]:
+    query = _with_slot_row_lock(build_booking_mutation_query(booking_id), db=db, strategy=strategy, of=[Booking, TimeSlot])
+    booking, current_slot = load_booking_for_mutation(db=db, query=query, actor=actor)
+    if booking.status != BookingStatus.CONFIRMED.value:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=BOOKING_NOT_RESCHEDULABLE_DETAIL)
+    return booking, current_slot
 
-        slot_ids = sorted({current_slot_id, new_slot_id})
-        slots_query = select(TimeSlot).where(TimeSlot.id.in_(slot_ids)).order_by(TimeSlot.id)
-        if _is_postgresql_session(db):
-            slots_query = slots_query.with_for_update(nowait=True)
 
-        locked_slots = db.scalars(slots_query).all()
-        slots_by_id = {slot.id: slot for slot in locked_slots}
+def _load_reschedule_target_slot(db: Session, strategy: str, current_slot: TimeSlot, new_slot_id: int) -> TimeSlot:
+    # Two reschedules can only cross-lock when each targets the other's booked slot; the deadlock is retried.
+    slot_query = select(TimeSlot).where(TimeSlot.id == new_slot_id)
+    new_slot = db.scalar(_with_slot_row_lock(slot_query, db=db, strategy=strategy))
+    if not new_slot:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slot not found")
 
-        current_slot = slots_by_id.get(current_slot_id)
-        if not current_slot:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Current slot not found")
+    if new_slot.specialist_id != current_slot.specialist_id:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_SPECIALIST_MISMATCH_DETAIL)
 
-        new_slot = slots_by_id.get(new_slot_id)
-        if not new_slot:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slot not found")
+    if new_slot.is_booked:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL)
 
-        if new_slot.specialist_id != current_slot.specialist_id:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_SPECIALIST_MISMATCH_DETAIL)
+    return new_slot
 
-        if new_slot.is_booked:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL)
 
+def _reschedule_booking_unique_index(db: Session, booking_id: int, new_slot_id: int, actor: User) -> tuple[Booking, int]:
+    booking, current_slot = _load_reschedulable_booking(
+        db=db,
+        strategy=BOOKING_STRATEGY_UNIQUE_INDEX,
+        booking_id=booking_id,
+        actor=actor,
+    )
+    current_slot_id = current_slot.id
+    if current_slot_id == new_slot_id:
+        return booking, current_slot_id
+
+    _load_reschedule_target_slot(
+        db=db,
+        strategy=BOOKING_STRATEGY_UNIQUE_INDEX,
+        current_slot=current_slot,
+        new_slot_id=new_slot_id,
+    )
+
+    try:
+        moved = db.execute(
+            update(Booking)
+            .where(
+                Booking.id == booking_id,
+                Booking.slot_id == current_slot_id,
+                Booking.status == BookingStatus.CONFIRMED.value,
+            )
+            .values(slot_id=new_slot_id)
+        )
+        if moved.rowcount != 1:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=BOOKING_CHANGED_CONCURRENTLY_DETAIL)
+
+        _sync_slot_booked_flags(db=db, slot_ids=[current_slot_id, new_slot_id])
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL) from None
+
+    db.refresh(booking)
+    return booking, current_slot_id
+
+
+def _reschedule_booking_attempt(
+    db: Session,
+    strategy: str,
+    booking_id: int,
+    new_slot_id: int,
+    actor: User,
+) -> tuple[Booking, int]:
+    booking, current_slot = _load_reschedulable_booking(db=db, strategy=strategy, booking_id=booking_id, actor=actor)
+    current_slot_id = current_slot.id
+    if current_slot_id == new_slot_id:
+        return booking, current_slot_id
+
+    new_slot = _load_reschedule_target_slot(
+        db=db,
+        strategy=strategy,
+        current_slot=current_slot,
+        new_slot_id=new_slot_id,
+    )
+
+    if strategy == BOOKING_STRATEGY_OPTIMISTIC:
+        moved = db.execute(
+            update(Booking)
+            .where(
+                Booking.id == booking_id,
+                Booking.slot_id == current_slot_id,
+                Booking.status == BookingStatus.CONFIRMED.value,
+            )
+            .values(slot_id=new_slot_id)
+        )
+        released = db.execute(
+            update(TimeSlot)
+            .where(TimeSlot.id == current_slot.id, TimeSlot.version == current_slot.version)
+            .values(is_booked=False, version=TimeSlot.version + 1)
+        )
+        claimed = db.execute(
+            update(TimeSlot)
+            .where(
+                TimeSlot.id == new_slot.id,
+                TimeSlot.version == new_slot.version,
+                TimeSlot.is_booked.is_(False),
+            )
+            .values(is_booked=True, version=TimeSlot.version + 1)
+        )
+        if {moved.rowcount, released.rowcount, claimed.rowcount} != {1}:
+            raise SlotVersionConflict()
+    else:
         current_slot.is_booked = False
         new_slot.is_booked = True
         booking.slot_id = new_slot.id
 
+    record_slots_freed(db=db, slot_ids=[current_slot_id])
+    record_slots_booked(db=db, slot_ids=[new_slot.id])
+    db.commit()
+    db.refresh(booking)
+    return booking, current_slot_id
+
+
+def cancel_booking_without_locks(db: Session, booking: Booking) -> bool:
+    cancelled = db.execute(
+        update(Booking)
+        .where(Booking.id == booking.id, Booking.status != BookingStatus.CANCELLED.value)
+        .values(status=BookingStatus.CANCELLED.value, cancelled_at=datetime.now(UTC))
+    )
+    if cancelled.rowcount != 1:
+        return False
+
+    _sync_slot_booked_flags(db=db, slot_ids=[booking.slot_id])
+    return True
+
+
+def reschedule_booking(db: Session, booking_id: int, new_slot_id: int, actor: User) -> tuple[Booking, int]:
+    strategy = get_booking_concurrency_strategy()
+    if strategy == BOOKING_STRATEGY_UNIQUE_INDEX:
+        return _reschedule_booking_unique_index(db=db, booking_id=booking_id, new_slot_id=new_slot_id, actor=actor)
+
+    def attempt() -> tuple[Booking, int]:
+        return _reschedule_booking_attempt(
+            db=db,
+            strategy=strategy,
+            booking_id=booking_id,
+            new_slot_id=new_slot_id,
+            actor=actor,
+        )
+
+    return _run_booking_attempt(db=db, strategy=strategy, attempt=attempt)
+
+
+def _load_booking_run(db: Session, run_id: str) -> list[Booking]:
+    return list(db.scalars(select(Booking).where(Booking.run_id == run_id).order_by(Booking.id)).all())
+
+
+def _get_booking_run_by_idempotency_key(
+    db: Session,
+    client_id: int,
+    idempotency_key: str | None,
+    start_slot_id: int,
+) -> list[Booking] | None:
+    if not idempotency_key:
+        return None
+    first_booking = _get_booking_by_idempotency_key(db=db, client_id=client_id, idempotency_key=idempotency_key)
+    if not first_booking:
+        return None
+    if first_booking.run_id is None or first_booking.slot_id != start_slot_id:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=IDEMPOTENCY_KEY_REUSE_DETAIL)
+    return _load_booking_run(db=db, run_id=first_booking.run_id)
+
+
+def build_run_slots_query(specialist_id: int, run_start: datetime, run_end: datetime) -> Select[tuple[TimeSlot]]:
+    # Locking in id order keeps overlapping runs from deadlocking each other.
+    return (
+        select(TimeSlot)
+        .where(
+            TimeSlot.specialist_id == specialist_id,
+            TimeSlot.start_at >= run_start,
+            TimeSlot.start_at < run_end,
+        )
+        .order_by(TimeSlot.id)
+    )
+
+
+def _is_contiguous_run(run: Sequence[TimeSlot], start_slot_id: int, run_end: datetime) -> bool:
+    if not run or run[0].id != start_slot_id or run[-1].end_at < run_end:
+        return False
+    return all(previous.end_at == following.start_at for previous, following in zip(run, run[1:]))
+
+
+def _create_booking_run_attempt(
+    db: Session,
+    strategy: str,
+    service_id: int,
+    start_slot_id: int,
+    client_id: int,
+    idempotency_key: str | None,
+) -> list[Booking]:
+    try:
+        existing_run = _get_booking_run_by_idempotency_key(
+            db=db,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+            start_slot_id=start_slot_id,
+        )
+        if existing_run:
+            return existing_run
+
+        service = db.execute(
+            select(Service.specialist_id, Service.duration_minutes).where(Service.id == service_id)
+        ).first()
+        if not service:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Service not found")
+
+        start_slot = db.execute(
+            select(TimeSlot.specialist_id, TimeSlot.start_at).where(TimeSlot.id == start_slot_id)
+        ).first()
+        if not start_slot:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slot not found")
+        if start_slot.specialist_id != service.specialist_id:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=BOOKING_RUN_SPECIALIST_MISMATCH_DETAIL)
+
+        run_end = start_slot.start_at + timedelta(minutes=service.duration_minutes)
+        run_query = build_run_slots_query(
+            specialist_id=service.specialist_id,
+            run_start=start_slot.start_at,
+            run_end=run_end,
+        )
+        slots = db.scalars(_with_slot_row_lock(query=run_query, db=db, strategy=strategy)).all()
+        run = sorted(slots, key=lambda slot: slot.start_at)
+        if not _is_contiguous_run(run=run, start_slot_id=start_slot_id, run_end=run_end):
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=BOOKING_RUN_NOT_CONTIGUOUS_DETAIL)
+        if any(slot.is_booked for slot in run):
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL)
+
+        slot_ids = [slot.id for slot in run]
+        if strategy != BOOKING_STRATEGY_UNIQUE_INDEX:
+            claimed = db.execute(
+                update(TimeSlot)
+                .where(TimeSlot.id.in_(slot_ids), TimeSlot.is_booked.is_(False))
+                .values(is_booked=True, version=TimeSlot.version + 1),
+                execution_options={"synchronize_session": False},
+            )
+            if claimed.rowcount != len(slot_ids):
+                db.rollback()
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL)
+            record_slots_booked(db=db, slot_ids=slot_ids)
+
+        run_id = uuid4().hex
+        db.add_all(
+            [
+                Booking(
+                    slot_id=slot_id,
+                    client_id=client_id,
+                    idempotency_key=idempotency_key if position == 0 else None,
+                    status=BookingStatus.CONFIRMED.value,
+                    run_id=run_id,
+                )
+                for position, slot_id in enumerate(slot_ids)
+            ]
+        )
+        db.flush()
+        if strategy == BOOKING_STRATEGY_UNIQUE_INDEX:
+            _sync_slot_booked_flags(db=db, slot_ids=slot_ids)
         db.commit()
-        db.refresh(booking)
-        return booking
-    except OperationalError as exc:
+        return _load_booking_run(db=db, run_id=run_id)
+    except IntegrityError:
         db.rollback()
-        if _is_pg_lock_not_available(exc):
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=LOCK_CONFLICT_DETAIL) from None
-        raise
+    existing_run = _get_booking_run_by_idempotency_key(
+        db=db,
+        client_id=client_id,
+        idempotency_key=idempotency_key,
+        start_slot_id=start_slot_id,
+    )
+    if existing_run:
+        return existing_run
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL)
+
+
+def create_booking_run(
+    db: Session,
+    service_id: int,
+    start_slot_id: int,
+    client_id: int,
+    idempotency_key: str | None = None,
+) -> list[Booking]:
+    strategy = get_booking_concurrency_strategy()
+
+    def attempt() -> list[Booking]:
+        return _create_booking_run_attempt(
+            db=db,
+            strategy=strategy,
+            service_id=service_id,
+            start_slot_id=start_slot_id,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+        )
+
+    return _run_booking_attempt(db=db, strategy=strategy, attempt=attempt)
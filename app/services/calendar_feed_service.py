@@ -0,0 +1,71 @@
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Connection, Engine, Select, func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Booking, SpecialistProfile, TimeSlot, User
+from app.services.calendar_service import CALENDAR_FOOTER_LINES, CALENDAR_HEADER_LINES, build_booking_event_lines
+
+
+def _build_feed_query() -> Select[Any]:
+    return (
+        select(
+            Booking.id,
+            Booking.status,
+            Booking.updated_at,
+            TimeSlot.start_at,
+            TimeSlot.end_at,
+            SpecialistProfile.display_name,
+            User.email,
+        )
+        .join(TimeSlot, Booking.slot_id == TimeSlot.id)
+        .join(SpecialistProfile, TimeSlot.specialist_id == SpecialistProfile.id)
+        .join(User, Booking.client_id == User.id)
+        .order_by(Booking.id)
+    )
+
+
+def build_client_feed_query(client_id: int) -> Select[Any]:
+    return _build_feed_query().where(Booking.client_id == client_id)
+
+
+def build_specialist_feed_query(specialist_id: int) -> Select[Any]:
+    return _build_feed_query().where(TimeSlot.specialist_id == specialist_id)
+
+
+def get_feed_state(db: Session, query: Select[Any]) -> tuple[int, int | None, datetime | None]:
+    # Bookings are never deleted and every change bumps updated_at; the rendered specialist name and client email
+    # are covered by the updated_at of the joined profile and user rows.
+    state_query = query.with_only_columns(
+        func.count(Booking.id),
+        func.max(Booking.id),
+        func.max(Booking.updated_at),
+        func.max(SpecialistProfile.updated_at),
+        func.max(User.updated_at),
+    ).order_by(None)
+    count, last_id, *updated_ats = db.execute(state_query).one()
+    last_updated_at = max((updated_at for updated_at in updated_ats if updated_at is not None), default=None)
+    return count, last_id, last_updated_at
+
+
+def iter_calendar_feed(bind: Engine | Connection, query: Select[Any], batch_size: int) -> Iterator[str]:
+    # The body is streamed after the request-scoped session is gone, so the generator reads through its own session.
+    with Session(bind=bind) as db:
+        yield "\r\n".join(CALENDAR_HEADER_LINES) + "\r\n"
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            events = []
+            for booking_id, status, updated_at, start_at, end_at, display_name, client_email in rows:
+                events += build_booking_event_lines(
+                    booking_id=booking_id,
+                    slot_start_at=start_at,
+                    slot_end_at=end_at,
+                    specialist_display_name=display_name,
+                    client_email=client_email,
+                    booking_status=status,
+                    stamped_at=updated_at,
+                )
+            yield "\r\n".join(events) + "\r\n"
+        yield "\r\n".join(CALENDAR_FOOTER_LINES)
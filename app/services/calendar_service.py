@@ -1,5 +1,19 @@
 from datetime import UTC, datetime
 
+from app.core.config import settings
+from app.core.lru_cache import LRUCache
+
+CALENDAR_HEADER_LINES = [
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//Booking API//EN",
+    "CALSCALE:GREGORIAN",
+    "METHOD:PUBLISH",
+]
+CALENDAR_FOOTER_LINES = ["END:VCALENDAR", ""]
+
+booking_ics_cache: LRUCache[tuple[int, str], str] = LRUCache(maxsize=settings.booking_ics_cache_size)
+
 
 def _format_ics_datetime(value: datetime) -> str:
     if value.tzinfo is None:
@@ -24,35 +38,52 @@ def _to_ics_status(status: str) -> str:
     return "CONFIRMED"
 
 
-def build_booking_calendar_ics(
+def build_booking_event_lines(
     booking_id: int,
     slot_start_at: datetime,
     slot_end_at: datetime,
     specialist_display_name: str,
     client_email: str,
     booking_status: str,
-) -> str:
+    stamped_at: datetime,
+) -> list[str]:
     summary = _escape_ics_text(f"Booking with {specialist_display_name}")
     description = _escape_ics_text(
         f"Booking #{booking_id}\\nSpecialist: {specialist_display_name}\\nClient: {client_email}"
     )
-
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//Booking API//EN",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH",
+    return [
         "BEGIN:VEVENT",
         f"UID:booking-{booking_id}@booking-api.local",
-        f"DTSTAMP:{_format_ics_datetime(datetime.now(UTC))}",
+        f"DTSTAMP:{_format_ics_datetime(stamped_at)}",
         f"DTSTART:{_format_ics_datetime(slot_start_at)}",
         f"DTEND:{_format_ics_datetime(slot_end_at)}",
         f"SUMMARY:{summary}",
         f"DESCRIPTION:{description}",
         f"STATUS:{_to_ics_status(booking_status)}",
         "END:VEVENT",
-        "END:VCALENDAR",
-        "",
     ]
-    return "\r\n".join(lines)
+
+
+def build_booking_calendar_ics(
+    booking_id: int,
+    slot_start_at: datetime,
+    slot_end_at: datetime,
+    specialist_display_name: str,
+    client_email: str,
+    booking_status: str,
+    booking_updated_at: datetime,
+) -> str:
+    event_lines = build_booking_event_lines(
+        booking_id=booking_id,
+        slot_start_at=slot_start_at,
+        slot_end_at=slot_end_at,
+        specialist_display_name=specialist_display_name,
+        client_email=client_email,
+        booking_status=booking_status,
+        stamped_at=booking_updated_at,
+    )
+    return "\r\n".join(CALENDAR_HEADER_LINES + event_lines + CALENDAR_FOOTER_LINES)
+
+
+def get_booking_ics_version(booking_updated_at: datetime) -> str:
+    return booking_updated_at.isoformat()
@@ -0,0 +1,60 @@
+import time
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.idempotency_cache import idempotency_cache
+
+IDEMPOTENCY_STATE_IN_FLIGHT = "in_flight"
+IDEMPOTENCY_STATE_COMPLETED = "completed"
+
+IDEMPOTENT_REQUEST_IN_PROGRESS_DETAIL = "Request with this Idempotency-Key is still in progress. Retry the request."
+
+
+def build_idempotency_cache_key(scope: str, user_id: int, idempotency_key: str) -> str:
+    return f"{scope}:{user_id}:{idempotency_key}"
+
+
+def claim_idempotency_key(cache_key: str, fingerprint: str, reuse_detail: str) -> dict[str, Any] | None:
+    deadline = time.monotonic() + settings.idempotency_wait_timeout_ms / 1000
+    in_flight_marker = {"state": IDEMPOTENCY_STATE_IN_FLIGHT, "fingerprint": fingerprint}
+
+    while True:
+        record = idempotency_cache.get(cache_key)
+        if record is None:
+            if idempotency_cache.add(cache_key, in_flight_marker, settings.idempotency_in_flight_ttl_seconds):
+                return None
+            continue
+
+        if record["fingerprint"] != fingerprint:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=reuse_detail)
+        if record["state"] == IDEMPOTENCY_STATE_COMPLETED:
+            return record
+        if time.monotonic() >= deadline:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=IDEMPOTENT_REQUEST_IN_PROGRESS_DETAIL)
+        time.sleep(settings.idempotency_wait_poll_ms / 1000)
+
+
+def store_idempotent_response(
+    cache_key: str,
+    fingerprint: str,
+    status_code: int,
+    body: str,
+    media_type: str | None,
+) -> None:
+    idempotency_cache.set(
+        cache_key,
+        {
+            "state": IDEMPOTENCY_STATE_COMPLETED,
+            "fingerprint": fingerprint,
+            "status_code": status_code,
+            "body": body,
+            "media_type": media_type,
+        },
+        settings.idempotency_response_ttl_seconds,
+    )
+
+
+def release_idempotency_key(cache_key: str) -> None:
+    idempotency_cache.delete(cache_key)
@@ -0,0 +1,54 @@
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import SLOT_GATE_REJECTIONS
+from app.core.slot_gate import slot_gate
+from app.services.booking_service import SLOT_ALREADY_BOOKED_DETAIL
+from app.services.slot_concurrency import LOCK_CONFLICT_DETAIL
+
+SLOT_GATE_CLAIMED = "claimed"
+SLOT_GATE_BOOKED = "booked"
+
+
+def _build_holder(state: str, client_id: int) -> str:
+    return f"{state}:{client_id}"
+
+
+def claim_slot_admission(slot_id: int, client_id: int) -> bool:
+    if not settings.slot_gate_enabled:
+        return False
+
+    current_holder = slot_gate.claim(
+        slot_id=slot_id,
+        holder=_build_holder(SLOT_GATE_CLAIMED, client_id),
+        ttl_ms=settings.slot_gate_claim_ttl_ms,
+    )
+    if current_holder is None:
+        return True
+
+    state, _, holder_client_id = current_holder.partition(":")
+    if holder_client_id == str(client_id):
+        # Own retries go through to the database, which owns idempotent replays.
+        return False
+
+    SLOT_GATE_REJECTIONS.labels(state=state).inc()
+    if state == SLOT_GATE_BOOKED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_ALREADY_BOOKED_DETAIL)
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=LOCK_CONFLICT_DETAIL)
+
+
+def complete_slot_admission(slot_id: int, client_id: int) -> None:
+    slot_gate.mark(
+        slot_id=slot_id,
+        holder=_build_holder(SLOT_GATE_BOOKED, client_id),
+        ttl_ms=settings.slot_gate_booked_ttl_ms,
+    )
+
+
+def release_slot_admission(slot_id: int, client_id: int) -> None:
+    slot_gate.release(slot_id=slot_id, holder=_build_holder(SLOT_GATE_CLAIMED, client_id))
+
+
+def clear_slot_admission(slot_id: int) -> None:
+    if settings.slot_gate_enabled:
+        slot_gate.clear(slot_id=slot_id)
@@ -0,0 +1,116 @@
+import asyncio
+import random
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from app.core.config import settings
+from app.core.metrics import BOOKING_CONCURRENCY_RETRIES
+
+BOOKING_STRATEGY_NOWAIT = "nowait"
+BOOKING_STRATEGY_LOCK_TIMEOUT = "lock_timeout"
+BOOKING_STRATEGY_OPTIMISTIC = "optimistic"
+BOOKING_STRATEGY_SERIALIZABLE = "serializable"
+BOOKING_STRATEGY_UNIQUE_INDEX = "unique_index"
+
+PG_LOCK_NOT_AVAILABLE_SQLSTATE = "55P03"
+PG_SERIALIZATION_FAILURE_SQLSTATE = "40001"
+PG_DEADLOCK_DETECTED_SQLSTATE = "40P01"
+
+LOCK_CONFLICT_DETAIL = "Slot booking is in progress. Retry the request."
+
+_RETRYABLE_SQLSTATES = {
+    BOOKING_STRATEGY_LOCK_TIMEOUT: {PG_LOCK_NOT_AVAILABLE_SQLSTATE, PG_DEADLOCK_DETECTED_SQLSTATE},
+    BOOKING_STRATEGY_OPTIMISTIC: {PG_DEADLOCK_DETECTED_SQLSTATE},
+    BOOKING_STRATEGY_SERIALIZABLE: {PG_SERIALIZATION_FAILURE_SQLSTATE, PG_DEADLOCK_DETECTED_SQLSTATE},
+}
+
+T = TypeVar("T")
+
+
+class SlotVersionConflict(Exception):
+    pass
+
+
+def get_booking_concurrency_strategy() -> str:
+    return settings.booking_concurrency_strategy.strip().lower()
+
+
+def get_sqlstate(exc: DBAPIError) -> str | None:
+    original_error = getattr(exc, "orig", None)
+    if original_error is None:
+        return None
+
+    sqlstate = getattr(original_error, "sqlstate", None)
+    if sqlstate is None:
+        sqlstate = getattr(original_error, "pgcode", None)
+    return sqlstate
+
+
+def _is_postgresql_session(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def _begin_attempt(db: Session, strategy: str) -> None:
+    if strategy == BOOKING_STRATEGY_SERIALIZABLE:
+        # The isolation level can only be chosen before the first statement of a transaction.
+        if db.in_transaction():
+            db.rollback()
+        db.connection(execution_options={"isolation_level": "SERIALIZABLE"})
+    elif strategy == BOOKING_STRATEGY_LOCK_TIMEOUT and _is_postgresql_session(db):
+        db.execute(
+            text("SELECT set_config('lock_timeout', :lock_timeout, true)"),
+            {"lock_timeout": f"{settings.booking_lock_timeout_ms}ms"},
+        )
+
+
+def _backoff_delay(attempt: int) -> float:
+    ceiling_ms = min(
+        settings.booking_retry_max_delay_ms,
+        settings.booking_retry_base_delay_ms * (2 ** (attempt - 1)),
+    )
+    return random.uniform(0, ceiling_ms) / 1000
+
+
+def _sleep(seconds: float) -> None:
+    # Under AsyncSession.run_sync we run inside SQLAlchemy's greenlet: yield to the event loop instead of blocking it.
+    if in_greenlet():
+        await_only(asyncio.sleep(seconds))
+    else:
+        time.sleep(seconds)
+
+
+def run_with_retry(db: Session, strategy: str, attempt: Callable[[], T]) -> T:
+    deadline = time.monotonic() + settings.booking_retry_budget_ms / 1000
+    retryable_sqlstates = _RETRYABLE_SQLSTATES.get(strategy, set())
+    attempt_number = 0
+
+    while True:
+        attempt_number += 1
+        try:
+            _begin_attempt(db=db, strategy=strategy)
+            result = attempt()
+            if attempt_number > 1:
+                BOOKING_CONCURRENCY_RETRIES.labels(strategy=strategy, outcome="recovered").inc()
+            return result
+        except SlotVersionConflict:
+            db.rollback()
+        except DBAPIError as exc:
+            db.rollback()
+            if get_sqlstate(exc) not in retryable_sqlstates:
+                raise
+
+        delay = _backoff_delay(attempt_number)
+        if time.monotonic() + delay >= deadline:
+            BOOKING_CONCURRENCY_RETRIES.labels(strategy=strategy, outcome="exhausted").inc()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=LOCK_CONFLICT_DETAIL)
+
+        BOOKING_CONCURRENCY_RETRIES.labels(strategy=strategy, outcome="retried").inc()
+        _sleep(delay)
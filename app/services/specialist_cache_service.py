@@ -0,0 +1,33 @@
+from collections.abc import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.read_cache import read_cache
+from app.db.session import run_blocking_io
+
+CHANGED_SPECIALISTS_SESSION_KEY = "changed_specialist_ids"
+
+
+def specialist_cache_namespace(specialist_id: int) -> str:
+    return f"specialist:{specialist_id}"
+
+
+def mark_specialists_changed(db: Session, specialist_ids: Iterable[int]) -> None:
+    # Versions are bumped only after the commit, so a reader can never cache pre-commit rows under the new version.
+    db.info.setdefault(CHANGED_SPECIALISTS_SESSION_KEY, set()).update(specialist_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_specialists(db: Session) -> None:
+    specialist_ids = db.info.pop(CHANGED_SPECIALISTS_SESSION_KEY, None)
+    if specialist_ids:
+        run_blocking_io(
+            read_cache.invalidate,
+            [specialist_cache_namespace(specialist_id) for specialist_id in sorted(specialist_ids)],
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_specialists(db: Session) -> None:
+    db.info.pop(CHANGED_SPECIALISTS_SESSION_KEY, None)
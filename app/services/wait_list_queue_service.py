@@ -0,0 +1,159 @@
+import logging
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import event, func, select, tuple_
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.wait_list_queue import wait_list_queue
+from app.db.models import WaitListEntry
+from app.db.session import run_blocking_io
+
+DEQUEUED_ENTRIES_SESSION_KEY = "dequeued_wait_list_entries"
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+logger = logging.getLogger("app.wait_list")
+
+
+def wait_list_queue_score(created_at: datetime) -> int:
+    # Integer microseconds stay exact in a ZSET's double score, so the order matches ORDER BY created_at, id.
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=UTC)
+    return (created_at - EPOCH) // timedelta(microseconds=1)
+
+
+def enqueue_wait_list_entries(entries: Sequence[tuple[int, int, datetime]]) -> None:
+    if not settings.wait_list_queue_enabled:
+        return
+
+    by_slot: dict[int, list[tuple[int, int]]] = {}
+    for entry_id, slot_id, created_at in entries:
+        by_slot.setdefault(slot_id, []).append((entry_id, wait_list_queue_score(created_at)))
+    try:
+        for slot_id, slot_entries in by_slot.items():
+            wait_list_queue.add(slot_id, slot_entries)
+    except Exception:
+        # The rebuild task restores the entry; until then its position comes from the table.
+        logger.exception("wait_list_queue_write_failed")
+
+
+def dequeue_wait_list_entries(entries: Sequence[tuple[int, int]]) -> None:
+    if not settings.wait_list_queue_enabled:
+        return
+
+    by_slot: dict[int, list[int]] = {}
+    for entry_id, slot_id in entries:
+        by_slot.setdefault(slot_id, []).append(entry_id)
+    try:
+        for slot_id, entry_ids in by_slot.items():
+            wait_list_queue.remove(slot_id, entry_ids)
+    except Exception:
+        logger.exception("wait_list_queue_write_failed")
+
+
+def stage_wait_list_dequeue(db: Session, entries: Sequence[tuple[int, int]]) -> None:
+    # For deletes inside a caller's transaction: the queue only changes once the rows are really gone.
+    db.info.setdefault(DEQUEUED_ENTRIES_SESSION_KEY, []).extend(entries)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_staged_dequeues(db: Session) -> None:
+    entries = db.info.pop(DEQUEUED_ENTRIES_SESSION_KEY, None)
+    if entries:
+        run_blocking_io(dequeue_wait_list_entries, entries)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_staged_dequeues(db: Session) -> None:
+    db.info.pop(DEQUEUED_ENTRIES_SESSION_KEY, None)
+
+
+def _count_wait_list_position(db: Session, entry: WaitListEntry) -> tuple[int, int]:
+    # Compared against the stored row rather than a bound value, so SQLite's text timestamps compare alike.
+    target = aliased(WaitListEntry)
+    ahead, size = db.execute(
+        select(
+            func.count().filter(
+                tuple_(WaitListEntry.created_at, WaitListEntry.id) < tuple_(target.created_at, target.id)
+            ),
+            func.count(),
+        )
+        .select_from(WaitListEntry)
+        .join(target, target.slot_id == WaitListEntry.slot_id)
+        .where(target.id == entry.id)
+    ).one()
+    return ahead, size
+
+
+def get_wait_list_position(db: Session, entry: WaitListEntry) -> tuple[int, int]:
+    if settings.wait_list_queue_enabled:
+        try:
+            ranked = wait_list_queue.rank(entry.slot_id, entry.id)
+        except Exception:
+            logger.exception("wait_list_queue_read_failed")
+            ranked = None
+        if ranked is not None:
+            return ranked
+    return _count_wait_list_position(db=db, entry=entry)
+
+
+def _load_wait_list_queue_entries(db: Session, slot_ids: Sequence[int]) -> dict[int, list[tuple[int, int]]]:
+    entries_by_slot: dict[int, list[tuple[int, int]]] = {slot_id: [] for slot_id in slot_ids}
+    for entry_id, slot_id, created_at in db.execute(
+        select(WaitListEntry.id, WaitListEntry.slot_id, WaitListEntry.created_at).where(
+            WaitListEntry.slot_id.in_(slot_ids)
+        )
+    ):
+        entries_by_slot[slot_id].append((entry_id, wait_list_queue_score(created_at)))
+    db.rollback()
+    return entries_by_slot
+
+
+def _replace_wait_list_queues(db: Session, entries_by_slot: dict[int, list[tuple[int, int]]]) -> None:
+    for slot_id, entries in entries_by_slot.items():
+        wait_list_queue.replace(slot_id, entries)
+
+    # An entry promoted or left between the read and the replace would come back as a ghost, and a join's
+    # write-through would be wiped. Re-reading after the replace sees every change committed before it;
+    # changes committed later are written through on top of the replaced queue.
+    current_by_slot = _load_wait_list_queue_entries(db=db, slot_ids=list(entries_by_slot))
+    for slot_id, entries in entries_by_slot.items():
+        replaced_ids = {entry_id for entry_id, _ in entries}
+        current_entries = current_by_slot[slot_id]
+        if gone_ids := replaced_ids - {entry_id for entry_id, _ in current_entries}:
+            wait_list_queue.remove(slot_id, sorted(gone_ids))
+        if joined := [(entry_id, score) for entry_id, score in current_entries if entry_id not in replaced_ids]:
+            wait_list_queue.add(slot_id, joined)
+
+
+def rebuild_wait_list_queues(db: Session, chunk_size: int) -> int:
+    if not settings.wait_list_queue_enabled:
+        return 0
+
+    rebuilt_slot_ids: set[int] = set()
+    last_slot_id = 0
+    while True:
+        slot_ids = db.scalars(
+            select(WaitListEntry.slot_id)
+            .where(WaitListEntry.slot_id > last_slot_id)
+            .distinct()
+            .order_by(WaitListEntry.slot_id)
+            .limit(chunk_size)
+        ).all()
+        if not slot_ids:
+            break
+
+        _replace_wait_list_queues(db=db, entries_by_slot=_load_wait_list_queue_entries(db=db, slot_ids=slot_ids))
+        rebuilt_slot_ids.update(slot_ids)
+        last_slot_id = slot_ids[-1]
+
+    # Queues of slots nobody waited for during the scan are emptied, but a slot joined since then is refilled.
+    stale_slot_ids = sorted(set(wait_list_queue.slot_ids()) - rebuilt_slot_ids)
+    for offset in range(0, len(stale_slot_ids), chunk_size):
+        _replace_wait_list_queues(
+            db=db,
+            entries_by_slot={slot_id: [] for slot_id in stale_slot_ids[offset : offset + chunk_size]},
+        )
+    return len(rebuilt_slot_ids)
@@ -1,14 +1,55 @@
+import logging
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Select,
+    and_,
+    delete,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.db.models import Booking, BookingStatus, TimeSlot, WaitListEntry
-from app.services.booking_service import create_booking_for_slot
+from app.core.config import settings
+from app.db.models import (
+    Booking,
+    BookingStatus,
+    SpecialistProfile,
+    TimeSlot,
+    WaitListEntry,
+    WaitListPromotion,
+    WaitListWindow,
+)
+from app.db.session import run_blocking_io
+from app.services.availability_rollup_service import record_slots_booked
+from app.services.wait_list_queue_service import enqueue_wait_list_entries, stage_wait_list_dequeue
 
 SLOT_IS_AVAILABLE_DETAIL = "Slot is available. Book directly"
 ALREADY_IN_WAIT_LIST_DETAIL = "Client is already in wait list for this slot"
 ALREADY_HAS_BOOKING_DETAIL = "Client already has booking for this slot"
+WINDOW_HAS_FREE_SLOT_DETAIL = "A slot in this window is available. Book directly"
+ALREADY_WAITING_FOR_WINDOW_DETAIL = "Client is already waiting for this window"
+
+logger = logging.getLogger("app.wait_list")
+
+
+def _is_postgresql_session(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
 
 
 def add_client_to_wait_list(db: Session, slot_id: int, client_id: int) -> WaitListEntry:
@@ -38,20 +79,315 @@ def add_client_to_wait_list(db: Session, slot_id: int, client_id: int) -> WaitLi
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=ALREADY_IN_WAIT_LIST_DETAIL) from None
 
     db.refresh(entry)
+    run_blocking_io(enqueue_wait_list_entries, [(entry.id, entry.slot_id, entry.created_at)])
     return entry
 
 
-def promote_next_wait_list_entry(db: Session, slot_id: int) -> Booking | None:
-    entry = db.scalar(
-        select(WaitListEntry)
-        .where(WaitListEntry.slot_id == slot_id)
-        .order_by(WaitListEntry.created_at, WaitListEntry.id)
+def add_client_to_wait_list_window(
+    db: Session,
+    specialist_id: int,
+    client_id: int,
+    window_start: datetime,
+    window_end: datetime,
+) -> WaitListWindow:
+    specialist_exists = db.scalar(select(SpecialistProfile.id).where(SpecialistProfile.id == specialist_id))
+    if specialist_exists is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Specialist not found")
+
+    free_slot_id = db.scalar(
+        select(TimeSlot.id)
+        .where(
+            TimeSlot.specialist_id == specialist_id,
+            TimeSlot.start_at >= window_start,
+            TimeSlot.end_at <= window_end,
+            TimeSlot.is_booked.is_(False),
+        )
+        .limit(1)
+    )
+    if free_slot_id is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=WINDOW_HAS_FREE_SLOT_DETAIL)
+
+    window = WaitListWindow(
+        specialist_id=specialist_id,
+        client_id=client_id,
+        window_start=window_start,
+        window_end=window_end,
+    )
+    db.add(window)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=ALREADY_WAITING_FOR_WINDOW_DETAIL) from None
+
+    db.refresh(window)
+    return window
+
+
+def _window_matches_slot(dialect_name: str):
+    if dialect_name == "postgresql":
+        # Same expressions as ix_wait_list_windows_specialist_window, so both tests are index conditions.
+        return and_(
+            func.int4range(WaitListWindow.specialist_id, WaitListWindow.specialist_id, "[]").op("@>")(
+                TimeSlot.specialist_id
+            ),
+            func.tstzrange(WaitListWindow.window_start, WaitListWindow.window_end, "[]").op("@>")(
+                func.tstzrange(TimeSlot.start_at, TimeSlot.end_at, "[]")
+            ),
+        )
+    return and_(
+        WaitListWindow.specialist_id == TimeSlot.specialist_id,
+        WaitListWindow.window_start <= TimeSlot.start_at,
+        WaitListWindow.window_end >= TimeSlot.end_at,
+    )
+
+
+def build_wait_list_window_match_query(
+    slot_id: int,
+    dialect_name: str,
+    now: datetime,
+    skip_window_ids: Sequence[int] = (),
+) -> Select[tuple[int, int]]:
+    # A slot that has already started (freed by the expiration sweep) is not worth a window.
+    query = (
+        select(WaitListWindow.id, WaitListWindow.client_id)
+        .join(TimeSlot, _window_matches_slot(dialect_name))
+        .where(TimeSlot.id == slot_id, TimeSlot.is_booked.is_(False), TimeSlot.start_at > now)
+        .order_by(WaitListWindow.created_at, WaitListWindow.id)
+        .limit(1)
+    )
+    if skip_window_ids:
+        query = query.where(WaitListWindow.id.not_in(skip_window_ids))
+    return query
+
+
+def _match_wait_list_windows(db: Session, slot_ids: Sequence[int]) -> list[tuple[int, int, int]]:
+    # One indexed lookup per slot; a window is consumed by the first slot it matches in the batch.
+    dialect_name = db.get_bind().dialect.name
+    now = datetime.now(UTC)
+    matches: list[tuple[int, int, int]] = []
+    for slot_id in sorted(slot_ids):
+        query = build_wait_list_window_match_query(
+            slot_id=slot_id,
+            dialect_name=dialect_name,
+            now=now,
+            skip_window_ids=[window_id for window_id, _, _ in matches],
+        )
+        if _is_postgresql_session(db):
+            # Unlike a slot's own queue, a window locked by another worker is being consumed or removed there,
+            # so the next eligible window takes the slot.
+            query = query.with_for_update(of=WaitListWindow, skip_locked=True)
+        match = db.execute(query).first()
+        if match is not None:
+            window_id, client_id = match
+            matches.append((window_id, slot_id, client_id))
+    return matches
+
+
+def build_wait_list_heads_query(slot_ids: Sequence[int], dialect_name: str) -> Select[tuple[int]]:
+    if dialect_name == "postgresql":
+        # One ordered LIMIT 1 probe of (slot_id, created_at, id) per slot, instead of reading and sorting every
+        # entry of every slot in the batch as DISTINCT ON would.
+        requested = (
+            func.unnest(literal(list(slot_ids), ARRAY(Integer))).table_valued("slot_id").render_derived("requested")
+        )
+        head = (
+            select(WaitListEntry.id)
+            .where(WaitListEntry.slot_id == requested.c.slot_id)
+            .order_by(WaitListEntry.created_at, WaitListEntry.id)
+            .limit(1)
+            .lateral("head")
+        )
+        return select(head.c.id).select_from(requested).join(head, true())
+
+    ranked = (
+        select(
+            WaitListEntry.id,
+            func.row_number()
+            .over(partition_by=WaitListEntry.slot_id, order_by=(WaitListEntry.created_at, WaitListEntry.id))
+            .label("position"),
+        )
+        .where(WaitListEntry.slot_id.in_(slot_ids))
+        .subquery()
     )
-    if not entry:
-        return None
+    return select(ranked.c.id).where(ranked.c.position == 1)
 
-    promoted_booking = create_booking_for_slot(db=db, slot_id=slot_id, client_id=entry.client_id)
 
-    db.delete(entry)
+def promote_wait_list_heads(db: Session, slot_ids: Sequence[int]) -> tuple[list[Booking], list[int]]:
+    # Joins the caller's transaction. Returns the promoted bookings and the slots to retry later because
+    # their head entry is locked by another transaction.
+    if not slot_ids:
+        return [], []
+
+    # A slot that has already started cannot be booked; its waiters are left for the wait-list GC.
+    slot_ids = db.scalars(
+        select(TimeSlot.id).where(TimeSlot.id.in_(slot_ids), TimeSlot.start_at > datetime.now(UTC))
+    ).all()
+    if not slot_ids:
+        return [], []
+
+    heads_query = select(WaitListEntry.id, WaitListEntry.slot_id, WaitListEntry.client_id).where(
+        WaitListEntry.id.in_(build_wait_list_heads_query(slot_ids, db.get_bind().dialect.name))
+    )
+    if _is_postgresql_session(db):
+        # Locking inside the per-slot probe would let SKIP LOCKED fall through to the next entry in line, so the
+        # heads are picked first and locked by id; a head held by a concurrent worker is skipped instead.
+        heads_query = heads_query.with_for_update(skip_locked=True)
+    heads = db.execute(heads_query).all()
+
+    headless_slot_ids = set(slot_ids) - {slot_id for _, slot_id, _ in heads}
+    deferred_slot_ids = (
+        db.scalars(
+            select(WaitListEntry.slot_id).where(WaitListEntry.slot_id.in_(headless_slot_ids)).distinct()
+        ).all()
+        if headless_slot_ids
+        else []
+    )
+    # Waiters for the exact slot go first; a window waiter only gets a slot nobody is queued for.
+    window_heads = _match_wait_list_windows(db=db, slot_ids=headless_slot_ids - set(deferred_slot_ids))
+    if not heads and not window_heads:
+        return [], list(deferred_slot_ids)
+
+    # A slot booked directly in the meantime stays booked; its wait list keeps its order.
+    claimed_slot_ids = db.scalars(
+        update(TimeSlot)
+        .where(
+            TimeSlot.id.in_([slot_id for _, slot_id, _ in [*heads, *window_heads]]),
+            TimeSlot.is_booked.is_(False),
+        )
+        .values(is_booked=True, version=TimeSlot.version + 1)
+        .returning(TimeSlot.id),
+        execution_options={"synchronize_session": False},
+    ).all()
+    if not claimed_slot_ids:
+        return [], list(deferred_slot_ids)
+
+    record_slots_booked(db=db, slot_ids=claimed_slot_ids)
+    claimed = set(claimed_slot_ids)
+    promoted_clients = {slot_id: client_id for _, slot_id, client_id in [*heads, *window_heads] if slot_id in claimed}
+    insert = pg_insert if _is_postgresql_session(db) else sqlite_insert
+    # The partial unique index still arbitrates against a unique_index-strategy booking racing for the slot.
+    bookings = db.scalars(
+        insert(Booking)
+        .values(
+            [
+                {"slot_id": slot_id, "client_id": client_id, "status": BookingStatus.CONFIRMED.value}
+                for slot_id, client_id in promoted_clients.items()
+            ]
+        )
+        .on_conflict_do_nothing(
+            index_elements=[Booking.slot_id],
+            index_where=Booking.status == BookingStatus.CONFIRMED.value,
+        )
+        .returning(Booking)
+    ).all()
+    booked_slot_ids = {booking.slot_id for booking in bookings}
+    promoted_entries = [(entry_id, slot_id) for entry_id, slot_id, _ in heads if slot_id in booked_slot_ids]
+    if promoted_entries:
+        db.execute(delete(WaitListEntry).where(WaitListEntry.id.in_([entry_id for entry_id, _ in promoted_entries])))
+        stage_wait_list_dequeue(db, promoted_entries)
+    promoted_window_ids = [window_id for window_id, slot_id, _ in window_heads if slot_id in booked_slot_ids]
+    if promoted_window_ids:
+        db.execute(delete(WaitListWindow).where(WaitListWindow.id.in_(promoted_window_ids)))
+    return list(bookings), list(deferred_slot_ids)
+
+
+def request_wait_list_promotion(db: Session, slot_id: int) -> None:
+    # Joins the caller's transaction, so the request exists exactly when the freed slot is committed.
+    # A request that lands while the row is claimed re-arms it, and the worker's delete then leaves it in place.
+    requested_at = datetime.now(UTC)
+    insert = pg_insert if _is_postgresql_session(db) else sqlite_insert
+    db.execute(
+        insert(WaitListPromotion)
+        .values(slot_id=slot_id, requested_at=requested_at, available_at=requested_at)
+        .on_conflict_do_update(
+            index_elements=[WaitListPromotion.slot_id],
+            set_={"requested_at": requested_at, "available_at": requested_at},
+        )
+    )
+
+
+def request_wait_list_promotions(db: Session, slot_ids: Sequence[int]) -> int:
+    # Bulk variant for sweeps and new slots: one statement, and only slots that actually have someone waiting,
+    # for the slot itself or for a window around it, get a request. Returns the number of requests written.
+    if not slot_ids:
+        return 0
+
+    requested_at = datetime.now(UTC)
+    insert = pg_insert if _is_postgresql_session(db) else sqlite_insert
+    statement = insert(WaitListPromotion).from_select(
+        ["slot_id", "requested_at", "available_at"],
+        select(
+            TimeSlot.id,
+            literal(requested_at, DateTime(timezone=True)),
+            literal(requested_at, DateTime(timezone=True)),
+        ).where(
+            TimeSlot.id.in_(slot_ids),
+            or_(
+                exists().where(WaitListEntry.slot_id == TimeSlot.id),
+                exists().where(_window_matches_slot(db.get_bind().dialect.name)),
+            ),
+        ),
+    )
+    result = db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[WaitListPromotion.slot_id],
+            set_={"requested_at": statement.excluded.requested_at, "available_at": statement.excluded.available_at},
+        )
+    )
+    return result.rowcount
+
+
+def _claim_wait_list_promotions(db: Session, batch_size: int, now: datetime) -> list[tuple[int, datetime]]:
+    claimable = (
+        select(WaitListPromotion.slot_id)
+        .where(WaitListPromotion.available_at <= now)
+        .order_by(WaitListPromotion.available_at)
+        .limit(batch_size)
+    )
+    if _is_postgresql_session(db):
+        claimable = claimable.with_for_update(skip_locked=True)
+
+    # Claimed rows are leased rather than deleted, so a crashed worker's batch is retried after the lease.
+    claimed = db.execute(
+        update(WaitListPromotion)
+        .where(WaitListPromotion.slot_id.in_(claimable.scalar_subquery()))
+        .values(available_at=now + timedelta(seconds=settings.wait_list_promotion_lease_seconds))
+        .returning(WaitListPromotion.slot_id, WaitListPromotion.requested_at),
+        execution_options={"synchronize_session": False},
+    ).all()
     db.commit()
-    return promoted_booking
+    return [(slot_id, requested_at) for slot_id, requested_at in claimed]
+
+
+def process_wait_list_promotions(db: Session, batch_size: int) -> int:
+    processed = 0
+    while claimed := _claim_wait_list_promotions(db=db, batch_size=batch_size, now=datetime.now(UTC)):
+        try:
+            bookings, deferred_slot_ids = promote_wait_list_heads(
+                db=db,
+                slot_ids=[slot_id for slot_id, _ in claimed],
+            )
+        except Exception:
+            # The lease brings the batch back.
+            db.rollback()
+            logger.exception("wait_list_promotion_batch_failed size=%s", len(claimed))
+            continue
+
+        deferred = set(deferred_slot_ids)
+        settled = [(slot_id, requested_at) for slot_id, requested_at in claimed if slot_id not in deferred]
+        if settled:
+            db.execute(
+                delete(WaitListPromotion).where(
+                    tuple_(WaitListPromotion.slot_id, WaitListPromotion.requested_at).in_(settled)
+                )
+            )
+        db.commit()
+        logger.info(
+            "wait_list_promotions_processed promoted=%s settled=%s deferred=%s",
+            len(bookings),
+            len(settled),
+            len(deferred),
+        )
+        processed += len(settled)
+    return processed
@@ -0,0 +1,17 @@
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.availability_rollup_service import reconcile_availability_rollup
+from app.tasks.celery_app import celery_app
+
+
+@celery_app.task(name="specialists.reconcile_availability_rollup")
+def reconcile_availability_rollup_task() -> dict[str, int]:
+    db = SessionLocal()
+    try:
+        repaired_count = reconcile_availability_rollup(
+            db=db,
+            chunk_size=settings.availability_rollup_reconcile_chunk_size,
+        )
+        return {"repaired": repaired_count}
+    finally:
+        db.close()
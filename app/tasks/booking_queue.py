@@ -0,0 +1,27 @@
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.booking_queue_service import apply_queued_bookings
+from app.tasks.celery_app import celery_app
+
+
+@celery_app.task(name="bookings.apply_queued")
+def apply_queued_bookings_task(specialist_id: int) -> dict[str, int]:
+    db = SessionLocal()
+    try:
+        applied_count = apply_queued_bookings(db=db, specialist_id=specialist_id)
+        return {"applied": applied_count}
+    finally:
+        db.close()
+
+
+@celery_app.task(name="bookings.drain_booking_queues")
+def drain_booking_queues_task() -> dict[str, int]:
+    db = SessionLocal()
+    try:
+        applied_count = sum(
+            apply_queued_bookings(db=db, specialist_id=specialist_id)
+            for specialist_id in settings.booking_queue_specialist_ids
+        )
+        return {"applied": applied_count}
+    finally:
+        db.close()
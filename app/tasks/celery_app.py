@@ -12,7 +12,15 @@ celery_app = Celery(
     "booking",
     broker=broker_url,
     backend=result_backend,
-    include=["app.tasks.expirations", "app.tasks.reminders"],
+    include=[
+        "app.tasks.expirations",
+        "app.tasks.reminders",
+        "app.tasks.booking_queue",
+        "app.tasks.wait_list_promotions",
+        "app.tasks.availability_rollup",
+        "app.tasks.wait_list_queues",
+        "app.tasks.wait_list_gc",
+    ],
 )
 
 celery_app.conf.update(
@@ -30,5 +38,25 @@ celery_app.conf.update(
             "task": "bookings.remind_upcoming",
             "schedule": timedelta(minutes=settings.celery_reminder_interval_minutes),
         },
+        "drain-booking-queues": {
+            "task": "bookings.drain_booking_queues",
+            "schedule": timedelta(seconds=settings.celery_booking_queue_drain_interval_seconds),
+        },
+        "drain-wait-list-promotions": {
+            "task": "bookings.process_wait_list_promotions",
+            "schedule": timedelta(seconds=settings.celery_wait_list_promotion_drain_interval_seconds),
+        },
+        "reconcile-availability-rollup": {
+            "task": "specialists.reconcile_availability_rollup",
+            "schedule": timedelta(minutes=settings.celery_availability_rollup_reconcile_interval_minutes),
+        },
+        "rebuild-wait-list-queues": {
+            "task": "bookings.rebuild_wait_list_queues",
+            "schedule": timedelta(minutes=settings.celery_wait_list_queue_rebuild_interval_minutes),
+        },
+        "purge-dead-wait-list-entries": {
+            "task": "bookings.purge_dead_wait_list_entries",
+            "schedule": timedelta(minutes=settings.celery_wait_list_gc_interval_minutes),
+        },
     },
 )
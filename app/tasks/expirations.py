@@ -1,40 +1,91 @@
+from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Integer, Select, any_, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.db.models import Booking, BookingStatus, TimeSlot
 from app.db.session import SessionLocal
+from app.services.availability_rollup_service import record_slots_freed
 from app.tasks.celery_app import celery_app
-from app.services.wait_list_service import promote_next_wait_list_entry
 
 
-def expire_started_slots(db: Session, now: datetime | None = None) -> int:
-    current_time = now or datetime.now(UTC)
-    expire_before = current_time - timedelta(minutes=settings.booking_expire_after_start_minutes)
+def _is_postgresql_session(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
 
-    stale_bookings = db.scalars(
-        select(Booking)
+def build_stale_bookings_query(expire_before: datetime) -> Select[tuple[int]]:
+    return (
+        select(Booking.id)
         .join(TimeSlot, Booking.slot_id == TimeSlot.id)
         .where(
             Booking.status == BookingStatus.CONFIRMED.value,
             TimeSlot.start_at <= expire_before,
         )
+    )
+
+
+def _slot_ids_filter(db: Session, slot_ids: Sequence[int]) -> Any:
+    if _is_postgresql_session(db):
+        # A single array parameter instead of one bind per slot in the chunk.
+        return TimeSlot.id == any_(literal(list(slot_ids), ARRAY(Integer)))
+    return TimeSlot.id.in_(slot_ids)
+
+
+def _expire_stale_bookings_chunk(
+    db: Session,
+    expire_before: datetime,
+    current_time: datetime,
+    batch_size: int,
+) -> int:
+    stale_booking_ids = build_stale_bookings_query(expire_before).limit(batch_size)
+    if _is_postgresql_session(db):
+        # Rows held by a concurrent cancel or booking are left for the next sweep instead of blocking this one.
+        stale_booking_ids = stale_booking_ids.with_for_update(of=[Booking, TimeSlot], skip_locked=True)
+
+    slot_ids = db.scalars(
+        update(Booking)
+        .where(Booking.id.in_(stale_booking_ids.scalar_subquery()))
+        .values(status=BookingStatus.EXPIRED.value, cancelled_at=current_time)
+        .returning(Booking.slot_id),
+        execution_options={"synchronize_session": False},
     ).all()
+    if not slot_ids:
+        return 0
 
-    for booking in stale_bookings:
-        booking.status = BookingStatus.EXPIRED.value
-        booking.cancelled_at = current_time
-        booking.slot.is_booked = False
+    freed_slot_ids = db.scalars(
+        update(TimeSlot)
+        .where(_slot_ids_filter(db, slot_ids), TimeSlot.is_booked.is_(True))
+        .values(is_booked=False, version=TimeSlot.version + 1)
+        .returning(TimeSlot.id),
+        execution_options={"synchronize_session": False},
+    ).all()
+    # Expired slots have already started, so nobody on their wait list can be promoted into them;
+    # the entries are left for the wait-list GC.
+    record_slots_freed(db=db, slot_ids=freed_slot_ids)
+    db.commit()
+    return len(slot_ids)
 
-    if stale_bookings:
-        db.commit()
 
-    for booking in stale_bookings:
-        promote_next_wait_list_entry(db=db, slot_id=booking.slot_id)
+def expire_started_slots(db: Session, now: datetime | None = None, batch_size: int | None = None) -> int:
+    current_time = now or datetime.now(UTC)
+    expire_before = current_time - timedelta(minutes=settings.booking_expire_after_start_minutes)
+    chunk_size = batch_size or settings.booking_expire_batch_size
 
-    return len(stale_bookings)
+    # Each chunk commits on its own, so locks are held for one chunk and a timed-out sweep keeps its progress.
+    expired_count = 0
+    while chunk_count := _expire_stale_bookings_chunk(
+        db=db,
+        expire_before=expire_before,
+        current_time=current_time,
+        batch_size=chunk_size,
+    ):
+        expired_count += chunk_count
+    return expired_count
 
 
 @celery_app.task(name="bookings.expire_started_slots")
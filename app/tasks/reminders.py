@@ -1,6 +1,6 @@
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -9,11 +9,8 @@ from app.db.session import SessionLocal
 from app.tasks.celery_app import celery_app
 
 
-def count_upcoming_bookings_for_reminder(db: Session, now: datetime | None = None) -> int:
-    current_time = now or datetime.now(UTC)
-    reminder_until = current_time + timedelta(minutes=settings.reminder_lookahead_minutes)
-
-    upcoming = db.scalars(
+def build_upcoming_bookings_query(current_time: datetime, reminder_until: datetime) -> Select[tuple[Booking]]:
+    return (
         select(Booking)
         .join(TimeSlot, Booking.slot_id == TimeSlot.id)
         .where(
@@ -21,7 +18,14 @@ def count_upcoming_bookings_for_reminder(db: Session, now: datetime | None = Non
             TimeSlot.start_at >= current_time,
             TimeSlot.start_at < reminder_until,
         )
-    ).all()
+    )
+
+
+def count_upcoming_bookings_for_reminder(db: Session, now: datetime | None = None) -> int:
+    current_time = now or datetime.now(UTC)
+    reminder_until = current_time + timedelta(minutes=settings.reminder_lookahead_minutes)
+
+    upcoming = db.scalars(build_upcoming_bookings_query(current_time, reminder_until)).all()
     return len(upcoming)
 
 
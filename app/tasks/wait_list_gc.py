@@ -0,0 +1,96 @@
+import logging
+from datetime import UTC, datetime
+
+from sqlalchemy import Select, delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import WAIT_LIST_GC_DELETED_ROWS
+from app.db.models import TimeSlot, WaitListEntry, WaitListWindow
+from app.db.session import SessionLocal
+from app.services.wait_list_queue_service import stage_wait_list_dequeue
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger("app.wait_list")
+
+
+def _is_postgresql_session(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def build_dead_wait_list_entries_query(current_time: datetime) -> Select[tuple[int]]:
+    return (
+        select(WaitListEntry.id)
+        .join(TimeSlot, WaitListEntry.slot_id == TimeSlot.id)
+        .where(TimeSlot.start_at <= current_time)
+    )
+
+
+def build_dead_wait_list_windows_query(current_time: datetime) -> Select[tuple[int]]:
+    # No slot that has not started yet fits into a window that is already over.
+    return select(WaitListWindow.id).where(WaitListWindow.window_end <= current_time)
+
+
+def _delete_dead_wait_list_entries_chunk(db: Session, current_time: datetime, batch_size: int) -> int:
+    dead_entry_ids = build_dead_wait_list_entries_query(current_time).limit(batch_size)
+    if _is_postgresql_session(db):
+        # An entry held by a promotion in flight is left for the next run.
+        dead_entry_ids = dead_entry_ids.with_for_update(of=WaitListEntry, skip_locked=True)
+
+    deleted = db.execute(
+        delete(WaitListEntry)
+        .where(WaitListEntry.id.in_(dead_entry_ids.scalar_subquery()))
+        .returning(WaitListEntry.id, WaitListEntry.slot_id),
+        execution_options={"synchronize_session": False},
+    ).all()
+    stage_wait_list_dequeue(db, [(entry_id, slot_id) for entry_id, slot_id in deleted])
+    db.commit()
+    return len(deleted)
+
+
+def _delete_dead_wait_list_windows_chunk(db: Session, current_time: datetime, batch_size: int) -> int:
+    dead_window_ids = build_dead_wait_list_windows_query(current_time).limit(batch_size)
+    if _is_postgresql_session(db):
+        dead_window_ids = dead_window_ids.with_for_update(skip_locked=True)
+
+    deleted = db.scalars(
+        delete(WaitListWindow)
+        .where(WaitListWindow.id.in_(dead_window_ids.scalar_subquery()))
+        .returning(WaitListWindow.id),
+        execution_options={"synchronize_session": False},
+    ).all()
+    db.commit()
+    return len(deleted)
+
+
+def purge_dead_wait_list_entries(
+    db: Session,
+    now: datetime | None = None,
+    batch_size: int | None = None,
+) -> dict[str, int]:
+    current_time = now or datetime.now(UTC)
+    chunk_size = batch_size or settings.wait_list_gc_batch_size
+
+    # Bounded deletes with a commit each, like the expiration sweep: short locks, small WAL bursts,
+    # and a run that is cut short keeps what it already removed.
+    deleted = {"entries": 0, "windows": 0}
+    for kind, delete_chunk in (
+        ("entries", _delete_dead_wait_list_entries_chunk),
+        ("windows", _delete_dead_wait_list_windows_chunk),
+    ):
+        while chunk_count := delete_chunk(db=db, current_time=current_time, batch_size=chunk_size):
+            deleted[kind] += chunk_count
+            WAIT_LIST_GC_DELETED_ROWS.labels(kind=kind).inc(chunk_count)
+
+    logger.info("wait_list_gc_finished entries=%s windows=%s", deleted["entries"], deleted["windows"])
+    return deleted
+
+
+@celery_app.task(name="bookings.purge_dead_wait_list_entries")
+def purge_dead_wait_list_entries_task() -> dict[str, int]:
+    db = SessionLocal()
+    try:
+        return purge_dead_wait_list_entries(db=db)
+    finally:
+        db.close()
@@ -0,0 +1,65 @@
+import logging
+import threading
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.wait_list_service import process_wait_list_promotions
+from app.tasks.celery_app import celery_app
+
+WAIT_LIST_PROMOTION_DISPATCH_THREAD = "thread"
+
+logger = logging.getLogger("app.wait_list")
+
+
+@celery_app.task(name="bookings.process_wait_list_promotions")
+def process_wait_list_promotions_task() -> dict[str, int]:
+    db = SessionLocal()
+    try:
+        processed_count = process_wait_list_promotions(db=db, batch_size=settings.wait_list_promotion_batch_size)
+        return {"processed": processed_count}
+    finally:
+        db.close()
+
+
+class LocalWaitListPromotionWorker:
+    def __init__(self, session_factory: sessionmaker[Session]) -> None:
+        self._session_factory = session_factory
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def kick(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="wait-list-promotions", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(timeout=settings.celery_wait_list_promotion_drain_interval_seconds)
+            self._wakeup.clear()
+            db = self._session_factory()
+            try:
+                process_wait_list_promotions(db=db, batch_size=settings.wait_list_promotion_batch_size)
+            except Exception:
+                logger.exception("wait_list_promotion_drain_failed")
+            finally:
+                db.close()
+
+
+local_wait_list_promotion_worker = LocalWaitListPromotionWorker(session_factory=SessionLocal)
+
+
+def kick_wait_list_promotions() -> None:
+    if settings.wait_list_promotion_dispatch.strip().lower() == WAIT_LIST_PROMOTION_DISPATCH_THREAD:
+        local_wait_list_promotion_worker.kick()
+        return
+
+    try:
+        process_wait_list_promotions_task.apply_async(retry=False)
+    except Exception:
+        # The periodic drain picks the request up.
+        logger.exception("wait_list_promotion_kick_failed")
@@ -0,0 +1,14 @@
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.wait_list_queue_service import rebuild_wait_list_queues
+from app.tasks.celery_app import celery_app
+
+
+@celery_app.task(name="bookings.rebuild_wait_list_queues")
+def rebuild_wait_list_queues_task() -> dict[str, int]:
+    db = SessionLocal()
+    try:
+        rebuilt_count = rebuild_wait_list_queues(db=db, chunk_size=settings.wait_list_queue_rebuild_chunk_size)
+        return {"rebuilt": rebuilt_count}
+    finally:
+        db.close()
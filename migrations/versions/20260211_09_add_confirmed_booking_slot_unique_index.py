@@ -0,0 +1,31 @@
+"""add partial unique index on confirmed bookings per slot
+
+Revision ID: 20260211_09
+Revises: 20260210_08
+Create Date: 2026-02-11 10:15:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260211_09"
+down_revision: Union[str, None] = "20260210_08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "uq_bookings_slot_confirmed",
+        "bookings",
+        ["slot_id"],
+        unique=True,
+        postgresql_where=sa.text("status = 'confirmed'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_bookings_slot_confirmed", table_name="bookings")
@@ -0,0 +1,28 @@
+"""add time slot version column
+
+Revision ID: 20260211_10
+Revises: 20260211_09
+Create Date: 2026-02-11 14:30:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260211_10"
+down_revision: Union[str, None] = "20260211_09"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "time_slots",
+        sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("1")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("time_slots", "version")
@@ -0,0 +1,27 @@
+"""add booking run id column
+
+Revision ID: 20260212_11
+Revises: 20260211_10
+Create Date: 2026-02-12 10:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260212_11"
+down_revision: Union[str, None] = "20260211_10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("bookings", sa.Column("run_id", sa.String(length=32), nullable=True))
+    op.create_index("ix_bookings_run_id", "bookings", ["run_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_run_id", table_name="bookings")
+    op.drop_column("bookings", "run_id")
@@ -0,0 +1,34 @@
+"""add booking keyset pagination indexes
+
+Revision ID: 20260212_12
+Revises: 20260212_11
+Create Date: 2026-02-12 12:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260212_12"
+down_revision: Union[str, None] = "20260212_11"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # bookings is large, so build without blocking writes. The specialist list reaches bookings through
+    # time_slots and the slot_id index, so only the client list needs a keyset index.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_bookings_client_id_id",
+            "bookings",
+            ["client_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_bookings_client_id_id", table_name="bookings", postgresql_concurrently=True)
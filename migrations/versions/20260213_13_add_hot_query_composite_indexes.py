@@ -0,0 +1,54 @@
+"""add composite indexes for hot queries
+
+Revision ID: 20260213_13
+Revises: 20260212_12
+Create Date: 2026-02-13 10:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260213_13"
+down_revision: Union[str, None] = "20260212_12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # time_slots and bookings are large, so build without blocking writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_time_slots_specialist_id_start_at",
+            "time_slots",
+            ["specialist_id", "start_at"],
+            unique=False,
+            postgresql_include=["is_booked"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_bookings_status_slot_id",
+            "bookings",
+            ["status", "slot_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_wait_list_entries_slot_id_created_at_id",
+            "wait_list_entries",
+            ["slot_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_wait_list_entries_slot_id_created_at_id",
+            table_name="wait_list_entries",
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_bookings_status_slot_id", table_name="bookings", postgresql_concurrently=True)
+        op.drop_index("ix_time_slots_specialist_id_start_at", table_name="time_slots", postgresql_concurrently=True)
@@ -0,0 +1,51 @@
+"""add booking updated_at column
+
+Revision ID: 20260214_14
+Revises: 20260213_13
+Create Date: 2026-02-14 10:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260214_14"
+down_revision: Union[str, None] = "20260213_13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.add_column(
+        "bookings",
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    # bookings is large: backfill in id ranges, each committed on its own, so no single transaction rewrites
+    # the table or holds its row locks for the whole run.
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"""
+            DO $$
+            DECLARE
+                batch_start bigint := 0;
+                last_id bigint;
+            BEGIN
+                SELECT MAX(id) INTO last_id FROM bookings;
+                WHILE batch_start < COALESCE(last_id, 0) LOOP
+                    UPDATE bookings
+                    SET updated_at = COALESCE(cancelled_at, created_at)
+                    WHERE id > batch_start AND id <= batch_start + {BACKFILL_BATCH_SIZE};
+                    COMMIT;
+                    batch_start := batch_start + {BACKFILL_BATCH_SIZE};
+                END LOOP;
+            END $$;
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("bookings", "updated_at")
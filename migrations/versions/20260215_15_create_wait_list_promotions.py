@@ -0,0 +1,34 @@
+"""create wait list promotions outbox
+
+Revision ID: 20260215_15
+Revises: 20260214_14
+Create Date: 2026-02-15 10:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260215_15"
+down_revision: Union[str, None] = "20260214_14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "wait_list_promotions",
+        sa.Column("slot_id", sa.Integer(), nullable=False),
+        sa.Column("requested_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["slot_id"], ["time_slots.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("slot_id"),
+    )
+    op.create_index("ix_wait_list_promotions_available_at", "wait_list_promotions", ["available_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_wait_list_promotions_available_at", table_name="wait_list_promotions")
+    op.drop_table("wait_list_promotions")
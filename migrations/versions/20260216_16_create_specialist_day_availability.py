@@ -0,0 +1,47 @@
+"""create specialist day availability rollup
+
+Revision ID: 20260216_16
+Revises: 20260215_15
+Create Date: 2026-02-16 10:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260216_16"
+down_revision: Union[str, None] = "20260215_15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "specialist_day_availability",
+        sa.Column("specialist_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("total_slots", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("free_slots", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("booked_slots", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["specialist_id"], ["specialist_profiles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("specialist_id", "day"),
+    )
+    op.execute(
+        """
+        INSERT INTO specialist_day_availability (specialist_id, day, total_slots, free_slots, booked_slots)
+        SELECT
+            specialist_id,
+            date_trunc('day', start_at AT TIME ZONE 'UTC')::date,
+            count(*),
+            count(*) FILTER (WHERE NOT is_booked),
+            count(*) FILTER (WHERE is_booked)
+        FROM time_slots
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("specialist_day_availability")
@@ -0,0 +1,60 @@
+"""create wait list windows
+
+Revision ID: 20260217_17
+Revises: 20260216_16
+Create Date: 2026-02-17 10:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260217_17"
+down_revision: Union[str, None] = "20260216_16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "wait_list_windows",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("specialist_id", sa.Integer(), nullable=False),
+        sa.Column("client_id", sa.Integer(), nullable=False),
+        sa.Column("window_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("window_end", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["client_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["specialist_id"], ["specialist_profiles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "specialist_id",
+            "client_id",
+            "window_start",
+            "window_end",
+            name="uq_wait_list_window_specialist_client_window",
+        ),
+    )
+    op.create_index(op.f("ix_wait_list_windows_id"), "wait_list_windows", ["id"], unique=False)
+    op.create_index(op.f("ix_wait_list_windows_specialist_id"), "wait_list_windows", ["specialist_id"], unique=False)
+    op.create_index(op.f("ix_wait_list_windows_client_id"), "wait_list_windows", ["client_id"], unique=False)
+    op.create_index(
+        "ix_wait_list_windows_specialist_window",
+        "wait_list_windows",
+        [
+            sa.text("int4range(specialist_id, specialist_id, '[]')"),
+            sa.text("tstzrange(window_start, window_end, '[]')"),
+        ],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_wait_list_windows_specialist_window", table_name="wait_list_windows")
+    op.drop_index(op.f("ix_wait_list_windows_client_id"), table_name="wait_list_windows")
+    op.drop_index(op.f("ix_wait_list_windows_specialist_id"), table_name="wait_list_windows")
+    op.drop_index(op.f("ix_wait_list_windows_id"), table_name="wait_list_windows")
+    op.drop_table("wait_list_windows")
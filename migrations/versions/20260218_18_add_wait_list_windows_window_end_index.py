@@ -0,0 +1,24 @@
+"""add wait list windows window_end index
+
+Revision ID: 20260218_18
+Revises: 20260217_17
+Create Date: 2026-02-18 10:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260218_18"
+down_revision: Union[str, None] = "20260217_17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_wait_list_windows_window_end", "wait_list_windows", ["window_end"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_wait_list_windows_window_end", table_name="wait_list_windows")
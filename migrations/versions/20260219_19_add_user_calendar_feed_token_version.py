@@ -0,0 +1,28 @@
+"""add user calendar feed token version
+
+Revision ID: 20260219_19
+Revises: 20260218_18
+Create Date: 2026-02-19 09:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260219_19"
+down_revision: Union[str, None] = "20260218_18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("calendar_feed_token_version", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "calendar_feed_token_version")
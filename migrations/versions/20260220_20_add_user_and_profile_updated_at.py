@@ -0,0 +1,31 @@
+"""add users and specialist profiles updated_at columns
+
+Revision ID: 20260220_20
+Revises: 20260219_19
+Create Date: 2026-02-20 09:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260220_20"
+down_revision: Union[str, None] = "20260219_19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # now() is evaluated once for the ALTER, so existing rows get it without a table rewrite.
+    for table_name in ("users", "specialist_profiles"):
+        op.add_column(
+            table_name,
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        )
+
+
+def downgrade() -> None:
+    for table_name in ("specialist_profiles", "users"):
+        op.drop_column(table_name, "updated_at")
@@ -0,0 +1,32 @@
+"""drop unused booking slot_id, id index
+
+Revision ID: 20260221_21
+Revises: 20260220_20
+Create Date: 2026-02-21 09:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260221_21"
+down_revision: Union[str, None] = "20260220_20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases migrated before 20260212_12 stopped creating it still carry the index.
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_bookings_slot_id_id",
+            table_name="bookings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    # 20260212_12 no longer creates the index, so there is nothing to restore.
+    pass
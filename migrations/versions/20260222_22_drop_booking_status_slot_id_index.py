@@ -0,0 +1,33 @@
+"""drop booking status, slot_id index
+
+Revision ID: 20260222_22
+Revises: 20260221_21
+Create Date: 2026-02-22 09:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260222_22"
+down_revision: Union[str, None] = "20260221_21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The confirmed-booking sweeps read the partial uq_bookings_slot_confirmed index instead.
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_bookings_status_slot_id", table_name="bookings", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_bookings_status_slot_id",
+            "bookings",
+            ["status", "slot_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models import Booking, SpecialistProfile, TimeSlot, User, UserRole
+from app.services.booking_service import LOCK_CONFLICT_DETAIL, SLOT_ALREADY_BOOKED_DETAIL, create_booking_for_slot
+
+TEST_POSTGRES_DATABASE_URL = os.getenv("TEST_POSTGRES_DATABASE_URL")
+CONTENDERS = 24
+
+
+@pytest.fixture(scope="module")
+def postgres_session_factory():
+    if not TEST_POSTGRES_DATABASE_URL:
+        pytest.skip("TEST_POSTGRES_DATABASE_URL is not set")
+
+    engine = create_engine(TEST_POSTGRES_DATABASE_URL, pool_pre_ping=True, pool_size=CONTENDERS)
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    try:
+        yield SessionLocal
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+def _seed_hot_slot(session_factory, label: str) -> tuple[int, list[int]]:
+    session = session_factory()
+    specialist_user = User(email=f"{label}-spec@example.com", hashed_password="x", role=UserRole.SPECIALIST.value)
+    clients = [
+        User(email=f"{label}-client-{index}@example.com", hashed_password="x", role=UserRole.CLIENT.value)
+        for index in range(CONTENDERS)
+    ]
+    session.add_all([specialist_user, *clients])
+    session.flush()
+    profile = SpecialistProfile(user_id=specialist_user.id, display_name=label, description=None)
+    session.add(profile)
+    session.flush()
+    slot = TimeSlot(
+        specialist_id=profile.id,
+        start_at=datetime.now(UTC) + timedelta(hours=1),
+        end_at=datetime.now(UTC) + timedelta(hours=2),
+        is_booked=False,
+    )
+    session.add(slot)
+    session.commit()
+    result = slot.id, [client.id for client in clients]
+    session.close()
+    return result
+
+
+def _run_contention(session_factory, strategy: str) -> tuple[Counter, float, int]:
+    slot_id, client_ids = _seed_hot_slot(session_factory, f"bench-{strategy}")
+    barrier = threading.Barrier(CONTENDERS)
+
+    def attempt(client_id: int) -> str:
+        session = session_factory()
+        try:
+            barrier.wait()
+            create_booking_for_slot(db=session, slot_id=slot_id, client_id=client_id)
+            return "created"
+        except HTTPException as exc:
+            if exc.status_code == 409:
+                return exc.detail
+            raise
+        finally:
+            session.close()
+
+    original_strategy = settings.booking_concurrency_strategy
+    settings.booking_concurrency_strategy = strategy
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=CONTENDERS) as pool:
+            outcomes = Counter(pool.map(attempt, client_ids))
+        elapsed = time.perf_counter() - started
+    finally:
+        settings.booking_concurrency_strategy = original_strategy
+
+    check = session_factory()
+    confirmed = check.query(Booking).filter(Booking.slot_id == slot_id).count()
+    check.close()
+    return outcomes, elapsed, confirmed
+
+
+@pytest.mark.concurrent
+@pytest.mark.postgres
+def test_hot_slot_contention_across_strategies(postgres_session_factory, record_property):
+    results = {
+        strategy: _run_contention(postgres_session_factory, strategy)
+        for strategy in ("nowait", "lock_timeout", "optimistic", "serializable", "unique_index")
+    }
+
+    for strategy, (outcomes, elapsed, confirmed) in results.items():
+        record_property(f"{strategy}_elapsed_ms", round(elapsed * 1000, 1))
+        record_property(f"{strategy}_outcomes", dict(outcomes))
+        assert outcomes["created"] == 1
+        assert confirmed == 1
+
+    unique_index_outcomes = results["unique_index"][0]
+    assert unique_index_outcomes[LOCK_CONFLICT_DETAIL] == 0
+    assert unique_index_outcomes[SLOT_ALREADY_BOOKED_DETAIL] == CONTENDERS - 1
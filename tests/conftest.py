@@ -13,7 +13,12 @@ from app.db.base import Base
 from app.db.models import Booking, Service, SpecialistProfile, TimeSlot, User  # noqa: F401
 from app.db.session import get_db
 from app.main import app
+from app.core.idempotency_cache import idempotency_cache
 from app.core.rate_limiter import rate_limiter
+from app.core.read_cache import read_cache
+from app.core.slot_gate import slot_gate
+from app.services.calendar_service import booking_ics_cache
+from app.tasks import wait_list_promotions
 
 TEST_DATABASE_URL = "sqlite+pysqlite:///:memory:"
 engine = create_engine(
@@ -24,11 +29,30 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+class RecordingTask:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def apply_async(self, retry: bool, **kwargs) -> None:
+        self.calls.append(kwargs)
+
+
 @pytest.fixture(autouse=True)
 def reset_database() -> None:
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
     rate_limiter.reset()
+    idempotency_cache.reset()
+    slot_gate.reset()
+    read_cache.reset()
+    booking_ics_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def wait_list_promotion_task(monkeypatch) -> RecordingTask:
+    task = RecordingTask()
+    monkeypatch.setattr(wait_list_promotions, "process_wait_list_promotions_task", task)
+    return task
 
 
 @pytest.fixture()
@@ -306,6 +306,46 @@ def test_get_specialist_availability_returns_404_for_unknown_specialist(client):
     assert response.json()["detail"] == "Specialist not found"
 
 
+def test_get_specialists_availability_answers_for_many_specialists_at_once(client):
+    tokens = []
+    for email in ("directory-spec-1@example.com", "directory-spec-2@example.com"):
+        payload = {"email": email, "password": "StrongPass123", "role": "specialist"}
+        client.post("/auth/register", json=payload)
+        tokens.append(client.post("/auth/login", json=payload).json()["access_token"])
+
+    slot = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {tokens[0]}"},
+        json={"start_at": "2026-03-02T09:00:00Z", "end_at": "2026-03-02T10:00:00Z"},
+    ).json()
+    quiet_specialist_id = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {tokens[1]}"},
+        json={"start_at": "2026-03-10T09:00:00Z", "end_at": "2026-03-10T10:00:00Z"},
+    ).json()["specialist_id"]
+    busy_specialist_id = slot["specialist_id"]
+
+    response = client.get(
+        "/specialists/availability",
+        params={
+            "ids": [busy_specialist_id, quiet_specialist_id, 999999, busy_specialist_id],
+            "date_from": "2026-03-02",
+            "days": 2,
+        },
+    )
+    too_many = client.get("/specialists/availability", params={"ids": list(range(1, 52))})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["missing_ids"] == [999999]
+    assert data["availability"][str(busy_specialist_id)] == [
+        {"date": "2026-03-02", "total_slots": 1, "free_slots": 1, "booked_slots": 0},
+        {"date": "2026-03-03", "total_slots": 0, "free_slots": 0, "booked_slots": 0},
+    ]
+    assert [day["total_slots"] for day in data["availability"][str(quiet_specialist_id)]] == [0, 0]
+    assert too_many.status_code == 422
+
+
 def test_specialist_can_delete_own_free_slot(client):
     specialist_payload = {
         "email": "deleteslotspec@example.com",
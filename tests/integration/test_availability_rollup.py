@@ -0,0 +1,102 @@
+from datetime import UTC, date, datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.db.models import SpecialistDayAvailability
+from app.services.availability_rollup_service import reconcile_availability_rollup
+from app.tasks.expirations import expire_started_slots
+from conftest import TestingSessionLocal
+
+
+@pytest.fixture(params=["nowait", "lock_timeout", "optimistic", "serializable", "unique_index"])
+def booking_strategy(request):
+    original_strategy = settings.booking_concurrency_strategy
+    settings.booking_concurrency_strategy = request.param
+    try:
+        yield request.param
+    finally:
+        settings.booking_concurrency_strategy = original_strategy
+
+
+def _register_and_login(client, email: str, role: str) -> dict[str, str]:
+    payload = {"email": email, "password": "StrongPass123", "role": role}
+    assert client.post("/auth/register", json=payload).status_code == 201
+    login_response = client.post("/auth/login", json={"email": email, "password": payload["password"]})
+    assert login_response.status_code == 200
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+
+def _create_slot(client, headers: dict[str, str], start_at: str, end_at: str) -> dict:
+    response = client.post("/specialists/me/slots", headers=headers, json={"start_at": start_at, "end_at": end_at})
+    assert response.status_code == 201
+    return response.json()
+
+
+def _stored_rollup() -> dict[date, tuple[int, int, int]]:
+    db = TestingSessionLocal()
+    try:
+        rows = db.scalars(select(SpecialistDayAvailability)).all()
+        return {row.day: (row.total_slots, row.free_slots, row.booked_slots) for row in rows}
+    finally:
+        db.close()
+
+
+def _reconcile() -> int:
+    db = TestingSessionLocal()
+    try:
+        return reconcile_availability_rollup(db=db, chunk_size=1)
+    finally:
+        db.close()
+
+
+def test_rollup_follows_every_slot_write_path(client, booking_strategy):
+    specialist_headers = _register_and_login(client, "rollup-spec@example.com", "specialist")
+    client_headers = _register_and_login(client, "rollup-client@example.com", "client")
+    first = _create_slot(client, specialist_headers, "2026-11-02T09:00:00Z", "2026-11-02T10:00:00Z")
+    second = _create_slot(client, specialist_headers, "2026-11-02T10:00:00Z", "2026-11-02T11:00:00Z")
+    next_day = _create_slot(client, specialist_headers, "2026-11-03T09:00:00Z", "2026-11-03T10:00:00Z")
+    dropped = _create_slot(client, specialist_headers, "2026-11-03T11:00:00Z", "2026-11-03T12:00:00Z")
+
+    booking = client.post("/bookings", headers=client_headers, json={"slot_id": first["id"]}).json()
+    client.post("/bookings", headers=client_headers, json={"slot_id": second["id"]})
+    rescheduled = client.patch(
+        f"/bookings/{booking['id']}/reschedule",
+        headers=client_headers,
+        json={"slot_id": next_day["id"]},
+    )
+    cancelled = client.patch(f"/bookings/{booking['id']}/cancel", headers=client_headers)
+    deleted = client.delete(f"/specialists/me/slots/{dropped['id']}", headers=specialist_headers)
+
+    assert rescheduled.status_code == 200
+    assert cancelled.status_code == 200
+    assert deleted.status_code == 204
+    assert _stored_rollup() == {date(2026, 11, 2): (2, 1, 1), date(2026, 11, 3): (1, 1, 0)}
+    availability = client.get(f"/specialists/{first['specialist_id']}/availability?date_from=2026-11-02&days=2")
+    assert [(day["total_slots"], day["booked_slots"]) for day in availability.json()] == [(2, 1), (1, 0)]
+
+    db = TestingSessionLocal()
+    try:
+        assert expire_started_slots(db=db, now=datetime(2026, 11, 4, tzinfo=UTC)) == 1
+    finally:
+        db.close()
+    assert _stored_rollup() == {date(2026, 11, 2): (2, 2, 0), date(2026, 11, 3): (1, 1, 0)}
+    assert _reconcile() == 0
+
+
+def test_reconciliation_repairs_drifted_and_orphaned_rows(client):
+    specialist_headers = _register_and_login(client, "rollup-drift-spec@example.com", "specialist")
+    slot = _create_slot(client, specialist_headers, "2026-11-05T09:00:00Z", "2026-11-05T10:00:00Z")
+
+    db = TestingSessionLocal()
+    try:
+        db.execute(update(SpecialistDayAvailability).values(total_slots=7, free_slots=7))
+        db.add(SpecialistDayAvailability(specialist_id=slot["specialist_id"], day=date(2026, 11, 6), total_slots=3))
+        db.commit()
+    finally:
+        db.close()
+
+    assert _reconcile() == 2
+    assert _stored_rollup() == {date(2026, 11, 5): (1, 1, 0)}
+    assert _reconcile() == 0
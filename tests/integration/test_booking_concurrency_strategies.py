@@ -0,0 +1,93 @@
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture(params=["nowait", "lock_timeout", "optimistic", "serializable", "unique_index"])
+def booking_strategy(request):
+    original_strategy = settings.booking_concurrency_strategy
+    settings.booking_concurrency_strategy = request.param
+    try:
+        yield request.param
+    finally:
+        settings.booking_concurrency_strategy = original_strategy
+
+
+def _register_and_login(client, email: str, role: str) -> str:
+    payload = {"email": email, "password": "StrongPass123", "role": role}
+    assert client.post("/auth/register", json=payload).status_code == 201
+    login_response = client.post("/auth/login", json={"email": email, "password": payload["password"]})
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"]
+
+
+def _create_slot(client, token: str, start_at: str, end_at: str) -> dict:
+    response = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"start_at": start_at, "end_at": end_at},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _get_slots(client, specialist_id: int) -> dict[int, bool]:
+    response = client.get(f"/specialists/{specialist_id}/slots")
+    assert response.status_code == 200
+    return {slot["id"]: slot["is_booked"] for slot in response.json()}
+
+
+def test_strategy_books_replays_and_rejects_second_client(client, booking_strategy):
+    specialist_token = _register_and_login(client, "uq-spec@example.com", "specialist")
+    client1_token = _register_and_login(client, "uq-client-1@example.com", "client")
+    client2_token = _register_and_login(client, "uq-client-2@example.com", "client")
+    slot = _create_slot(client, specialist_token, "2026-06-01T10:00:00Z", "2026-06-01T11:00:00Z")
+
+    headers = {"Authorization": f"Bearer {client1_token}", "Idempotency-Key": "uq-key"}
+    first = client.post("/bookings", headers=headers, json={"slot_id": slot["id"]})
+    replay = client.post("/bookings", headers=headers, json={"slot_id": slot["id"]})
+    conflict = client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {client2_token}"},
+        json={"slot_id": slot["id"]},
+    )
+    missing = client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {client2_token}"},
+        json={"slot_id": slot["id"] + 100},
+    )
+
+    assert first.status_code == 201
+    assert replay.status_code == 201
+    assert replay.json()["id"] == first.json()["id"]
+    assert conflict.status_code == 409
+    assert conflict.json()["detail"] == "Slot already booked"
+    assert missing.status_code == 404
+    assert _get_slots(client, slot["specialist_id"])[slot["id"]] is True
+
+
+def test_strategy_cancel_and_reschedule_keep_is_booked_in_sync(client, booking_strategy):
+    specialist_token = _register_and_login(client, "uq-move-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "uq-move-client@example.com", "client")
+    first_slot = _create_slot(client, specialist_token, "2026-06-02T10:00:00Z", "2026-06-02T11:00:00Z")
+    second_slot = _create_slot(client, specialist_token, "2026-06-02T12:00:00Z", "2026-06-02T13:00:00Z")
+    auth_headers = {"Authorization": f"Bearer {client_token}"}
+
+    booking = client.post("/bookings", headers=auth_headers, json={"slot_id": first_slot["id"]}).json()
+
+    rescheduled = client.patch(
+        f"/bookings/{booking['id']}/reschedule",
+        headers=auth_headers,
+        json={"slot_id": second_slot["id"]},
+    )
+    assert rescheduled.status_code == 200
+    assert rescheduled.json()["slot_id"] == second_slot["id"]
+    assert _get_slots(client, first_slot["specialist_id"]) == {first_slot["id"]: False, second_slot["id"]: True}
+
+    cancelled = client.patch(f"/bookings/{booking['id']}/cancel", headers=auth_headers)
+    assert cancelled.status_code == 200
+    assert cancelled.json()["status"] == "cancelled"
+    assert _get_slots(client, first_slot["specialist_id"]) == {first_slot["id"]: False, second_slot["id"]: False}
+
+    rebooked = client.post("/bookings", headers=auth_headers, json={"slot_id": second_slot["id"]})
+    assert rebooked.status_code == 201
@@ -0,0 +1,108 @@
+import json
+
+from app.api.pagination import encode_cursor
+
+
+def _register_and_login(client, email: str, role: str) -> str:
+    payload = {"email": email, "password": "StrongPass123", "role": role}
+    assert client.post("/auth/register", json=payload).status_code == 201
+    login_response = client.post("/auth/login", json={"email": email, "password": payload["password"]})
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"]
+
+
+def _create_slot(client, token: str, start_at: str, end_at: str) -> dict:
+    response = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"start_at": start_at, "end_at": end_at},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _collect_pages(client, url: str, headers: dict) -> list[list[int]]:
+    pages = []
+    response = client.get(f"{url}?limit=2", headers=headers)
+    while True:
+        assert response.status_code == 200
+        pages.append([booking["id"] for booking in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+        response = client.get(f"{url}?limit=2&after={cursor}", headers=headers)
+
+
+def test_booking_lists_page_through_cursor(client):
+    specialist_token = _register_and_login(client, "cursor-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "cursor-client@example.com", "client")
+    client_headers = {"Authorization": f"Bearer {client_token}"}
+    booking_ids = []
+    for hour in range(10, 15):
+        slot = _create_slot(client, specialist_token, f"2026-11-01T{hour}:00:00Z", f"2026-11-01T{hour}:30:00Z")
+        response = client.post("/bookings", headers=client_headers, json={"slot_id": slot["id"]})
+        assert response.status_code == 201
+        booking_ids.append(response.json()["id"])
+
+    client_pages = _collect_pages(client, "/bookings/me", client_headers)
+    specialist_pages = _collect_pages(
+        client,
+        "/bookings/specialists/me",
+        {"Authorization": f"Bearer {specialist_token}"},
+    )
+
+    assert client_pages == [booking_ids[0:2], booking_ids[2:4], booking_ids[4:]]
+    assert specialist_pages == client_pages
+
+
+def test_malformed_cursor_is_rejected(client):
+    client_token = _register_and_login(client, "cursor-bad@example.com", "client")
+
+    response = client.get("/bookings/me?after=not-a-cursor", headers={"Authorization": f"Bearer {client_token}"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
+
+
+def test_cursor_and_offset_together_are_rejected(client):
+    client_token = _register_and_login(client, "cursor-offset@example.com", "client")
+    headers = {"Authorization": f"Bearer {client_token}"}
+
+    response = client.get("/bookings/me", params={"after": encode_cursor(1), "offset": 1}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Use either after or offset, not both"
+
+
+def test_specialist_export_streams_filtered_rows(client):
+    specialist_token = _register_and_login(client, "export-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "export-client@example.com", "client")
+    specialist_headers = {"Authorization": f"Bearer {specialist_token}"}
+    client_headers = {"Authorization": f"Bearer {client_token}"}
+    booking_ids = []
+    for day in (1, 2, 3):
+        slot = _create_slot(client, specialist_token, f"2026-11-0{day}T10:00:00Z", f"2026-11-0{day}T11:00:00Z")
+        response = client.post("/bookings", headers=client_headers, json={"slot_id": slot["id"]})
+        booking_ids.append(response.json()["id"])
+    assert client.patch(f"/bookings/{booking_ids[1]}/cancel", headers=client_headers).status_code == 200
+
+    csv_export = client.get("/bookings/specialists/me/export?format=csv&status=confirmed", headers=specialist_headers)
+    ndjson_export = client.get(
+        "/bookings/specialists/me/export?format=ndjson&date_from=2026-11-02&date_to=2026-11-03",
+        headers=specialist_headers,
+    )
+
+    assert csv_export.status_code == 200
+    assert csv_export.headers["content-type"].startswith("text/csv")
+    csv_lines = csv_export.text.splitlines()
+    assert csv_lines[0].split(",")[:4] == ["id", "slot_id", "client_id", "status"]
+    assert [line.split(",")[0] for line in csv_lines[1:]] == [str(booking_ids[0]), str(booking_ids[2])]
+    assert "export-client@example.com" in csv_lines[1]
+
+    assert ndjson_export.status_code == 200
+    assert ndjson_export.headers["content-type"] == "application/x-ndjson"
+    ndjson_rows = [json.loads(line) for line in ndjson_export.text.splitlines()]
+    assert [row["id"] for row in ndjson_rows] == booking_ids[1:]
+    assert ndjson_rows[0]["status"] == "cancelled"
+    assert ndjson_rows[0]["client_email"] == "export-client@example.com"
+    assert client.get("/bookings/specialists/me/export", headers=client_headers).status_code == 403
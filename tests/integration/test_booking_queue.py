@@ -0,0 +1,152 @@
+import pytest
+
+from app.api.v1 import bookings as bookings_router
+from app.core.booking_queue import InMemoryBookingQueue
+from app.core.config import settings
+from app.services import booking_queue_service
+from conftest import TestingSessionLocal
+
+
+class _RecordingTask:
+    def __init__(self) -> None:
+        self.calls: list[list[int]] = []
+
+    def apply_async(self, args: list[int], retry: bool) -> None:
+        self.calls.append(args)
+
+
+class _FlakyTicketBookingQueue(InMemoryBookingQueue):
+    def __init__(self, failed_ticket_writes: int) -> None:
+        super().__init__()
+        self.failed_ticket_writes = failed_ticket_writes
+        self.renewals = 0
+
+    def save_ticket(self, ticket_id, ticket, ttl_seconds):
+        if ticket["status"] != "queued" and self.failed_ticket_writes:
+            self.failed_ticket_writes -= 1
+            raise ConnectionError("redis blip")
+        super().save_ticket(ticket_id, ticket, ttl_seconds)
+
+    def renew_lease(self, partition, owner, ttl_ms):
+        self.renewals += 1
+        return super().renew_lease(partition, owner, ttl_ms)
+
+
+class _BrokenBookingQueue(InMemoryBookingQueue):
+    def enqueue(self, partition, message):
+        raise ConnectionError("redis is down")
+
+
+def _register_and_login(client, email: str, role: str) -> str:
+    payload = {"email": email, "password": "StrongPass123", "role": role}
+    assert client.post("/auth/register", json=payload).status_code == 201
+    login_response = client.post("/auth/login", json={"email": email, "password": payload["password"]})
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"]
+
+
+def _create_slot(client, token: str, start_at: str, end_at: str) -> dict:
+    response = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"start_at": start_at, "end_at": end_at},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture()
+def queued_slot(client, monkeypatch):
+    specialist_token = _register_and_login(client, "queue-spec@example.com", "specialist")
+    slot = _create_slot(client, specialist_token, "2026-09-01T10:00:00Z", "2026-09-01T11:00:00Z")
+    monkeypatch.setattr(settings, "booking_queue_specialist_ids", [slot["specialist_id"]])
+    monkeypatch.setattr(booking_queue_service, "booking_queue", InMemoryBookingQueue())
+    return slot
+
+
+def test_queued_bookings_are_applied_in_order_and_reported_via_tickets(client, queued_slot, monkeypatch):
+    kick_task = _RecordingTask()
+    monkeypatch.setattr(bookings_router, "apply_queued_bookings_task", kick_task)
+    client1_headers = {"Authorization": f"Bearer {_register_and_login(client, 'queue-1@example.com', 'client')}"}
+    client2_headers = {"Authorization": f"Bearer {_register_and_login(client, 'queue-2@example.com', 'client')}"}
+
+    first = client.post("/bookings", headers=client1_headers, json={"slot_id": queued_slot["id"]})
+    second = client.post("/bookings", headers=client2_headers, json={"slot_id": queued_slot["id"]})
+
+    assert first.status_code == 202
+    assert second.status_code == 202
+    assert first.json()["status"] == "queued"
+    assert kick_task.calls == [[queued_slot["specialist_id"]], [queued_slot["specialist_id"]]]
+    first_ticket_id = first.json()["ticket_id"]
+    second_ticket_id = second.json()["ticket_id"]
+    assert client.get(f"/bookings/tickets/{first_ticket_id}", headers=client2_headers).status_code == 404
+
+    db = TestingSessionLocal()
+    try:
+        applied = booking_queue_service.apply_queued_bookings(db=db, specialist_id=queued_slot["specialist_id"])
+    finally:
+        db.close()
+
+    confirmed = client.get(f"/bookings/tickets/{first_ticket_id}?wait=1", headers=client1_headers)
+    rejected = client.get(f"/bookings/tickets/{second_ticket_id}", headers=client2_headers)
+
+    assert applied == 2
+    assert confirmed.status_code == 200
+    assert confirmed.json()["status"] == "confirmed"
+    assert confirmed.json()["booking"]["slot_id"] == queued_slot["id"]
+    assert rejected.json()["status"] == "rejected"
+    assert rejected.json()["detail"] == "Slot already booked"
+    my_bookings = client.get("/bookings/me", headers=client1_headers).json()
+    assert [booking["id"] for booking in my_bookings] == [confirmed.json()["booking"]["id"]]
+
+
+def test_booking_falls_back_to_direct_path_when_queue_is_unavailable(client, queued_slot, monkeypatch):
+    monkeypatch.setattr(booking_queue_service, "booking_queue", _BrokenBookingQueue())
+    client_headers = {"Authorization": f"Bearer {_register_and_login(client, 'queue-down@example.com', 'client')}"}
+
+    response = client.post("/bookings", headers=client_headers, json={"slot_id": queued_slot["id"]})
+
+    assert response.status_code == 201
+    assert response.json()["slot_id"] == queued_slot["id"]
+
+
+def test_failing_queued_booking_is_rejected_and_does_not_stall_the_queue(client, queued_slot, monkeypatch):
+    monkeypatch.setattr(bookings_router, "apply_queued_bookings_task", _RecordingTask())
+    client_headers = {"Authorization": f"Bearer {_register_and_login(client, 'queue-poison@example.com', 'client')}"}
+    queue = booking_queue_service.booking_queue
+    queue.enqueue(queued_slot["specialist_id"], {"ticket_id": "broken"})
+    queued = client.post("/bookings", headers=client_headers, json={"slot_id": queued_slot["id"]})
+
+    db = TestingSessionLocal()
+    try:
+        applied = booking_queue_service.apply_queued_bookings(db=db, specialist_id=queued_slot["specialist_id"])
+    finally:
+        db.close()
+
+    assert applied == 2
+    assert queue.size(queued_slot["specialist_id"]) == 0
+    assert queue.get_ticket("broken")["status"] == "rejected"
+    ticket = client.get(f"/bookings/tickets/{queued.json()['ticket_id']}", headers=client_headers).json()
+    assert ticket["status"] == "confirmed"
+
+
+def test_ticket_write_blip_after_commit_does_not_reject_the_booking(client, queued_slot, monkeypatch):
+    monkeypatch.setattr(bookings_router, "apply_queued_bookings_task", _RecordingTask())
+    monkeypatch.setattr(settings, "booking_queue_poll_interval_ms", 1)
+    queue = _FlakyTicketBookingQueue(failed_ticket_writes=1)
+    monkeypatch.setattr(booking_queue_service, "booking_queue", queue)
+    client_headers = {"Authorization": f"Bearer {_register_and_login(client, 'queue-blip@example.com', 'client')}"}
+    queued = client.post("/bookings", headers=client_headers, json={"slot_id": queued_slot["id"]})
+    queue.enqueue(queued_slot["specialist_id"], {"ticket_id": "broken"})
+
+    db = TestingSessionLocal()
+    try:
+        applied = booking_queue_service.apply_queued_bookings(db=db, specialist_id=queued_slot["specialist_id"])
+    finally:
+        db.close()
+
+    assert applied == 2
+    assert queue.renewals == 2
+    ticket = client.get(f"/bookings/tickets/{queued.json()['ticket_id']}", headers=client_headers).json()
+    assert ticket["status"] == "confirmed"
+    assert ticket["booking"]["slot_id"] == queued_slot["id"]
@@ -0,0 +1,120 @@
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture(params=["nowait", "lock_timeout", "optimistic", "serializable", "unique_index"])
+def booking_strategy(request):
+    original_strategy = settings.booking_concurrency_strategy
+    settings.booking_concurrency_strategy = request.param
+    try:
+        yield request.param
+    finally:
+        settings.booking_concurrency_strategy = original_strategy
+
+
+def _register_and_login(client, email: str, role: str) -> str:
+    payload = {"email": email, "password": "StrongPass123", "role": role}
+    assert client.post("/auth/register", json=payload).status_code == 201
+    login_response = client.post("/auth/login", json={"email": email, "password": payload["password"]})
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"]
+
+
+def _create_slot(client, token: str, start_at: str, end_at: str) -> dict:
+    response = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"start_at": start_at, "end_at": end_at},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _create_service(client, token: str, duration_minutes: int) -> dict:
+    response = client.post(
+        "/specialists/me/services",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"title": "Long session", "duration_minutes": duration_minutes, "price": "90.00"},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _get_slots(client, specialist_id: int) -> dict[int, bool]:
+    response = client.get(f"/specialists/{specialist_id}/slots")
+    assert response.status_code == 200
+    return {slot["id"]: slot["is_booked"] for slot in response.json()}
+
+
+def test_run_books_adjacent_slots_atomically_and_replays(client, booking_strategy):
+    specialist_token = _register_and_login(client, "run-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "run-client@example.com", "client")
+    service = _create_service(client, specialist_token, duration_minutes=90)
+    slots = [
+        _create_slot(client, specialist_token, "2026-10-01T10:00:00Z", "2026-10-01T10:30:00Z"),
+        _create_slot(client, specialist_token, "2026-10-01T10:30:00Z", "2026-10-01T11:00:00Z"),
+        _create_slot(client, specialist_token, "2026-10-01T11:00:00Z", "2026-10-01T11:30:00Z"),
+        _create_slot(client, specialist_token, "2026-10-01T11:30:00Z", "2026-10-01T12:00:00Z"),
+    ]
+    headers = {"Authorization": f"Bearer {client_token}", "Idempotency-Key": "run-key"}
+    payload = {"service_id": service["id"], "start_slot_id": slots[0]["id"]}
+
+    created = client.post("/bookings/runs", headers=headers, json=payload)
+    replayed = client.post("/bookings/runs", headers=headers, json=payload)
+    reused = client.post(
+        "/bookings/runs",
+        headers=headers,
+        json={"service_id": service["id"], "start_slot_id": slots[1]["id"]},
+    )
+
+    assert created.status_code == 201
+    run = created.json()
+    assert [booking["slot_id"] for booking in run["bookings"]] == [slot["id"] for slot in slots[:3]]
+    assert {booking["run_id"] for booking in run["bookings"]} == {run["run_id"]}
+    assert replayed.status_code == 201
+    assert replayed.json() == run
+    assert reused.status_code == 409
+    assert reused.json()["detail"] == "Idempotency key already used with another slot"
+    assert _get_slots(client, slots[0]["specialist_id"]) == {
+        slots[0]["id"]: True,
+        slots[1]["id"]: True,
+        slots[2]["id"]: True,
+        slots[3]["id"]: False,
+    }
+
+
+def test_run_is_rejected_without_booking_anything(client, booking_strategy):
+    specialist_token = _register_and_login(client, "run-gap-spec@example.com", "specialist")
+    client1_token = _register_and_login(client, "run-gap-client-1@example.com", "client")
+    client2_token = _register_and_login(client, "run-gap-client-2@example.com", "client")
+    service = _create_service(client, specialist_token, duration_minutes=60)
+    first = _create_slot(client, specialist_token, "2026-10-02T10:00:00Z", "2026-10-02T10:30:00Z")
+    second = _create_slot(client, specialist_token, "2026-10-02T10:30:00Z", "2026-10-02T11:00:00Z")
+    after_gap = _create_slot(client, specialist_token, "2026-10-02T12:00:00Z", "2026-10-02T12:30:00Z")
+    _create_slot(client, specialist_token, "2026-10-02T12:45:00Z", "2026-10-02T13:15:00Z")
+
+    taken = client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {client1_token}"},
+        json={"slot_id": second["id"]},
+    )
+    client2_headers = {"Authorization": f"Bearer {client2_token}"}
+    partially_booked = client.post(
+        "/bookings/runs",
+        headers=client2_headers,
+        json={"service_id": service["id"], "start_slot_id": first["id"]},
+    )
+    with_gap = client.post(
+        "/bookings/runs",
+        headers=client2_headers,
+        json={"service_id": service["id"], "start_slot_id": after_gap["id"]},
+    )
+
+    assert taken.status_code == 201
+    assert partially_booked.status_code == 409
+    assert partially_booked.json()["detail"] == "Slot already booked"
+    assert with_gap.status_code == 409
+    assert with_gap.json()["detail"] == "No contiguous run of slots covers the service duration"
+    booked_slots = _get_slots(client, first["specialist_id"])
+    assert [slot_id for slot_id, is_booked in booked_slots.items() if is_booked] == [second["id"]]
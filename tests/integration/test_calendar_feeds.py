@@ -0,0 +1,150 @@
+from app.api.v1 import bookings as bookings_router
+from app.db.models import SpecialistProfile
+from conftest import TestingSessionLocal
+
+
+def _register_and_login(client, email: str, role: str) -> str:
+    payload = {"email": email, "password": "StrongPass123", "role": role}
+    assert client.post("/auth/register", json=payload).status_code == 201
+    login_response = client.post("/auth/login", json={"email": email, "password": payload["password"]})
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"]
+
+
+def _create_slot(client, token: str, start_at: str, end_at: str) -> dict:
+    response = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"start_at": start_at, "end_at": end_at},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_calendar_feeds_stream_all_bookings_and_revalidate(client):
+    specialist_token = _register_and_login(client, "feed-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "feed-client@example.com", "client")
+    client_headers = {"Authorization": f"Bearer {client_token}"}
+    booking_ids = []
+    for day in (1, 2):
+        slot = _create_slot(client, specialist_token, f"2026-12-0{day}T10:00:00Z", f"2026-12-0{day}T11:00:00Z")
+        booking_ids.append(client.post("/bookings", headers=client_headers, json={"slot_id": slot["id"]}).json()["id"])
+
+    client_links = client.get("/calendar-feeds/me", headers=client_headers).json()
+    specialist_links = client.get(
+        "/calendar-feeds/me",
+        headers={"Authorization": f"Bearer {specialist_token}"},
+    ).json()
+    assert client_links["specialist_feed_url"] is None
+
+    feed = client.get(client_links["client_feed_url"])
+    repeated = client.get(client_links["client_feed_url"])
+    assert feed.status_code == 200
+    assert feed.headers["content-type"].startswith("text/calendar")
+    assert feed.text == repeated.text
+    assert feed.text.startswith("BEGIN:VCALENDAR\r\n")
+    assert feed.text.endswith("END:VCALENDAR\r\n")
+    assert [f"UID:booking-{booking_id}@booking-api.local" in feed.text for booking_id in booking_ids] == [True, True]
+    assert feed.text.count("BEGIN:VEVENT") == 2
+
+    etag = feed.headers["etag"]
+    assert etag == repeated.headers["etag"]
+    assert client.get(client_links["client_feed_url"], headers={"If-None-Match": etag}).status_code == 304
+    not_modified = client.get(
+        client_links["client_feed_url"],
+        headers={"If-Modified-Since": feed.headers["last-modified"]},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    assert client.patch(f"/bookings/{booking_ids[0]}/cancel", headers=client_headers).status_code == 200
+    changed = client.get(client_links["client_feed_url"], headers={"If-None-Match": etag})
+    specialist_feed = client.get(specialist_links["specialist_feed_url"])
+
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert "STATUS:CANCELLED" in changed.text
+    assert specialist_feed.status_code == 200
+    assert specialist_feed.text.count("BEGIN:VEVENT") == 2
+
+
+def test_calendar_feed_etag_follows_specialist_rename(client):
+    specialist_token = _register_and_login(client, "feed-rename-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "feed-rename-client@example.com", "client")
+    client_headers = {"Authorization": f"Bearer {client_token}"}
+    slot = _create_slot(client, specialist_token, "2026-12-07T10:00:00Z", "2026-12-07T11:00:00Z")
+    assert client.post("/bookings", headers=client_headers, json={"slot_id": slot["id"]}).status_code == 201
+    feed_url = client.get("/calendar-feeds/me", headers=client_headers).json()["client_feed_url"]
+    etag = client.get(feed_url).headers["etag"]
+
+    db = TestingSessionLocal()
+    try:
+        profile = db.get(SpecialistProfile, slot["specialist_id"])
+        profile.display_name = "Renamed Specialist"
+        db.commit()
+    finally:
+        db.close()
+    changed = client.get(feed_url, headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert "Renamed Specialist" in changed.text
+
+def test_calendar_feed_rejects_forged_token(client):
+    client_token = _register_and_login(client, "feed-forged@example.com", "client")
+    links = client.get("/calendar-feeds/me", headers={"Authorization": f"Bearer {client_token}"}).json()
+    user_id = links["client_feed_url"].split("/")[-2].split(".")[0]
+
+    forged = client.get(f"/calendar-feeds/{user_id}.{'0' * 64}/client.ics")
+    not_specialist = client.get(links["client_feed_url"].replace("client.ics", "specialist.ics"))
+
+    assert forged.status_code == 404
+    assert forged.json()["detail"] == "Calendar feed not found"
+    assert not_specialist.status_code == 404
+
+
+def test_rotating_calendar_feeds_revokes_previous_links(client):
+    client_token = _register_and_login(client, "feed-rotate@example.com", "client")
+    headers = {"Authorization": f"Bearer {client_token}"}
+    old_links = client.get("/calendar-feeds/me", headers=headers).json()
+    assert client.get(old_links["client_feed_url"]).status_code == 200
+
+    rotated = client.post("/calendar-feeds/me/rotate", headers=headers)
+    new_links = client.get("/calendar-feeds/me", headers=headers).json()
+
+    assert rotated.status_code == 200
+    assert rotated.json() == new_links
+    assert new_links["client_feed_url"] != old_links["client_feed_url"]
+    assert client.get(old_links["client_feed_url"]).status_code == 404
+    assert client.get(new_links["client_feed_url"]).status_code == 200
+
+def test_booking_ics_is_deterministic_cached_and_revalidated(client, monkeypatch):
+    specialist_token = _register_and_login(client, "ics-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "ics-client@example.com", "client")
+    client_headers = {"Authorization": f"Bearer {client_token}"}
+    slot = _create_slot(client, specialist_token, "2026-12-05T10:00:00Z", "2026-12-05T11:00:00Z")
+    booking = client.post("/bookings", headers=client_headers, json={"slot_id": slot["id"]}).json()
+    url = f"/bookings/{booking['id']}/calendar.ics"
+
+    first = client.get(url, headers=client_headers)
+
+    def fail_if_rendered(**kwargs):
+        raise AssertionError("cached ICS must not be rendered again")
+
+    monkeypatch.setattr(bookings_router, "build_booking_calendar_ics", fail_if_rendered)
+    cached = client.get(url, headers=client_headers)
+    revalidated = client.get(url, headers={**client_headers, "If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert cached.content == first.content
+    assert cached.headers["etag"] == first.headers["etag"]
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    monkeypatch.undo()
+    assert client.patch(f"/bookings/{booking['id']}/cancel", headers=client_headers).status_code == 200
+    changed = client.get(url, headers={**client_headers, "If-None-Match": first.headers["etag"]})
+
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert "STATUS:CANCELLED" in changed.text
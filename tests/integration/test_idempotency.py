@@ -0,0 +1,199 @@
+import json
+import threading
+import time
+
+from app.api.idempotency import build_request_fingerprint
+from app.api.v1 import bookings as bookings_router
+from app.core.config import settings
+from app.core.idempotency_cache import InMemoryIdempotencyCache, idempotency_cache
+from app.services.idempotency_service import (
+    IDEMPOTENT_REQUEST_IN_PROGRESS_DETAIL,
+    build_idempotency_cache_key,
+    claim_idempotency_key,
+    store_idempotent_response,
+)
+
+
+def _register_and_login(client, email: str, role: str) -> str:
+    payload = {"email": email, "password": "StrongPass123", "role": role}
+    assert client.post("/auth/register", json=payload).status_code == 201
+    login_response = client.post("/auth/login", json={"email": email, "password": payload["password"]})
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"]
+
+
+def _create_slot(client, token: str, start_at: str, end_at: str) -> dict:
+    response = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"start_at": start_at, "end_at": end_at},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _booking_cache_key(client, token: str, idempotency_key: str) -> str:
+    user = client.get("/users/me", headers={"Authorization": f"Bearer {token}"}).json()
+    return build_idempotency_cache_key(
+        scope=bookings_router.BOOKING_CREATE_IDEMPOTENCY_SCOPE,
+        user_id=user["id"],
+        idempotency_key=idempotency_key,
+    )
+
+
+def test_booking_replay_is_served_from_cache_without_touching_booking_service(client, monkeypatch):
+    specialist_token = _register_and_login(client, "cache-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "cache-client@example.com", "client")
+    slot = _create_slot(client, specialist_token, "2026-07-01T10:00:00Z", "2026-07-01T11:00:00Z")
+    other_slot = _create_slot(client, specialist_token, "2026-07-01T12:00:00Z", "2026-07-01T13:00:00Z")
+    headers = {"Authorization": f"Bearer {client_token}", "Idempotency-Key": "cache-key"}
+
+    first = client.post("/bookings", headers=headers, json={"slot_id": slot["id"]})
+    assert first.status_code == 201
+
+    def fail_if_called(**kwargs):
+        raise AssertionError("replay must not reach the booking service")
+
+    monkeypatch.setattr(bookings_router, "create_booking_for_slot", fail_if_called)
+    replay = client.post("/bookings", headers=headers, json={"slot_id": slot["id"]})
+    reused = client.post("/bookings", headers=headers, json={"slot_id": other_slot["id"]})
+
+    assert replay.status_code == 201
+    assert replay.json() == first.json()
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert reused.status_code == 409
+    assert reused.json()["detail"] == "Idempotency key already used with another slot"
+
+
+def test_duplicate_request_waits_for_in_flight_original(client):
+    specialist_token = _register_and_login(client, "inflight-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "inflight-client@example.com", "client")
+    slot = _create_slot(client, specialist_token, "2026-07-02T10:00:00Z", "2026-07-02T11:00:00Z")
+    cache_key = _booking_cache_key(client, client_token, "inflight-key")
+    fingerprint = build_request_fingerprint(
+        method="POST",
+        path="/bookings",
+        body=json.dumps({"slot_id": slot["id"]}).encode(),
+    )
+    original_body = {
+        "id": 777,
+        "slot_id": slot["id"],
+        "client_id": 1,
+        "status": "confirmed",
+        "created_at": "2026-07-01T09:00:00Z",
+        "cancelled_at": None,
+    }
+
+    assert claim_idempotency_key(cache_key=cache_key, fingerprint=fingerprint, reuse_detail="reused") is None
+    finish_original = threading.Timer(
+        0.1,
+        store_idempotent_response,
+        kwargs={
+            "cache_key": cache_key,
+            "fingerprint": fingerprint,
+            "status_code": 201,
+            "body": json.dumps(original_body),
+            "media_type": "application/json",
+        },
+    )
+    finish_original.start()
+    try:
+        duplicate = client.post(
+            "/bookings",
+            headers={"Authorization": f"Bearer {client_token}", "Idempotency-Key": "inflight-key"},
+            json={"slot_id": slot["id"]},
+        )
+    finally:
+        finish_original.join()
+
+    assert duplicate.status_code == 201
+    assert duplicate.json()["id"] == 777
+
+
+def test_stuck_in_flight_request_returns_409_and_failures_release_the_key(client):
+    specialist_token = _register_and_login(client, "stuck-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "stuck-client@example.com", "client")
+    slot = _create_slot(client, specialist_token, "2026-07-03T10:00:00Z", "2026-07-03T11:00:00Z")
+    stuck_cache_key = _booking_cache_key(client, client_token, "stuck-key")
+    claim_idempotency_key(
+        cache_key=stuck_cache_key,
+        fingerprint=build_request_fingerprint(
+            method="POST",
+            path="/bookings",
+            body=json.dumps({"slot_id": slot["id"]}).encode(),
+        ),
+        reuse_detail="reused",
+    )
+
+    original_timeout = settings.idempotency_wait_timeout_ms
+    settings.idempotency_wait_timeout_ms = 50
+    try:
+        stuck = client.post(
+            "/bookings",
+            headers={"Authorization": f"Bearer {client_token}", "Idempotency-Key": "stuck-key"},
+            json={"slot_id": slot["id"]},
+        )
+    finally:
+        settings.idempotency_wait_timeout_ms = original_timeout
+
+    missing = client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {client_token}", "Idempotency-Key": "missing-key"},
+        json={"slot_id": slot["id"] + 100},
+    )
+
+    assert stuck.status_code == 409
+    assert stuck.json()["detail"] == IDEMPOTENT_REQUEST_IN_PROGRESS_DETAIL
+    assert missing.status_code == 404
+    assert idempotency_cache.get(_booking_cache_key(client, client_token, "missing-key")) is None
+
+
+def test_cancel_and_slot_creation_retries_are_replayed(client, monkeypatch):
+    specialist_token = _register_and_login(client, "replay-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "replay-client@example.com", "client")
+    slot_headers = {"Authorization": f"Bearer {specialist_token}", "Idempotency-Key": "slot-key"}
+    slot_payload = {"start_at": "2026-07-04T10:00:00Z", "end_at": "2026-07-04T11:00:00Z"}
+
+    slot = client.post("/specialists/me/slots", headers=slot_headers, json=slot_payload)
+    slot_retry = client.post("/specialists/me/slots", headers=slot_headers, json=slot_payload)
+    other_slot = client.post(
+        "/specialists/me/slots",
+        headers=slot_headers,
+        json={"start_at": "2026-07-04T12:00:00Z", "end_at": "2026-07-04T13:00:00Z"},
+    )
+
+    assert slot.status_code == 201
+    assert slot_retry.status_code == 201
+    assert slot_retry.json() == slot.json()
+    assert other_slot.status_code == 409
+    assert other_slot.json()["detail"] == "Idempotency key already used with another request"
+
+    booking = client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {client_token}"},
+        json={"slot_id": slot.json()["id"]},
+    ).json()
+    cancel_headers = {"Authorization": f"Bearer {client_token}", "Idempotency-Key": "cancel-key"}
+    cancelled = client.patch(f"/bookings/{booking['id']}/cancel", headers=cancel_headers)
+
+    def fail_if_called():
+        raise AssertionError("replay must not re-run the cancellation")
+
+    monkeypatch.setattr(bookings_router, "uses_slot_row_locks", fail_if_called)
+    cancel_retry = client.patch(f"/bookings/{booking['id']}/cancel", headers=cancel_headers)
+
+    assert cancelled.status_code == 200
+    assert cancel_retry.status_code == 200
+    assert cancel_retry.json() == cancelled.json()
+    assert cancel_retry.headers["Idempotent-Replayed"] == "true"
+
+
+def test_in_memory_cache_purges_expired_keys():
+    cache = InMemoryIdempotencyCache()
+    cache.set("expired", {"state": "completed"}, ttl_seconds=0)
+    cache.set("live", {"state": "completed"}, ttl_seconds=60)
+    time.sleep(0.01)
+
+    assert cache.purge_expired() == 1
+    assert cache.get("expired") is None
+    assert cache.get("live") == {"state": "completed"}
@@ -0,0 +1,213 @@
+import asyncio
+import os
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api.v1.auth import router as auth_router
+from app.api.v1.auth_async import router as auth_async_router
+from app.api.v1.bookings import router as bookings_router
+from app.api.v1.bookings_async import router as bookings_async_router
+from app.api.v1.specialists import router as specialists_router
+from app.api.v1.specialists_async import router as specialists_async_router
+from app.core.exceptions import http_exception_handler
+from app.core.config import settings
+from app.core.slot_gate import slot_gate
+from app.core.wait_list_queue import InMemoryWaitListQueue
+from app.db.base import Base
+from app.db.session import get_async_db, get_db
+from app.services import specialist_cache_service, wait_list_queue_service
+
+TEST_POSTGRES_DATABASE_URL = os.getenv("TEST_POSTGRES_DATABASE_URL")
+
+
+@pytest.fixture()
+def async_client():
+    if not TEST_POSTGRES_DATABASE_URL:
+        pytest.skip("TEST_POSTGRES_DATABASE_URL is not set")
+
+    engine = create_engine(TEST_POSTGRES_DATABASE_URL, pool_pre_ping=True)
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    async_engine = create_async_engine(TEST_POSTGRES_DATABASE_URL, poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    test_app = FastAPI()
+    test_app.add_exception_handler(HTTPException, http_exception_handler)
+    for router in (
+        auth_async_router,
+        specialists_async_router,
+        bookings_async_router,
+        auth_router,
+        specialists_router,
+        bookings_router,
+    ):
+        test_app.include_router(router)
+    test_app.dependency_overrides[get_db] = override_get_db
+    test_app.dependency_overrides[get_async_db] = override_get_async_db
+
+    try:
+        with TestClient(test_app) as test_client:
+            yield test_client
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class _LoopRecordingReadCache:
+    def __init__(self, read_cache) -> None:
+        self._read_cache = read_cache
+        self.calls_on_loop: list[bool] = []
+
+    def invalidate(self, namespaces) -> None:
+        self.calls_on_loop.append(_on_event_loop())
+        self._read_cache.invalidate(namespaces)
+
+
+class _LoopRecordingWaitListQueue(InMemoryWaitListQueue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls_on_loop: list[bool] = []
+
+    def add(self, slot_id, entries) -> None:
+        self.calls_on_loop.append(_on_event_loop())
+        super().add(slot_id, entries)
+
+
+def _register_and_login(client, email: str, role: str) -> str:
+    payload = {"email": email, "password": "StrongPass123", "role": role}
+    assert client.post("/auth/register", json=payload).status_code == 201
+    login_response = client.post("/auth/login", json={"email": email, "password": payload["password"]})
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"]
+
+
+@pytest.mark.postgres
+def test_async_routes_book_replay_and_wait_list(async_client):
+    specialist_token = _register_and_login(async_client, "async-spec@example.com", "specialist")
+    client1_token = _register_and_login(async_client, "async-client-1@example.com", "client")
+    client2_token = _register_and_login(async_client, "async-client-2@example.com", "client")
+
+    slot = async_client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {specialist_token}"},
+        json={"start_at": "2026-05-01T10:00:00Z", "end_at": "2026-05-01T11:00:00Z"},
+    ).json()
+
+    headers = {"Authorization": f"Bearer {client1_token}", "Idempotency-Key": "async-key"}
+    first = async_client.post("/bookings", headers=headers, json={"slot_id": slot["id"]})
+    replay = async_client.post("/bookings", headers=headers, json={"slot_id": slot["id"]})
+    conflict = async_client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {client2_token}"},
+        json={"slot_id": slot["id"]},
+    )
+
+    assert first.status_code == 201
+    assert replay.status_code == 201
+    assert replay.json()["id"] == first.json()["id"]
+    assert conflict.status_code == 409
+
+    wait_list = async_client.post(
+        "/bookings/wait-list",
+        headers={"Authorization": f"Bearer {client2_token}"},
+        json={"slot_id": slot["id"]},
+    )
+    assert wait_list.status_code == 201
+
+    availability = async_client.get(
+        f"/specialists/{slot['specialist_id']}/availability?date_from=2026-05-01&days=1"
+    )
+    assert availability.status_code == 200
+    assert availability.json()[0]["booked_slots"] == 1
+
+    directory = async_client.get(
+        "/specialists/availability",
+        params={"ids": [slot["specialist_id"], 999999], "date_from": "2026-05-01", "days": 1},
+    )
+    assert directory.status_code == 200
+    assert directory.json()["availability"][str(slot["specialist_id"])] == availability.json()
+    assert directory.json()["missing_ids"] == [999999]
+
+
+@pytest.mark.postgres
+def test_async_booking_of_a_taken_slot_past_the_gate_is_a_conflict(async_client):
+    specialist_token = _register_and_login(async_client, "async-gate-spec@example.com", "specialist")
+    owner_token = _register_and_login(async_client, "async-gate-owner@example.com", "client")
+    late_token = _register_and_login(async_client, "async-gate-late@example.com", "client")
+    slot = async_client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {specialist_token}"},
+        json={"start_at": "2026-05-02T10:00:00Z", "end_at": "2026-05-02T11:00:00Z"},
+    ).json()
+    owner_headers = {"Authorization": f"Bearer {owner_token}"}
+    assert async_client.post("/bookings", headers=owner_headers, json={"slot_id": slot["id"]}).status_code == 201
+
+    # The gate forgot the slot (TTL, another node), so the late client is admitted and loses in the database.
+    slot_gate.reset()
+    late_headers = {"Authorization": f"Bearer {late_token}"}
+    conflict = async_client.post("/bookings", headers=late_headers, json={"slot_id": slot["id"]})
+
+    assert conflict.status_code == 409
+    assert slot_gate.claim(slot_id=slot["id"], holder="claimed:999999", ttl_ms=5000) is None
+
+
+@pytest.mark.postgres
+def test_async_routes_keep_redis_io_off_the_event_loop(async_client, monkeypatch):
+    read_cache = _LoopRecordingReadCache(specialist_cache_service.read_cache)
+    queue = _LoopRecordingWaitListQueue()
+    monkeypatch.setattr(specialist_cache_service, "read_cache", read_cache)
+    monkeypatch.setattr(settings, "wait_list_queue_enabled", True)
+    monkeypatch.setattr(wait_list_queue_service, "wait_list_queue", queue)
+    specialist_token = _register_and_login(async_client, "async-io-spec@example.com", "specialist")
+    owner_token = _register_and_login(async_client, "async-io-owner@example.com", "client")
+    waiting_token = _register_and_login(async_client, "async-io-waiting@example.com", "client")
+    slot = async_client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {specialist_token}"},
+        json={"start_at": "2026-05-03T10:00:00Z", "end_at": "2026-05-03T11:00:00Z"},
+    ).json()
+    read_cache.calls_on_loop.clear()
+
+    booked = async_client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {owner_token}"},
+        json={"slot_id": slot["id"]},
+    )
+    joined = async_client.post(
+        "/bookings/wait-list",
+        headers={"Authorization": f"Bearer {waiting_token}"},
+        json={"slot_id": slot["id"]},
+    )
+
+    assert booked.status_code == 201
+    assert joined.status_code == 201
+    assert read_cache.calls_on_loop == [False]
+    assert queue.calls_on_loop == [False]
+    assert queue.rank(slot["id"], joined.json()["id"]) == (0, 1)
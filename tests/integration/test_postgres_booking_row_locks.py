@@ -1,14 +1,36 @@
 import os
+import threading
 from datetime import UTC, datetime, timedelta
 
 import pytest
 from fastapi import HTTPException
 from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
 
+from app.core.config import settings
 from app.db.base import Base
-from app.db.models import Booking, BookingStatus, SpecialistProfile, TimeSlot, User, UserRole
-from app.services.booking_service import LOCK_CONFLICT_DETAIL, create_booking_for_slot
+from app.db.models import (
+    Booking,
+    BookingStatus,
+    Service,
+    SpecialistProfile,
+    TimeSlot,
+    User,
+    UserRole,
+    WaitListEntry,
+)
+from app.services.booking_service import (
+    IDEMPOTENCY_KEY_REUSE_DETAIL,
+    LOCK_CONFLICT_DETAIL,
+    SLOT_ALREADY_BOOKED_DETAIL,
+    build_booking_mutation_query,
+    create_booking_for_slot,
+    create_booking_run,
+    load_booking_for_mutation,
+    reschedule_booking,
+)
+from app.services.wait_list_service import promote_wait_list_heads
 
 TEST_POSTGRES_DATABASE_URL = os.getenv("TEST_POSTGRES_DATABASE_URL")
 
@@ -96,3 +118,343 @@ def test_postgres_booking_lock_conflict_then_success(postgres_session_factory):
     assert total_bookings == 1
     assert final_slot is not None
     assert final_slot.is_booked is True
+
+
+@pytest.mark.postgres
+def test_postgres_single_statement_booking_keeps_replay_and_conflict_semantics(postgres_session_factory):
+    seed_session = postgres_session_factory()
+    specialist_user = User(
+        email="pg-cte-spec@example.com",
+        hashed_password="x",
+        role=UserRole.SPECIALIST.value,
+    )
+    first_client = User(email="pg-cte-client-1@example.com", hashed_password="x", role=UserRole.CLIENT.value)
+    second_client = User(email="pg-cte-client-2@example.com", hashed_password="x", role=UserRole.CLIENT.value)
+    seed_session.add_all([specialist_user, first_client, second_client])
+    seed_session.flush()
+
+    profile = SpecialistProfile(user_id=specialist_user.id, display_name="PG CTE Specialist", description=None)
+    seed_session.add(profile)
+    seed_session.flush()
+
+    slots = [
+        TimeSlot(
+            specialist_id=profile.id,
+            start_at=datetime.now(UTC) + timedelta(hours=offset),
+            end_at=datetime.now(UTC) + timedelta(hours=offset + 1),
+            is_booked=False,
+        )
+        for offset in (1, 2)
+    ]
+    seed_session.add_all(slots)
+    seed_session.commit()
+    slot_id, other_slot_id = slots[0].id, slots[1].id
+    first_client_id, second_client_id = first_client.id, second_client.id
+    seed_session.close()
+
+    session = postgres_session_factory()
+    try:
+        booking = create_booking_for_slot(
+            db=session,
+            slot_id=slot_id,
+            client_id=first_client_id,
+            idempotency_key="pg-cte-key",
+        )
+        assert booking.slot_id == slot_id
+        assert booking.status == BookingStatus.CONFIRMED.value
+        assert booking.created_at is not None
+
+        replayed = create_booking_for_slot(
+            db=session,
+            slot_id=slot_id,
+            client_id=first_client_id,
+            idempotency_key="pg-cte-key",
+        )
+        assert replayed.id == booking.id
+
+        lock_holder = postgres_session_factory()
+        try:
+            lock_holder.scalar(select(TimeSlot).where(TimeSlot.id == slot_id).with_for_update())
+            replayed_while_locked = create_booking_for_slot(
+                db=session,
+                slot_id=slot_id,
+                client_id=first_client_id,
+                idempotency_key="pg-cte-key",
+            )
+            assert replayed_while_locked.id == booking.id
+        finally:
+            lock_holder.rollback()
+            lock_holder.close()
+
+        with pytest.raises(HTTPException) as reuse_exc:
+            create_booking_for_slot(
+                db=session,
+                slot_id=other_slot_id,
+                client_id=first_client_id,
+                idempotency_key="pg-cte-key",
+            )
+        assert reuse_exc.value.status_code == 409
+        assert reuse_exc.value.detail == IDEMPOTENCY_KEY_REUSE_DETAIL
+
+        with pytest.raises(HTTPException) as conflict_exc:
+            create_booking_for_slot(db=session, slot_id=slot_id, client_id=second_client_id)
+        assert conflict_exc.value.status_code == 409
+        assert conflict_exc.value.detail == SLOT_ALREADY_BOOKED_DETAIL
+
+        with pytest.raises(HTTPException) as missing_exc:
+            create_booking_for_slot(db=session, slot_id=other_slot_id + 1000, client_id=second_client_id)
+        assert missing_exc.value.status_code == 404
+    finally:
+        session.close()
+
+    check_session = postgres_session_factory()
+    booked_slot = check_session.get(TimeSlot, slot_id)
+    free_slot = check_session.get(TimeSlot, other_slot_id)
+    total_bookings = check_session.query(Booking).filter(Booking.slot_id.in_([slot_id, other_slot_id])).count()
+    check_session.close()
+
+    assert booked_slot is not None and booked_slot.is_booked is True
+    assert free_slot is not None and free_slot.is_booked is False
+    assert total_bookings == 1
+
+
+@pytest.mark.postgres
+def test_postgres_lock_timeout_strategy_waits_for_short_lock_instead_of_409(postgres_session_factory):
+    seed_session = postgres_session_factory()
+    specialist_user = User(email="pg-wait-spec@example.com", hashed_password="x", role=UserRole.SPECIALIST.value)
+    client_user = User(email="pg-wait-client@example.com", hashed_password="x", role=UserRole.CLIENT.value)
+    seed_session.add_all([specialist_user, client_user])
+    seed_session.flush()
+    profile = SpecialistProfile(user_id=specialist_user.id, display_name="PG Wait Specialist", description=None)
+    seed_session.add(profile)
+    seed_session.flush()
+    slot = TimeSlot(
+        specialist_id=profile.id,
+        start_at=datetime.now(UTC) + timedelta(hours=1),
+        end_at=datetime.now(UTC) + timedelta(hours=2),
+        is_booked=False,
+    )
+    seed_session.add(slot)
+    seed_session.commit()
+    slot_id = slot.id
+    client_id = client_user.id
+    seed_session.close()
+
+    lock_holder = postgres_session_factory()
+    lock_holder.scalar(select(TimeSlot).where(TimeSlot.id == slot_id).with_for_update())
+    release_timer = threading.Timer(0.1, lock_holder.rollback)
+
+    original_strategy = settings.booking_concurrency_strategy
+    settings.booking_concurrency_strategy = "lock_timeout"
+    contender = postgres_session_factory()
+    try:
+        release_timer.start()
+        booking = create_booking_for_slot(db=contender, slot_id=slot_id, client_id=client_id)
+    finally:
+        settings.booking_concurrency_strategy = original_strategy
+        release_timer.join()
+        contender.close()
+        lock_holder.close()
+
+    assert booking.slot_id == slot_id
+    assert booking.status == BookingStatus.CONFIRMED.value
+
+
+@pytest.mark.postgres
+def test_postgres_booking_run_is_all_or_nothing_under_row_locks(postgres_session_factory):
+    seed_session = postgres_session_factory()
+    specialist_user = User(email="pg-run-spec@example.com", hashed_password="x", role=UserRole.SPECIALIST.value)
+    client_user = User(email="pg-run-client@example.com", hashed_password="x", role=UserRole.CLIENT.value)
+    seed_session.add_all([specialist_user, client_user])
+    seed_session.flush()
+    profile = SpecialistProfile(user_id=specialist_user.id, display_name="PG Run Specialist", description=None)
+    seed_session.add(profile)
+    seed_session.flush()
+    service = Service(specialist_id=profile.id, title="Long", description=None, duration_minutes=90, price=90)
+    run_start = datetime.now(UTC).replace(microsecond=0) + timedelta(days=1)
+    slots = [
+        TimeSlot(
+            specialist_id=profile.id,
+            start_at=run_start + timedelta(minutes=30 * offset),
+            end_at=run_start + timedelta(minutes=30 * (offset + 1)),
+            is_booked=False,
+        )
+        for offset in range(3)
+    ]
+    seed_session.add_all([service, *slots])
+    seed_session.commit()
+    service_id = service.id
+    slot_ids = [slot.id for slot in slots]
+    client_id = client_user.id
+    seed_session.close()
+
+    lock_holder = postgres_session_factory()
+    lock_holder.scalar(select(TimeSlot).where(TimeSlot.id == slot_ids[1]).with_for_update())
+    contender = postgres_session_factory()
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            create_booking_run(db=contender, service_id=service_id, start_slot_id=slot_ids[0], client_id=client_id)
+        assert exc_info.value.detail == LOCK_CONFLICT_DETAIL
+    finally:
+        lock_holder.rollback()
+        lock_holder.close()
+        contender.close()
+
+    booking_session = postgres_session_factory()
+    try:
+        bookings = create_booking_run(
+            db=booking_session,
+            service_id=service_id,
+            start_slot_id=slot_ids[0],
+            client_id=client_id,
+            idempotency_key="pg-run-key",
+        )
+        replayed = create_booking_run(
+            db=booking_session,
+            service_id=service_id,
+            start_slot_id=slot_ids[0],
+            client_id=client_id,
+            idempotency_key="pg-run-key",
+        )
+    finally:
+        booking_session.close()
+
+    check_session = postgres_session_factory()
+    booked_flags = check_session.scalars(select(TimeSlot.is_booked).where(TimeSlot.id.in_(slot_ids))).all()
+    check_session.close()
+
+    assert [booking.slot_id for booking in bookings] == slot_ids
+    assert len({booking.run_id for booking in bookings}) == 1
+    assert [booking.id for booking in replayed] == [booking.id for booking in bookings]
+    assert booked_flags == [True, True, True]
+
+
+@pytest.mark.postgres
+def test_postgres_reschedule_authorizes_and_locks_booking_without_locking_profile(postgres_session_factory):
+    seed_session = postgres_session_factory(expire_on_commit=False)
+    specialist_user = User(email="pg-move-spec@example.com", hashed_password="x", role=UserRole.SPECIALIST.value)
+    client_user = User(email="pg-move-client@example.com", hashed_password="x", role=UserRole.CLIENT.value)
+    stranger = User(email="pg-move-stranger@example.com", hashed_password="x", role=UserRole.CLIENT.value)
+    seed_session.add_all([specialist_user, client_user, stranger])
+    seed_session.flush()
+    profile = SpecialistProfile(user_id=specialist_user.id, display_name="PG Move Specialist", description=None)
+    seed_session.add(profile)
+    seed_session.flush()
+    slots = [
+        TimeSlot(
+            specialist_id=profile.id,
+            start_at=datetime.now(UTC) + timedelta(days=2, hours=offset),
+            end_at=datetime.now(UTC) + timedelta(days=2, hours=offset + 1),
+            is_booked=False,
+        )
+        for offset in range(2)
+    ]
+    seed_session.add_all(slots)
+    seed_session.commit()
+    slot_ids = [slot.id for slot in slots]
+    profile_id = profile.id
+    seed_session.close()
+
+    booking_session = postgres_session_factory()
+    booking = create_booking_for_slot(db=booking_session, slot_id=slot_ids[0], client_id=client_user.id)
+    booking_id = booking.id
+    booking_session.close()
+
+    holder = postgres_session_factory()
+    observer = postgres_session_factory()
+    try:
+        query = build_booking_mutation_query(booking_id).with_for_update(of=[Booking, TimeSlot])
+        with pytest.raises(HTTPException) as exc_info:
+            load_booking_for_mutation(db=holder, query=query, actor=stranger)
+        assert exc_info.value.status_code == 403
+        holder.rollback()
+
+        load_booking_for_mutation(db=holder, query=query, actor=specialist_user)
+        assert observer.scalar(
+            select(SpecialistProfile.id).where(SpecialistProfile.id == profile_id).with_for_update(nowait=True)
+        ) == profile_id
+        with pytest.raises(OperationalError):
+            observer.scalar(select(Booking.id).where(Booking.id == booking_id).with_for_update(nowait=True))
+        observer.rollback()
+        holder.rollback()
+
+        moved, previous_slot_id = reschedule_booking(
+            db=holder,
+            booking_id=booking_id,
+            new_slot_id=slot_ids[1],
+            actor=client_user,
+        )
+    finally:
+        holder.close()
+        observer.close()
+
+    assert previous_slot_id == slot_ids[0]
+    assert moved.slot_id == slot_ids[1]
+
+
+@pytest.mark.postgres
+def test_postgres_concurrent_wait_list_promotions_skip_locked_heads(postgres_session_factory):
+    seed_session = postgres_session_factory()
+    specialist_user = User(email="pg-wl-spec@example.com", hashed_password="x", role=UserRole.SPECIALIST.value)
+    first_client = User(email="pg-wl-first@example.com", hashed_password="x", role=UserRole.CLIENT.value)
+    second_client = User(email="pg-wl-second@example.com", hashed_password="x", role=UserRole.CLIENT.value)
+    seed_session.add_all([specialist_user, first_client, second_client])
+    seed_session.flush()
+    profile = SpecialistProfile(user_id=specialist_user.id, display_name="PG WL Specialist", description=None)
+    seed_session.add(profile)
+    seed_session.flush()
+    slots_start = datetime.now(UTC).replace(microsecond=0) + timedelta(days=2)
+    slots = [
+        TimeSlot(
+            specialist_id=profile.id,
+            start_at=slots_start + timedelta(hours=offset),
+            end_at=slots_start + timedelta(hours=offset + 1),
+            is_booked=False,
+        )
+        for offset in range(3)
+    ]
+    seed_session.add_all(slots)
+    seed_session.flush()
+    for waiting_client in (first_client, second_client):
+        seed_session.add_all([WaitListEntry(slot_id=slot.id, client_id=waiting_client.id) for slot in slots])
+        seed_session.flush()
+    seed_session.commit()
+    slot_ids = [slot.id for slot in slots]
+    first_client_id = first_client.id
+    second_client_id = second_client.id
+    seed_session.close()
+
+    first_worker = postgres_session_factory()
+    second_worker = postgres_session_factory()
+    try:
+        first_bookings, first_deferred = promote_wait_list_heads(db=first_worker, slot_ids=slot_ids)
+        promoted_slot_ids = sorted(booking.slot_id for booking in first_bookings)
+        # The heads are locked by the first worker: the second one defers instead of promoting the next in line.
+        second_bookings, second_deferred = promote_wait_list_heads(db=second_worker, slot_ids=slot_ids)
+        second_worker.rollback()
+        first_worker.commit()
+        retried_bookings, retried_deferred = promote_wait_list_heads(db=second_worker, slot_ids=slot_ids)
+        second_worker.commit()
+    finally:
+        first_worker.close()
+        second_worker.close()
+
+    check_session = postgres_session_factory()
+    confirmed = check_session.execute(
+        select(Booking.slot_id, Booking.client_id)
+        .where(Booking.slot_id.in_(slot_ids), Booking.status == BookingStatus.CONFIRMED.value)
+        .order_by(Booking.slot_id)
+    ).all()
+    remaining_clients = check_session.scalars(
+        select(WaitListEntry.client_id).where(WaitListEntry.slot_id.in_(slot_ids))
+    ).all()
+    check_session.close()
+
+    assert promoted_slot_ids == slot_ids
+    assert first_deferred == []
+    assert second_bookings == []
+    assert sorted(second_deferred) == slot_ids
+    assert retried_bookings == []
+    assert retried_deferred == []
+    assert confirmed == [(slot_id, first_client_id) for slot_id in slot_ids]
+    assert remaining_clients == [second_client_id] * 3
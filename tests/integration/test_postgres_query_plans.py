@@ -0,0 +1,176 @@
+import os
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.api.v1.bookings import build_client_bookings_query
+from app.api.v1.specialists import build_availability_counts_query, build_slots_query
+from app.db.base import Base
+from app.services.booking_service import build_run_slots_query
+from app.services.wait_list_service import build_wait_list_heads_query, build_wait_list_window_match_query
+from app.tasks.expirations import build_stale_bookings_query
+from app.tasks.reminders import build_upcoming_bookings_query
+from app.tasks.wait_list_gc import build_dead_wait_list_entries_query, build_dead_wait_list_windows_query
+
+TEST_POSTGRES_DATABASE_URL = os.getenv("TEST_POSTGRES_DATABASE_URL")
+
+NOW = datetime(2026, 6, 1, 12, tzinfo=UTC)
+HOT_TABLES = {"time_slots", "bookings", "wait_list_entries", "wait_list_windows", "specialist_day_availability"}
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (id, email, hashed_password, role, is_active)
+    SELECT n, 'plan-user-' || n || '@example.com', 'x', CASE WHEN n <= 200 THEN 'specialist' ELSE 'client' END, true
+    FROM generate_series(1, 2200) AS n
+    """,
+    """
+    INSERT INTO specialist_profiles (id, user_id, display_name)
+    SELECT n, n, 'Specialist ' || n FROM generate_series(1, 200) AS n
+    """,
+    """
+    INSERT INTO time_slots (specialist_id, start_at, end_at, is_booked, version)
+    SELECT
+        s,
+        timestamptz '2023-09-01 00:00:00+00' + d * interval '1 day' + (s % 10) * interval '1 hour',
+        timestamptz '2023-09-01 01:00:00+00' + d * interval '1 day' + (s % 10) * interval '1 hour',
+        d % 5 < 3 AND timestamptz '2023-09-01 00:00:00+00' + d * interval '1 day' < :now + interval '3 days',
+        1
+    FROM generate_series(1, 200) AS s, generate_series(0, 1099) AS d
+    """,
+    """
+    INSERT INTO specialist_day_availability (specialist_id, day, total_slots, free_slots, booked_slots)
+    SELECT
+        specialist_id,
+        (start_at AT TIME ZONE 'UTC')::date,
+        count(*),
+        count(*) FILTER (WHERE NOT is_booked),
+        count(*) FILTER (WHERE is_booked)
+    FROM time_slots
+    GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO bookings (slot_id, client_id, status)
+    SELECT id, 201 + id % 2000, CASE WHEN start_at < :now THEN 'expired' ELSE 'confirmed' END
+    FROM time_slots WHERE is_booked
+    """,
+    """
+    INSERT INTO wait_list_entries (slot_id, client_id)
+    SELECT b.slot_id, 201 + (b.client_id + n) % 2000
+    FROM bookings AS b, generate_series(1, 3) AS n
+    """,
+    """
+    INSERT INTO wait_list_windows (specialist_id, client_id, window_start, window_end)
+    SELECT
+        s,
+        201 + (s * 7 + d) % 2000,
+        timestamptz '2023-09-01 00:00:00+00' + d * interval '1 day',
+        timestamptz '2023-09-01 00:00:00+00' + d * interval '1 day' + interval '12 hours'
+    FROM generate_series(1, 200) AS s, generate_series(1000, 1099) AS d
+    """,
+]
+
+
+@pytest.fixture(scope="module")
+def postgres_engine():
+    if not TEST_POSTGRES_DATABASE_URL:
+        pytest.skip("TEST_POSTGRES_DATABASE_URL is not set")
+
+    engine = create_engine(TEST_POSTGRES_DATABASE_URL, pool_pre_ping=True)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for statement in SEED_STATEMENTS:
+            connection.execute(text(statement), {"now": NOW})
+        for table in sorted(HOT_TABLES):
+            connection.exec_driver_sql(f"ANALYZE {table}")
+
+    try:
+        yield engine
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+def _explain(engine, query) -> dict:
+    compiled = query.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()[0]["Plan"]
+
+
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+HOT_QUERIES = {
+    "slot_listing": (
+        lambda: build_slots_query(specialist_id=42, date_filter=date(2026, 6, 3)),
+        ("ix_time_slots_specialist_id_start_at",),
+    ),
+    "availability": (
+        lambda: build_availability_counts_query(
+            specialist_ids=[42],
+            start_date=NOW.date(),
+            end_date=NOW.date() + timedelta(days=14),
+        ),
+        ("specialist_day_availability_pkey",),
+    ),
+    "directory_availability": (
+        lambda: build_availability_counts_query(
+            specialist_ids=list(range(1, 51)),
+            start_date=NOW.date(),
+            end_date=NOW.date() + timedelta(days=14),
+        ),
+        ("specialist_day_availability_pkey",),
+    ),
+    "booking_run": (
+        lambda: build_run_slots_query(
+            specialist_id=42,
+            run_start=NOW + timedelta(days=2),
+            run_end=NOW + timedelta(days=2, hours=2),
+        ),
+        ("ix_time_slots_specialist_id_start_at",),
+    ),
+    # Both sweeps only read confirmed bookings, which the partial uq_bookings_slot_confirmed index holds in slot order.
+    "expiration_scan": (
+        lambda: build_stale_bookings_query(expire_before=NOW - timedelta(minutes=15)),
+        ("uq_bookings_slot_confirmed", "ix_time_slots_id"),
+    ),
+    "reminder_scan": (
+        lambda: build_upcoming_bookings_query(current_time=NOW, reminder_until=NOW + timedelta(minutes=60)),
+        ("ix_time_slots_start_at", "uq_bookings_slot_confirmed"),
+    ),
+    "client_bookings_page": (
+        lambda: build_client_bookings_query(client_id=1234, after_id=5000).limit(20),
+        ("ix_bookings_client_id_id",),
+    ),
+    "wait_list_promotion": (
+        lambda: build_wait_list_heads_query(slot_ids=list(range(99_000, 99_100)), dialect_name="postgresql"),
+        ("ix_wait_list_entries_slot_id_created_at_id",),
+    ),
+    "wait_list_window_match": (
+        lambda: build_wait_list_window_match_query(slot_id=99_951, dialect_name="postgresql", now=NOW),
+        ("ix_wait_list_windows_specialist_window",),
+    ),
+    "wait_list_gc": (
+        lambda: build_dead_wait_list_entries_query(current_time=NOW).limit(1000),
+        ("ix_wait_list_entries_slot_id", "ix_time_slots_id"),
+    ),
+    "wait_list_window_gc": (
+        lambda: build_dead_wait_list_windows_query(current_time=NOW).limit(1000),
+        ("ix_wait_list_windows_window_end",),
+    ),
+}
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize("query_name", sorted(HOT_QUERIES))
+def test_hot_query_uses_indexes(postgres_engine, query_name):
+    build_query, expected_indexes = HOT_QUERIES[query_name]
+    nodes = list(_walk(_explain(postgres_engine, build_query())))
+
+    seq_scanned = {node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"}
+    assert seq_scanned.isdisjoint(HOT_TABLES), nodes
+    assert set(expected_indexes) <= {node.get("Index Name") for node in nodes}, nodes
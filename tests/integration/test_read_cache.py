@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.read_cache import FallbackReadCacheStore, InMemoryReadCacheStore, TwoTierReadCache
+from app.db.models import Service
+from conftest import TestingSessionLocal
+
+
+def _register_and_login(client, email: str, role: str) -> dict[str, str]:
+    payload = {"email": email, "password": "StrongPass123", "role": role}
+    assert client.post("/auth/register", json=payload).status_code == 201
+    login_response = client.post("/auth/login", json={"email": email, "password": payload["password"]})
+    assert login_response.status_code == 200
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+
+class _FlakyReadCacheStore(InMemoryReadCacheStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.is_down = False
+
+    def get(self, key):
+        self._check()
+        return super().get(key)
+
+    def set(self, key, value, ttl_seconds):
+        self._check()
+        super().set(key, value, ttl_seconds)
+
+    def get_versions(self, namespaces):
+        self._check()
+        return super().get_versions(namespaces)
+
+    def bump_version(self, namespace):
+        self._check()
+        return super().bump_version(namespace)
+
+    def _check(self) -> None:
+        if self.is_down:
+            raise ConnectionError("redis is down")
+
+
+def _build_cache() -> TwoTierReadCache:
+    return TwoTierReadCache(
+        store=InMemoryReadCacheStore(),
+        local_maxsize=16,
+        local_ttl_seconds=60,
+        shared_ttl_seconds=60,
+    )
+
+
+def test_specialist_reads_are_served_from_cache_until_a_write_bumps_the_version(client):
+    specialist_headers = _register_and_login(client, "cache-spec@example.com", "specialist")
+    client_headers = _register_and_login(client, "cache-client@example.com", "client")
+    slot = client.post(
+        "/specialists/me/slots",
+        headers=specialist_headers,
+        json={"start_at": "2026-11-10T09:00:00Z", "end_at": "2026-11-10T10:00:00Z"},
+    ).json()
+    specialist_id = slot["specialist_id"]
+
+    assert client.get(f"/specialists/{specialist_id}/services").json() == []
+    assert client.get(f"/specialists/{specialist_id}/slots").json()[0]["is_booked"] is False
+    availability_url = f"/specialists/{specialist_id}/availability?date_from=2026-11-10&days=1"
+    assert client.get(availability_url).json()[0]["booked_slots"] == 0
+
+    # A write that bypasses the service layer does not bump the version, so the cached pages stay put.
+    db = TestingSessionLocal()
+    try:
+        db.add(Service(specialist_id=specialist_id, title="Hidden", duration_minutes=30, price=10))
+        db.commit()
+    finally:
+        db.close()
+    assert client.get(f"/specialists/{specialist_id}/services").json() == []
+
+    booking = client.post("/bookings", headers=client_headers, json={"slot_id": slot["id"]})
+    assert booking.status_code == 201
+    assert client.get(f"/specialists/{specialist_id}/slots").json()[0]["is_booked"] is True
+    assert client.get(availability_url).json()[0]["booked_slots"] == 1
+    assert [service["title"] for service in client.get(f"/specialists/{specialist_id}/services").json()] == [
+        "Hidden"
+    ]
+
+    created = client.post(
+        "/specialists/me/services",
+        headers=specialist_headers,
+        json={"title": "Consultation", "duration_minutes": 60, "price": 50},
+    )
+    assert created.status_code == 201
+    assert len(client.get(f"/specialists/{specialist_id}/services").json()) == 2
+    assert client.get("/specialists/999999/services").status_code == 404
+
+
+def test_directory_availability_picks_up_new_profiles(client):
+    specialist_headers = _register_and_login(client, "cache-directory-spec@example.com", "specialist")
+    first = client.get("/specialists/availability?ids=1&date_from=2026-11-10&days=1").json()
+    assert first["missing_ids"] == [1]
+
+    client.post(
+        "/specialists/me/slots",
+        headers=specialist_headers,
+        json={"start_at": "2026-11-10T09:00:00Z", "end_at": "2026-11-10T10:00:00Z"},
+    )
+    second = client.get("/specialists/availability?ids=1&date_from=2026-11-10&days=1").json()
+    assert second["missing_ids"] == []
+    assert second["availability"]["1"][0]["total_slots"] == 1
+
+
+def test_concurrent_misses_are_coalesced_into_one_load():
+    cache = _build_cache()
+    barrier = threading.Barrier(8)
+    loads = []
+
+    def loader() -> str:
+        loads.append(1)
+        time.sleep(0.2)
+        return '{"value": 1}'
+
+    def read() -> str | None:
+        barrier.wait()
+        return cache.get_or_load(["specialist:1"], "slots", loader)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: read(), range(8)))
+
+    assert results == ['{"value": 1}'] * 8
+    assert len(loads) == 1
+
+    cache.invalidate(["specialist:1"])
+    assert cache.get_or_load(["specialist:1"], "slots", loader) == '{"value": 1}'
+    assert len(loads) == 2
+
+
+def test_concurrent_async_misses_are_coalesced_into_one_load():
+    cache = _build_cache()
+    loads = []
+
+    async def loader() -> str:
+        loads.append(1)
+        await asyncio.sleep(0.1)
+        return "[]"
+
+    async def read_all() -> list[str | None]:
+        return await asyncio.gather(*(cache.aget_or_load(["specialist:1"], "services", loader) for _ in range(8)))
+
+    assert asyncio.run(read_all()) == ["[]"] * 8
+    assert len(loads) == 1
+
+
+def test_version_bumps_missed_while_the_shared_store_is_down_are_replayed_on_recovery():
+    primary = _FlakyReadCacheStore()
+    store = FallbackReadCacheStore(primary=primary, fallback=InMemoryReadCacheStore())
+    store.set("specialist:1@0:slots", "stale", 60)
+
+    primary.is_down = True
+    store.bump_version("specialist:1")
+    primary.is_down = False
+
+    assert store.get_versions(["specialist:1"]) == [1]
+    assert primary.get_versions(["specialist:1"]) == [1]
+    assert store.get("specialist:1@1:slots") is None
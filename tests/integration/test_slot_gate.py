@@ -0,0 +1,82 @@
+from app.api.v1 import bookings as bookings_router
+from app.core.slot_gate import FallbackSlotGate, InMemorySlotGate, RedisSlotGate, slot_gate
+
+
+def _register_and_login(client, email: str, role: str) -> str:
+    payload = {"email": email, "password": "StrongPass123", "role": role}
+    assert client.post("/auth/register", json=payload).status_code == 201
+    login_response = client.post("/auth/login", json={"email": email, "password": payload["password"]})
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"]
+
+
+def _create_slot(client, token: str, start_at: str, end_at: str) -> dict:
+    response = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"start_at": start_at, "end_at": end_at},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_gate_rejects_contenders_without_reaching_booking_service(client, monkeypatch):
+    specialist_token = _register_and_login(client, "gate-spec@example.com", "specialist")
+    client1_token = _register_and_login(client, "gate-client-1@example.com", "client")
+    client2_token = _register_and_login(client, "gate-client-2@example.com", "client")
+    in_flight_slot = _create_slot(client, specialist_token, "2026-08-01T10:00:00Z", "2026-08-01T11:00:00Z")
+    booked_slot = _create_slot(client, specialist_token, "2026-08-01T12:00:00Z", "2026-08-01T13:00:00Z")
+
+    booked = client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {client1_token}"},
+        json={"slot_id": booked_slot["id"]},
+    )
+    assert booked.status_code == 201
+    assert slot_gate.claim(slot_id=in_flight_slot["id"], holder="claimed:999999", ttl_ms=5000) is None
+
+    def fail_if_called(**kwargs):
+        raise AssertionError("gated request must not reach the booking service")
+
+    monkeypatch.setattr(bookings_router, "create_booking_for_slot", fail_if_called)
+    client2_headers = {"Authorization": f"Bearer {client2_token}"}
+    in_flight = client.post("/bookings", headers=client2_headers, json={"slot_id": in_flight_slot["id"]})
+    already_booked = client.post("/bookings", headers=client2_headers, json={"slot_id": booked_slot["id"]})
+
+    assert in_flight.status_code == 409
+    assert in_flight.json()["detail"] == "Slot booking is in progress. Retry the request."
+    assert already_booked.status_code == 409
+    assert already_booked.json()["detail"] == "Slot already booked"
+
+
+def test_gate_is_released_on_failure_and_cleared_on_cancel(client):
+    specialist_token = _register_and_login(client, "gate-release-spec@example.com", "specialist")
+    client1_token = _register_and_login(client, "gate-release-client-1@example.com", "client")
+    client2_token = _register_and_login(client, "gate-release-client-2@example.com", "client")
+    slot = _create_slot(client, specialist_token, "2026-08-02T10:00:00Z", "2026-08-02T11:00:00Z")
+    client1_headers = {"Authorization": f"Bearer {client1_token}"}
+    client2_headers = {"Authorization": f"Bearer {client2_token}"}
+
+    missing = client.post("/bookings", headers=client1_headers, json={"slot_id": slot["id"] + 100})
+    assert missing.status_code == 404
+    assert slot_gate.claim(slot_id=slot["id"] + 100, holder="claimed:999999", ttl_ms=5000) is None
+
+    booking = client.post("/bookings", headers=client1_headers, json={"slot_id": slot["id"]})
+    cancelled = client.patch(f"/bookings/{booking.json()['id']}/cancel", headers=client1_headers)
+    rebooked = client.post("/bookings", headers=client2_headers, json={"slot_id": slot["id"]})
+
+    assert booking.status_code == 201
+    assert cancelled.status_code == 200
+    assert rebooked.status_code == 201
+
+
+def test_fallback_gate_uses_memory_when_redis_is_unavailable():
+    gate = FallbackSlotGate(
+        primary=RedisSlotGate(redis_url="redis://127.0.0.1:1/0"),
+        fallback=InMemorySlotGate(),
+    )
+
+    assert gate.claim(slot_id=1, holder="claimed:1", ttl_ms=5000) is None
+    assert gate.claim(slot_id=1, holder="claimed:2", ttl_ms=5000) == "claimed:1"
+    gate.release(slot_id=1, holder="claimed:1")
+    assert gate.claim(slot_id=1, holder="claimed:2", ttl_ms=5000) is None
@@ -1,3 +1,34 @@
+import pytest
+
+from app.core.config import settings
+from app.core.wait_list_queue import InMemoryWaitListQueue
+from app.db.models import WaitListPromotion
+from app.services import wait_list_queue_service
+from app.services.wait_list_queue_service import rebuild_wait_list_queues
+from app.services.wait_list_service import process_wait_list_promotions, request_wait_list_promotion
+from conftest import TestingSessionLocal
+
+
+@pytest.fixture()
+def wait_list_queue(monkeypatch) -> InMemoryWaitListQueue:
+    queue = InMemoryWaitListQueue()
+    monkeypatch.setattr(settings, "wait_list_queue_enabled", True)
+    monkeypatch.setattr(wait_list_queue_service, "wait_list_queue", queue)
+    return queue
+
+
+class _RacingWaitListQueue(InMemoryWaitListQueue):
+    def __init__(self, on_replace) -> None:
+        super().__init__()
+        self.on_replace = on_replace
+
+    def replace(self, slot_id, entries):
+        on_replace, self.on_replace = self.on_replace, None
+        if on_replace is not None:
+            on_replace()
+        super().replace(slot_id, entries)
+
+
 def _register_and_login(client, email: str, role: str) -> str:
     payload = {"email": email, "password": "StrongPass123", "role": role}
     register_response = client.post("/auth/register", json=payload)
@@ -19,7 +50,7 @@ def test_client_can_join_wait_list_for_booked_slot(client):
     slot = client.post(
         "/specialists/me/slots",
         headers={"Authorization": f"Bearer {specialist_token}"},
-        json={"start_at": "2026-04-01T10:00:00Z", "end_at": "2026-04-01T11:00:00Z"},
+        json={"start_at": "2030-04-01T10:00:00Z", "end_at": "2030-04-01T11:00:00Z"},
     ).json()
 
     booking_response = client.post(
@@ -46,7 +77,7 @@ def test_wait_list_rejects_available_slot(client):
     slot = client.post(
         "/specialists/me/slots",
         headers={"Authorization": f"Bearer {specialist_token}"},
-        json={"start_at": "2026-04-02T10:00:00Z", "end_at": "2026-04-02T11:00:00Z"},
+        json={"start_at": "2030-04-02T10:00:00Z", "end_at": "2030-04-02T11:00:00Z"},
     ).json()
 
     response = client.post(
@@ -59,7 +90,7 @@ def test_wait_list_rejects_available_slot(client):
     assert response.json()["detail"] == "Slot is available. Book directly"
 
 
-def test_cancelling_booking_promotes_first_wait_list_entry(client):
+def test_cancelling_booking_promotes_first_wait_list_entry(client, wait_list_promotion_task):
     specialist_token = _register_and_login(client, "wl-promote-spec@example.com", "specialist")
     client1_token = _register_and_login(client, "wl-promote-client-1@example.com", "client")
     client2_token = _register_and_login(client, "wl-promote-client-2@example.com", "client")
@@ -67,7 +98,7 @@ def test_cancelling_booking_promotes_first_wait_list_entry(client):
     slot = client.post(
         "/specialists/me/slots",
         headers={"Authorization": f"Bearer {specialist_token}"},
-        json={"start_at": "2026-04-03T10:00:00Z", "end_at": "2026-04-03T11:00:00Z"},
+        json={"start_at": "2030-04-03T10:00:00Z", "end_at": "2030-04-03T11:00:00Z"},
     ).json()
 
     booking = client.post(
@@ -88,6 +119,15 @@ def test_cancelling_booking_promotes_first_wait_list_entry(client):
         headers={"Authorization": f"Bearer {client1_token}"},
     )
     assert cancel_response.status_code == 200
+    assert wait_list_promotion_task.calls == [{}]
+    assert client.get("/bookings/me", headers={"Authorization": f"Bearer {client2_token}"}).json() == []
+
+    db = TestingSessionLocal()
+    try:
+        processed = process_wait_list_promotions(db=db, batch_size=10)
+    finally:
+        db.close()
+    assert processed == 1
 
     promoted_bookings = client.get(
         "/bookings/me",
@@ -105,3 +145,263 @@ def test_cancelling_booking_promotes_first_wait_list_entry(client):
     )
     assert my_wait_list.status_code == 200
     assert my_wait_list.json() == []
+
+
+def test_wait_list_promotions_are_deduplicated_per_slot_and_skip_taken_slots(client):
+    specialist_token = _register_and_login(client, "wl-outbox-spec@example.com", "specialist")
+    client1_token = _register_and_login(client, "wl-outbox-client-1@example.com", "client")
+    client2_token = _register_and_login(client, "wl-outbox-client-2@example.com", "client")
+    client3_token = _register_and_login(client, "wl-outbox-client-3@example.com", "client")
+    slot = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {specialist_token}"},
+        json={"start_at": "2030-04-04T10:00:00Z", "end_at": "2030-04-04T11:00:00Z"},
+    ).json()
+    booking = client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {client1_token}"},
+        json={"slot_id": slot["id"]},
+    ).json()
+    client.post(
+        "/bookings/wait-list",
+        headers={"Authorization": f"Bearer {client2_token}"},
+        json={"slot_id": slot["id"]},
+    )
+    client.patch(f"/bookings/{booking['id']}/cancel", headers={"Authorization": f"Bearer {client1_token}"})
+    taken = client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {client3_token}"},
+        json={"slot_id": slot["id"]},
+    )
+
+    db = TestingSessionLocal()
+    try:
+        request_wait_list_promotion(db=db, slot_id=slot["id"])
+        db.commit()
+        pending = db.query(WaitListPromotion).count()
+        processed = process_wait_list_promotions(db=db, batch_size=10)
+        remaining = db.query(WaitListPromotion).count()
+    finally:
+        db.close()
+
+    assert taken.status_code == 201
+    assert pending == 1
+    assert processed == 1
+    assert remaining == 0
+    assert client.get("/bookings/me", headers={"Authorization": f"Bearer {client2_token}"}).json() == []
+    my_wait_list = client.get("/bookings/wait-list/me", headers={"Authorization": f"Bearer {client2_token}"})
+    assert [entry["slot_id"] for entry in my_wait_list.json()] == [slot["id"]]
+
+
+def test_wait_list_position_follows_joins_leaves_and_promotions(client, wait_list_queue):
+    specialist_token = _register_and_login(client, "wl-queue-spec@example.com", "specialist")
+    owner_token = _register_and_login(client, "wl-queue-owner@example.com", "client")
+    waiting_tokens = [_register_and_login(client, f"wl-queue-{index}@example.com", "client") for index in range(3)]
+    slot = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {specialist_token}"},
+        json={"start_at": "2030-04-05T10:00:00Z", "end_at": "2030-04-05T11:00:00Z"},
+    ).json()
+    booking = client.post(
+        "/bookings",
+        headers={"Authorization": f"Bearer {owner_token}"},
+        json={"slot_id": slot["id"]},
+    ).json()
+    entries = [
+        client.post(
+            "/bookings/wait-list",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"slot_id": slot["id"]},
+        ).json()
+        for token in waiting_tokens
+    ]
+
+    def position(index: int) -> dict:
+        response = client.get(
+            f"/bookings/wait-list/{entries[index]['id']}/position",
+            headers={"Authorization": f"Bearer {waiting_tokens[index]}"},
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    assert [position(index)["position"] for index in range(3)] == [1, 2, 3]
+    assert position(2)["queue_length"] == 3
+    foreign = client.get(
+        f"/bookings/wait-list/{entries[0]['id']}/position",
+        headers={"Authorization": f"Bearer {owner_token}"},
+    )
+    assert foreign.status_code == 403
+
+    left = client.delete(
+        f"/bookings/wait-list/{entries[1]['id']}",
+        headers={"Authorization": f"Bearer {waiting_tokens[1]}"},
+    )
+    assert left.status_code == 204
+    assert position(2) == {"entry_id": entries[2]["id"], "slot_id": slot["id"], "position": 2, "queue_length": 2}
+
+    client.patch(f"/bookings/{booking['id']}/cancel", headers={"Authorization": f"Bearer {owner_token}"})
+    db = TestingSessionLocal()
+    try:
+        assert process_wait_list_promotions(db=db, batch_size=10) == 1
+    finally:
+        db.close()
+    assert wait_list_queue.rank(slot["id"], entries[0]["id"]) is None
+    assert position(2)["position"] == 1
+
+    # A lost queue falls back to the table until the rebuild task restores it.
+    wait_list_queue.reset()
+    assert position(2)["position"] == 1
+    db = TestingSessionLocal()
+    try:
+        assert rebuild_wait_list_queues(db=db, chunk_size=1) == 1
+    finally:
+        db.close()
+    assert wait_list_queue.rank(slot["id"], entries[2]["id"]) == (0, 1)
+
+
+def test_window_waiter_gets_a_freed_slot_after_slot_waiters(client, wait_list_promotion_task):
+    specialist_token = _register_and_login(client, "wl-window-spec@example.com", "specialist")
+    owner_token = _register_and_login(client, "wl-window-owner@example.com", "client")
+    slot_waiter_token = _register_and_login(client, "wl-window-slot-waiter@example.com", "client")
+    early_token = _register_and_login(client, "wl-window-early@example.com", "client")
+    late_token = _register_and_login(client, "wl-window-late@example.com", "client")
+    specialist_headers = {"Authorization": f"Bearer {specialist_token}"}
+    owner_headers = {"Authorization": f"Bearer {owner_token}"}
+    slots = [
+        client.post(
+            "/specialists/me/slots",
+            headers=specialist_headers,
+            json={"start_at": f"2030-04-06T{hour}:00:00Z", "end_at": f"2030-04-06T{hour + 1}:00:00Z"},
+        ).json()
+        for hour in (10, 12)
+    ]
+    bookings = [
+        client.post("/bookings", headers=owner_headers, json={"slot_id": slot["id"]}).json() for slot in slots
+    ]
+    window = {
+        "specialist_id": slots[0]["specialist_id"],
+        "window_start": "2030-04-06T09:00:00Z",
+        "window_end": "2030-04-06T13:00:00Z",
+    }
+    early = client.post("/bookings/wait-list/windows", headers={"Authorization": f"Bearer {early_token}"}, json=window)
+    late = client.post("/bookings/wait-list/windows", headers={"Authorization": f"Bearer {late_token}"}, json=window)
+    assert early.status_code == 201
+    assert late.status_code == 201
+    duplicate = client.post(
+        "/bookings/wait-list/windows",
+        headers={"Authorization": f"Bearer {early_token}"},
+        json=window,
+    )
+    assert duplicate.status_code == 409
+    client.post(
+        "/bookings/wait-list",
+        headers={"Authorization": f"Bearer {slot_waiter_token}"},
+        json={"slot_id": slots[0]["id"]},
+    )
+
+    for booking in bookings:
+        client.patch(f"/bookings/{booking['id']}/cancel", headers=owner_headers)
+    db = TestingSessionLocal()
+    try:
+        process_wait_list_promotions(db=db, batch_size=10)
+    finally:
+        db.close()
+
+    def booked_slot_ids(token: str) -> list[int]:
+        response = client.get("/bookings/me", headers={"Authorization": f"Bearer {token}"})
+        return [booking["slot_id"] for booking in response.json()]
+
+    def waiting_windows(token: str) -> list[dict]:
+        return client.get("/bookings/wait-list/windows/me", headers={"Authorization": f"Bearer {token}"}).json()
+
+    assert booked_slot_ids(slot_waiter_token) == [slots[0]["id"]]
+    assert booked_slot_ids(early_token) == [slots[1]["id"]]
+    assert booked_slot_ids(late_token) == []
+    assert waiting_windows(early_token) == []
+    assert len(waiting_windows(late_token)) == 1
+
+
+def test_new_slot_inside_a_window_is_offered_to_the_window_waiter(client, wait_list_promotion_task):
+    specialist_token = _register_and_login(client, "wl-window-new-spec@example.com", "specialist")
+    client_token = _register_and_login(client, "wl-window-new-client@example.com", "client")
+    specialist_headers = {"Authorization": f"Bearer {specialist_token}"}
+    client_headers = {"Authorization": f"Bearer {client_token}"}
+    free_slot = client.post(
+        "/specialists/me/slots",
+        headers=specialist_headers,
+        json={"start_at": "2030-04-07T10:00:00Z", "end_at": "2030-04-07T11:00:00Z"},
+    ).json()
+    window = {
+        "specialist_id": free_slot["specialist_id"],
+        "window_start": "2030-04-07T09:00:00Z",
+        "window_end": "2030-04-07T12:00:00Z",
+    }
+    assert client.post("/bookings/wait-list/windows", headers=client_headers, json=window).status_code == 409
+
+    window["window_start"] = "2030-04-08T09:00:00Z"
+    window["window_end"] = "2030-04-08T12:00:00Z"
+    joined = client.post("/bookings/wait-list/windows", headers=client_headers, json=window)
+    assert joined.status_code == 201
+    client.post(
+        "/specialists/me/slots",
+        headers=specialist_headers,
+        json={"start_at": "2030-04-08T11:30:00Z", "end_at": "2030-04-08T12:30:00Z"},
+    )
+    assert wait_list_promotion_task.calls == []
+
+    inside = client.post(
+        "/specialists/me/slots",
+        headers=specialist_headers,
+        json={"start_at": "2030-04-08T10:00:00Z", "end_at": "2030-04-08T11:00:00Z"},
+    ).json()
+    assert wait_list_promotion_task.calls == [{}]
+    db = TestingSessionLocal()
+    try:
+        processed = process_wait_list_promotions(db=db, batch_size=10)
+    finally:
+        db.close()
+
+    assert processed == 1
+    my_bookings = client.get("/bookings/me", headers=client_headers).json()
+    assert [booking["slot_id"] for booking in my_bookings] == [inside["id"]]
+    left = client.delete(f"/bookings/wait-list/windows/{joined.json()['id']}", headers=client_headers)
+    assert left.status_code == 404
+
+
+def test_wait_list_queue_rebuild_drops_entries_that_left_during_the_rebuild(client, monkeypatch):
+    specialist_token = _register_and_login(client, "wl-rebuild-spec@example.com", "specialist")
+    owner_token = _register_and_login(client, "wl-rebuild-owner@example.com", "client")
+    waiting_tokens = [_register_and_login(client, f"wl-rebuild-{index}@example.com", "client") for index in range(2)]
+    slot = client.post(
+        "/specialists/me/slots",
+        headers={"Authorization": f"Bearer {specialist_token}"},
+        json={"start_at": "2030-04-06T10:00:00Z", "end_at": "2030-04-06T11:00:00Z"},
+    ).json()
+    client.post("/bookings", headers={"Authorization": f"Bearer {owner_token}"}, json={"slot_id": slot["id"]})
+    entries = [
+        client.post(
+            "/bookings/wait-list",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"slot_id": slot["id"]},
+        ).json()
+        for token in waiting_tokens
+    ]
+
+    def leave_during_rebuild() -> None:
+        response = client.delete(
+            f"/bookings/wait-list/{entries[0]['id']}",
+            headers={"Authorization": f"Bearer {waiting_tokens[0]}"},
+        )
+        assert response.status_code == 204
+
+    queue = _RacingWaitListQueue(on_replace=leave_during_rebuild)
+    monkeypatch.setattr(settings, "wait_list_queue_enabled", True)
+    monkeypatch.setattr(wait_list_queue_service, "wait_list_queue", queue)
+    db = TestingSessionLocal()
+    try:
+        assert rebuild_wait_list_queues(db=db, chunk_size=10) == 1
+    finally:
+        db.close()
+
+    assert queue.rank(slot["id"], entries[0]["id"]) is None
+    assert queue.rank(slot["id"], entries[1]["id"]) == (0, 1)
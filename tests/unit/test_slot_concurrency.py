@@ -0,0 +1,92 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.services.slot_concurrency import (
+    BOOKING_STRATEGY_OPTIMISTIC,
+    BOOKING_STRATEGY_SERIALIZABLE,
+    LOCK_CONFLICT_DETAIL,
+    SlotVersionConflict,
+    run_with_retry,
+)
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.rollbacks = 0
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def in_transaction(self) -> bool:
+        return False
+
+    def connection(self, execution_options=None):
+        return None
+
+
+class _SqlStateError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+@pytest.fixture(autouse=True)
+def fast_retry_settings():
+    original = (settings.booking_retry_budget_ms, settings.booking_retry_base_delay_ms)
+    settings.booking_retry_budget_ms = 200
+    settings.booking_retry_base_delay_ms = 1
+    try:
+        yield
+    finally:
+        settings.booking_retry_budget_ms, settings.booking_retry_base_delay_ms = original
+
+
+def test_run_with_retry_recovers_after_version_conflicts():
+    db = _FakeSession()
+    calls = []
+
+    def attempt() -> str:
+        calls.append(1)
+        if len(calls) < 3:
+            raise SlotVersionConflict()
+        return "booked"
+
+    assert run_with_retry(db=db, strategy=BOOKING_STRATEGY_OPTIMISTIC, attempt=attempt) == "booked"
+    assert len(calls) == 3
+    assert db.rollbacks == 2
+
+
+def test_run_with_retry_returns_409_when_budget_is_exhausted():
+    db = _FakeSession()
+
+    def attempt() -> str:
+        raise SlotVersionConflict()
+
+    with pytest.raises(HTTPException) as exc_info:
+        run_with_retry(db=db, strategy=BOOKING_STRATEGY_OPTIMISTIC, attempt=attempt)
+
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail == LOCK_CONFLICT_DETAIL
+    assert db.rollbacks >= 1
+
+
+def test_run_with_retry_retries_only_strategy_specific_sqlstates():
+    db = _FakeSession()
+    calls = []
+
+    def serialization_failure_then_success() -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            raise OperationalError("UPDATE", {}, _SqlStateError("40001"))
+        return "booked"
+
+    assert run_with_retry(db=db, strategy=BOOKING_STRATEGY_SERIALIZABLE, attempt=serialization_failure_then_success)
+    assert len(calls) == 2
+
+    def unrelated_failure() -> str:
+        raise OperationalError("UPDATE", {}, _SqlStateError("57014"))
+
+    with pytest.raises(OperationalError):
+        run_with_retry(db=db, strategy=BOOKING_STRATEGY_SERIALIZABLE, attempt=unrelated_failure)
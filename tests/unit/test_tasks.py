@@ -1,13 +1,24 @@
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.db.base import Base
-from app.db.models import Booking, BookingStatus, SpecialistProfile, TimeSlot, User, UserRole
+from app.db.models import (
+    Booking,
+    BookingStatus,
+    SpecialistProfile,
+    TimeSlot,
+    User,
+    UserRole,
+    WaitListEntry,
+    WaitListPromotion,
+    WaitListWindow,
+)
 from app.tasks.expirations import expire_started_slots
 from app.tasks.reminders import count_upcoming_bookings_for_reminder
+from app.tasks.wait_list_gc import purge_dead_wait_list_entries
 
 
 def _build_session() -> Session:
@@ -61,6 +72,74 @@ def test_expire_started_slots_marks_booking_as_expired():
     db.close()
 
 
+def test_expire_started_slots_sweeps_in_chunks_and_leaves_waiting_clients_for_gc():
+    db = _build_session()
+    _, client, profile = _seed_specialist_and_client(db)
+    waiting_client = User(email="task-waiting@example.com", hashed_password="x", role=UserRole.CLIENT.value)
+    db.add(waiting_client)
+    now = datetime.now(UTC)
+    slots = [
+        TimeSlot(
+            specialist_id=profile.id,
+            start_at=now - timedelta(hours=3 - offset),
+            end_at=now - timedelta(hours=2 - offset),
+            is_booked=True,
+        )
+        for offset in range(3)
+    ]
+    db.add_all(slots)
+    db.flush()
+    db.add_all([Booking(slot_id=slot.id, client_id=client.id, status=BookingStatus.CONFIRMED.value) for slot in slots])
+    db.add(WaitListEntry(slot_id=slots[1].id, client_id=waiting_client.id))
+    db.commit()
+
+    expired = expire_started_slots(db=db, now=now, batch_size=2)
+
+    assert expired == 3
+    assert db.scalars(select(Booking).where(Booking.status == BookingStatus.CONFIRMED.value)).all() == []
+    assert [slot.is_booked for slot in db.scalars(select(TimeSlot).order_by(TimeSlot.id))] == [False, False, False]
+    assert db.scalars(select(WaitListEntry.client_id)).all() == [waiting_client.id]
+    assert db.scalars(select(WaitListPromotion)).all() == []
+    db.close()
+
+
+def test_purge_dead_wait_list_entries_removes_only_past_slots_and_windows():
+    db = _build_session()
+    _, client, profile = _seed_specialist_and_client(db)
+    now = datetime.now(UTC)
+    slots = [
+        TimeSlot(
+            specialist_id=profile.id,
+            start_at=now + timedelta(hours=offset),
+            end_at=now + timedelta(hours=offset + 1),
+            is_booked=True,
+        )
+        for offset in (-3, -2, 2)
+    ]
+    db.add_all(slots)
+    db.flush()
+    db.add_all([WaitListEntry(slot_id=slot.id, client_id=client.id) for slot in slots])
+    windows = [
+        WaitListWindow(
+            specialist_id=profile.id,
+            client_id=client.id,
+            window_start=now + timedelta(days=offset),
+            window_end=now + timedelta(days=offset, hours=8),
+        )
+        for offset in (-1, 1)
+    ]
+    db.add_all(windows)
+    db.commit()
+    future_window_id = windows[1].id
+
+    deleted = purge_dead_wait_list_entries(db=db, now=now, batch_size=1)
+
+    assert deleted == {"entries": 2, "windows": 1}
+    assert db.scalars(select(WaitListEntry.slot_id)).all() == [slots[2].id]
+    assert db.scalars(select(WaitListWindow.id)).all() == [future_window_id]
+    db.close()
+
+
 def test_count_upcoming_bookings_for_reminder_counts_only_near_window():
     db = _build_session()
     _, client, profile = _seed_specialist_and_client(db)